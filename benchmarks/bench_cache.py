@@ -0,0 +1,122 @@
+"""
+磁盘缓存压缩的测试：同一批页面分别以不压缩、zlib、zlib+字典、zstd、zstd+字典（需安装 zstandard）
+写入 DiskCache，比较磁盘占用与读取延迟。
+
+页面为 fixtures 按固定随机种子生成的会议论文集/期卷页面（每届 20~1500 篇，对数均匀分布，
+小的研讨会/期卷居多）、作者主页和搜索接口 JSON，模拟“整个会议逐卷爬取”后的缓存内容；字典用前 TRAIN_SAMPLES 个页面训练（与自动训练相同），
+其余页面不参与训练。
+    磁盘占用  文件大小之和，以及按文件系统块（st_blocks）计的实际占用
+    写入      每条的平均耗时（含压缩）
+    读取      每条的 p50/p95 耗时（含解压，文件已在系统页缓存中）与吞吐量
+
+用法：
+    python benchmarks/bench_cache.py [--venues 10] [--volumes 20] [--reads 3]
+"""
+import argparse
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+import fixtures  # noqa: E402
+from dblp_searcher.dblp_cache import DiskCache  # noqa: E402
+from dblp_searcher.dblp_compress import TRAIN_SAMPLES, _zstd  # noqa: E402
+
+# (名称, 编码, 是否使用字典)
+VARIANTS = (("不压缩", "none", False), ("zlib", "zlib", False), ("zlib+字典", "zlib", True),
+            ("zstd", "zstd", False), ("zstd+字典", "zstd", True))
+
+
+def make_pages(venues, volumes, seed):
+    """[(缓存键, 内容)]：每个会议 volumes 届论文集，另加一些作者主页和搜索结果"""
+    rng = random.Random(seed)
+    pages = []
+    for v in range(venues):
+        venue = f"conf{v}"
+        for year in range(2024 - volumes, 2024):
+            entries = int(math.exp(rng.uniform(math.log(20), math.log(1500))))
+            html = fixtures.proceedings_html(entries, seed=rng.randrange(1 << 30),
+                                             venue=venue.upper())
+            pages.append((f"{fixtures.DBLP_URL}/db/conf/{venue}/{venue}{year}.html", html.encode("utf-8")))
+        for a in range(volumes // 2):
+            html = fixtures.profile_html(rng.randint(20, 400), seed=rng.randrange(1 << 30))
+            pages.append((f"{fixtures.DBLP_URL}/pid/{v}/{a}.html", html.encode("utf-8")))
+            body = fixtures.search_publications_json(rng.randint(10, 100), seed=rng.randrange(1 << 30))
+            pages.append((f"{fixtures.DBLP_URL}/search/publ/api?q={venue}{a}", body.encode("utf-8")))
+    rng.shuffle(pages)
+    return pages
+
+
+def disk_usage(directory):
+    """(文件大小之和, 按块计的占用)，包括字典文件"""
+    size = blocks = 0
+    for path, _, names in os.walk(directory):
+        for name in names:
+            stat = os.stat(os.path.join(path, name))
+            size += stat.st_size
+            blocks += stat.st_blocks * 512
+    return size, blocks
+
+
+def run_variant(codec, use_dict, pages, reads, directory):
+    cache = DiskCache(directory, codec)
+    cache.compressor.auto_train = False
+    if use_dict:
+        cache.compressor.train([value for _, value in pages[:TRAIN_SAMPLES]])
+
+    start = time.perf_counter()
+    for key, value in pages:
+        cache.set(key, value)
+    write_ms = (time.perf_counter() - start) * 1000 / len(pages)
+
+    keys = [key for key, _ in pages]
+    timings = []
+    raw_bytes = 0
+    for round_number in range(reads):
+        random.Random(round_number).shuffle(keys)
+        for key in keys:
+            start = time.perf_counter()
+            value = cache.get(key)
+            timings.append((time.perf_counter() - start) * 1000)
+            raw_bytes += len(value)
+    timings.sort()
+    size, blocks = disk_usage(directory)
+    return {"size": size, "blocks": blocks, "write_ms": write_ms,
+            "p50_ms": statistics.median(timings), "p95_ms": timings[int(len(timings) * 0.95)],
+            "mb_per_s": raw_bytes / 2 ** 20 / (sum(timings) / 1000)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="磁盘缓存压缩：占用与读取延迟")
+    parser.add_argument("--venues", type=int, default=10, help="会议数（默认 10）")
+    parser.add_argument("--volumes", type=int, default=20, help="每个会议的届数（默认 20）")
+    parser.add_argument("--reads", type=int, default=3, help="每条读取的轮数（默认 3）")
+    parser.add_argument("--seed", type=int, default=fixtures.SEED)
+    args = parser.parse_args()
+
+    pages = make_pages(args.venues, args.volumes, args.seed)
+    raw = sum(len(value) for _, value in pages)
+    print(f"{len(pages)} 个页面，共 {raw / 2 ** 20:.1f} MB（平均 {raw / len(pages) / 1024:.0f} KB）")
+    print(f"{'方式':<10}{'磁盘(MB)':>10}{'按块(MB)':>10}{'比例':>8}{'写入(ms)':>10}"
+          f"{'读p50(ms)':>11}{'读p95(ms)':>11}{'读取(MB/s)':>12}")
+    for name, codec, use_dict in VARIANTS:
+        if codec == "zstd" and _zstd() is None:
+            print(f"{name:<10}（未安装 zstandard，跳过）")
+            continue
+        with tempfile.TemporaryDirectory(prefix="dblp-bench-cache-") as directory:
+            result = run_variant(codec, use_dict, pages, args.reads, directory)
+        print(f"{name:<10}{result['size'] / 2 ** 20:>10.1f}{result['blocks'] / 2 ** 20:>10.1f}"
+              f"{result['blocks'] / raw:>8.1%}{result['write_ms']:>10.2f}"
+              f"{result['p50_ms']:>11.3f}{result['p95_ms']:>11.3f}{result['mb_per_s']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+共享查询服务（dblp_searcher.dblp_server）的负载测试。
+
+在本进程的后台线程中启动服务，上游改为同样在本进程中运行的 dblp 替身服务（standin_server，
+可设置延迟、抖动、错误率和 429 限流，不访问网络），再用 aiohttp 模拟多个并发客户端按 Zipf 分布重复查询少量热门关键词，统计：
+    吞吐量、客户端延迟（p50/p95/p99）
+    上游请求数：替身服务实际收到的请求，对比“每台机器各自缓存”时需要的请求数
+    命中缓存 / 合并的请求数、限速等待时间
+
+用法：
+    python benchmarks/bench_server.py [--clients 1 10 50] [--requests 40] [--keys 100]
+                                      [--latency 0.3] [--jitter 0] [--error-rate 0] [--throttle 0]
+                                      [--rate 20] [--burst 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+ENDPOINT_WEIGHTS = (("author", 5), ("publications", 3), ("venue", 2))
+
+
+def start_upstream(args):
+    """启动 dblp 替身服务并让 dblp_api 改为访问它（不使用磁盘缓存，上游请求数即替身服务收到的请求数）"""
+    import dblp_searcher.dblp_api as dblp_api
+    import standin_server
+
+    upstream = standin_server.start(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                                    throttle=args.throttle, seed=args.seed)
+    dblp_api.DBLP_URL = upstream.base_url
+    dblp_api.BASE_URL = f"{upstream.base_url}/search"
+    dblp_api.CACHE_TTL = None
+    return upstream
+
+
+def make_workload(clients, requests, keys, seed):
+    """每个客户端的请求序列 [(接口, 关键词)]，关键词按 Zipf(1.1) 分布，固定随机种子"""
+    rng = random.Random(seed)
+    weights = [1 / (rank ** 1.1) for rank in range(1, keys + 1)]
+    endpoints = [name for name, weight in ENDPOINT_WEIGHTS for _ in range(weight)]
+    return [[(rng.choice(endpoints), f"keyword{rng.choices(range(keys), weights)[0]}") for _ in range(requests)]
+            for _ in range(clients)]
+
+
+def start_server(rate, burst):
+    """在后台线程中启动服务，返回 (地址, service, 停止函数)"""
+    from aiohttp import web
+    from dblp_searcher.dblp_server import SearchService, create_app
+
+    service = SearchService(rate=rate, burst=burst)
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    state = {}
+
+    async def serve():
+        runner = web.AppRunner(create_app(service))
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        state["port"] = runner.addresses[0][1]
+        state["runner"] = runner
+        ready.set()
+
+    thread = threading.Thread(target=lambda: (loop.run_until_complete(serve()), loop.run_forever()), daemon=True)
+    thread.start()
+    ready.wait()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(state["runner"].cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    return f"http://127.0.0.1:{state['port']}", service, stop
+
+
+async def run_clients(base_url, workload):
+    """各客户端依次发出自己的请求（客户端之间并发），返回每个请求的延迟（秒）"""
+    import aiohttp
+
+    latencies = []
+    errors = 0
+
+    async def client(requests):
+        nonlocal errors
+        async with aiohttp.ClientSession() as session:
+            for endpoint, keyword in requests:
+                start = time.perf_counter()
+                async with session.get(f"{base_url}/api/{endpoint}", params={"q": keyword, "h": 100}) as response:
+                    await response.read()
+                    if response.status != 200:
+                        errors += 1
+                latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(client(requests) for requests in workload))
+    return latencies, errors
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def run_case(clients, args):
+    upstream = start_upstream(args)
+    base_url, service, stop = start_server(args.rate, args.burst)
+    workload = make_workload(clients, args.requests, args.keys, args.seed)
+    try:
+        start = time.perf_counter()
+        latencies, errors = asyncio.run(run_clients(base_url, workload))
+        elapsed = time.perf_counter() - start
+    finally:
+        stop()
+        upstream.shutdown()
+        upstream.server_close()
+
+    stats = service.snapshot()
+    total = len(latencies)
+    distinct = len({request for requests in workload for request in requests})
+    per_client = sum(len(set(requests)) for requests in workload)  # 每台机器各自缓存时的上游请求数
+    return {
+        "clients": clients, "requests": total, "errors": errors, "seconds": elapsed,
+        "throughput": total / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000, "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "upstream": upstream.snapshot()["requests"], "distinct": distinct, "per_client_cache": per_client,
+        "cache_hits": stats["cache_hits"], "coalesced": stats["coalesced"],
+        "rate_wait_s": stats["rate_wait_seconds"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DBLP 共享查询服务负载测试")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 50], help="并发客户端数（可给多个）")
+    parser.add_argument("--requests", type=int, default=40, help="每个客户端的请求数")
+    parser.add_argument("--keys", type=int, default=100, help="不同关键词的数量")
+    parser.add_argument("--latency", type=float, default=0.3, help="替身服务每次请求的延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="替身服务额外随机延迟的上限（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="替身服务返回 500 的比例")
+    parser.add_argument("--throttle", type=float, default=0.0, help="替身服务每秒最多处理的请求数，超过返回 429")
+    parser.add_argument("--rate", type=float, default=20, help="服务端上游限速（每秒请求数）")
+    parser.add_argument("--burst", type=int, default=10, help="服务端上游突发请求数")
+    parser.add_argument("--seed", type=int, default=1, help="生成请求序列的随机种子")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    args = parser.parse_args()
+
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        parser.exit(1, "负载测试需要安装 aiohttp（pip install aiohttp）\n")
+
+    results = [run_case(clients, args) for clients in args.clients]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"替身上游延迟 {args.latency * 1000:.0f} ms（抖动 {args.jitter * 1000:.0f} ms，"
+          f"错误率 {args.error_rate:.0%}），服务端限速 {args.rate:g}/s（突发 {args.burst}），"
+          f"{args.keys} 个关键词，每客户端 {args.requests} 个请求")
+    print(f"{'客户端':>6}{'请求':>7}{'吞吐(次/s)':>12}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}"
+          f"{'上游':>7}{'各自缓存':>10}{'命中':>7}{'合并':>7}{'错误':>6}")
+    for r in results:
+        print(f"{r['clients']:>6}{r['requests']:>7}{r['throughput']:>12.1f}{r['p50_ms']:>10.1f}"
+              f"{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['upstream']:>7}{r['per_client_cache']:>10}"
+              f"{r['cache_hits']:>7}{r['coalesced']:>7}{r['errors']:>6}")
+    print("上游：替身服务收到的请求数；各自缓存：每个客户端单独缓存时需要的上游请求数")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+启动性能测试：导入耗时与首次绘制耗时。
+
+每轮启动一个新的 Python 进程（避免模块缓存影响），在子进程中测量：
+    import_ms       导入 main 模块（含 PyQt5 与各页签依赖）
+    window_ms       构建 MainWindow
+    first_paint_ms  从进程开始执行脚本到窗口第一次绘制
+
+用法：
+    python benchmarks/bench_startup.py [--runs 10] [--modules 15] [--session-rows 100000]
+
+没有图形环境时自动使用 QT_QPA_PLATFORM=offscreen。
+--modules 大于 0 时额外用 -X importtime 列出启动时最耗时的模块。
+--session-rows 大于 0 时先生成一个含该数量论文的会话快照，测量带会话恢复的启动；
+否则使用空的会话路径，不受本机已有会话影响。
+"""
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_child():
+    """子进程：导入并显示主窗口，捕获第一次绘制事件后输出各阶段耗时"""
+    sys.path.insert(0, ROOT)
+    from PyQt5.QtCore import QObject, QEvent
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication(sys.argv[:1])
+    t_import = time.perf_counter()
+    import main
+    import_ms = (time.perf_counter() - t_import) * 1000
+
+    timings = {"import_ms": import_ms}
+
+    class FirstPaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and "first_paint_ms" not in timings:
+                timings["first_paint_ms"] = (time.perf_counter() - _START) * 1000
+                app.quit()
+            return False
+
+    paint_filter = FirstPaintFilter()
+    app.installEventFilter(paint_filter)
+
+    t_window = time.perf_counter()
+    window = main.MainWindow()
+    timings["window_ms"] = (time.perf_counter() - t_window) * 1000
+    window.show()
+    app.exec_()
+    print(json.dumps(timings))
+
+
+def child_env(session_path=None):
+    env = dict(os.environ)
+    if session_path is not None:
+        env["DBLP_SESSION_FILE"] = session_path
+    if not env.get("DISPLAY") and not env.get("WAYLAND_DISPLAY") and sys.platform.startswith("linux"):
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+
+def write_session(path, rows):
+    """生成一个文献页签含 rows 篇论文的会话快照"""
+    sys.path.insert(0, ROOT)
+    from dblp_searcher.dblp_session import SessionStore
+
+    papers = [{
+        "title": f"Synthetic paper {i} on graph neural networks", "authors": [f"Author {i % 997}", f"Author {i % 89}"],
+        "venue": f"Venue {i % 50}", "pages": "1-10", "year": str(1990 + i % 35), "type": "Journal Articles",
+        "access": "open" if i % 3 else "closed", "key": f"journals/x/{i}", "doi": f"10.0/{i}",
+        "ee": f"https://doi.org/10.0/{i}", "url": f"https://dblp.org/rec/journals/x/{i}", "volume": str(i % 40),
+    } for i in range(rows)]
+    state = {"keyword": "graph", "history_label": "graph", "lists": {}, "attrs": {}}
+    SessionStore(path).save({"current_tab": 0, "tabs": {"PaperTab": state}}, {"PaperTab": papers})
+
+
+def measure(runs, session_path):
+    """运行 runs 个子进程，返回 {指标: [每轮耗时]}"""
+    results = {}
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, os.path.abspath(__file__), "--child"],
+                                         env=child_env(session_path), cwd=ROOT)
+        timings = json.loads(output.decode("utf-8").strip().splitlines()[-1])
+        for key, value in timings.items():
+            results.setdefault(key, []).append(value)
+    return results
+
+
+def slowest_modules(limit):
+    """用 -X importtime 统计导入 main 时自身耗时最多的模块"""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                               env=child_env(), cwd=ROOT, capture_output=True)
+    modules = []
+    for line in completed.stderr.decode("utf-8", "replace").splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((int(self_us), int(cumulative_us), name.rstrip()))
+    modules.sort(reverse=True)
+    return modules[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DBLP 检索系统启动性能测试")
+    parser.add_argument("--runs", type=int, default=10, help="重复次数")
+    parser.add_argument("--modules", type=int, default=15, help="列出最耗时的模块数量，0 表示不列出")
+    parser.add_argument("--session-rows", type=int, default=0, help="会话快照中的论文数量，0 表示不恢复会话")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child()
+        return
+
+    with tempfile.TemporaryDirectory(prefix="dblp_bench_") as temp_dir:
+        session_path = os.path.join(temp_dir, "session.dcol")
+        if args.session_rows > 0:
+            write_session(session_path, args.session_rows)
+        results = measure(args.runs, session_path)
+    print(f"{'指标':<16}{'中位数(ms)':>12}{'最小(ms)':>12}{'最大(ms)':>12}")
+    for key in ("import_ms", "window_ms", "first_paint_ms"):
+        values = results.get(key, [])
+        if values:
+            print(f"{key:<16}{statistics.median(values):>12.1f}{min(values):>12.1f}{max(values):>12.1f}")
+
+    if args.modules > 0:
+        print(f"\n导入耗时最多的模块（自身耗时，共 {args.modules} 个）：")
+        for self_us, cumulative_us, name in slowest_modules(args.modules):
+            print(f"  {self_us / 1000:8.1f} ms  (累计 {cumulative_us / 1000:8.1f} ms)  {name.strip()}")
+
+
+if __name__ == "__main__":
+    main()
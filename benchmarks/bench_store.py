@@ -0,0 +1,101 @@
+"""
+本地记录库的增量更新测试：同一份新版 dump 分别全量导入和在旧版的库上增量更新，比较耗时，
+并核对两种方式得到的库内容（论文表）完全一致。
+
+dump 由 fixtures.dblp_dump 按固定随机种子生成，新版本相对旧版本修改约 2%、删除约 0.5%、新增约 1% 的记录
+（与 dblp 每月发布的 dump 之间的变化量相近）。另外检查更新中途被中断时库会回滚到更新前的状态。
+
+用法：
+    python benchmarks/bench_store.py [--papers 200000]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+import fixtures  # noqa: E402
+from dblp_searcher import dblp_store  # noqa: E402
+from dblp_searcher.dblp_store import LocalStore  # noqa: E402
+
+
+def contents(store):
+    return store.conn.execute("SELECT * FROM publications ORDER BY key").fetchall()
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def check_rollback(old_path, new_dump, directory):
+    """在更新读到一半时抛出 KeyboardInterrupt，库应与更新前完全相同"""
+    path = os.path.join(directory, "interrupted.sqlite3")
+    shutil.copy(old_path, path)
+    store = LocalStore(path)
+    before = contents(store)
+
+    def interrupt(count):
+        raise KeyboardInterrupt
+
+    batch_size = dblp_store.BATCH_SIZE
+    dblp_store.BATCH_SIZE = 1000
+    try:
+        store.update_from_dump(new_dump, progress=interrupt)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dblp_store.BATCH_SIZE = batch_size
+    store.close()
+    store = LocalStore(path)
+    same = contents(store) == before and store.get_meta("release") == "dblp.xml"
+    store.close()
+    return same
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地记录库：全量导入与增量更新的耗时")
+    parser.add_argument("--papers", type=int, default=200000, help="旧版 dump 的记录数（默认 200000）")
+    parser.add_argument("--seed", type=int, default=fixtures.SEED)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="dblp-bench-store-") as directory:
+        old_dump = fixtures.dblp_dump(directory, args.papers, seed=args.seed)
+        new_dump = fixtures.dblp_dump(directory, args.papers, seed=args.seed, release=1)
+
+        old_path = os.path.join(directory, "old.sqlite3")
+        store = LocalStore(old_path)
+        store.import_dump(old_dump)
+        store.close()
+
+        full = LocalStore(os.path.join(directory, "full.sqlite3"))
+        count, full_seconds = timed(full.import_dump, new_dump)
+        print(f"全量导入  {count} 条，{full_seconds:.1f} 秒（{count / full_seconds:.0f} 条/秒）")
+
+        incremental_path = os.path.join(directory, "incremental.sqlite3")
+        shutil.copy(old_path, incremental_path)
+        incremental = LocalStore(incremental_path)
+        counts, update_seconds = timed(incremental.update_from_dump, new_dump)
+        print(f"增量更新  {counts['records']} 条，{update_seconds:.1f} 秒（{counts['records'] / update_seconds:.0f} 条/秒，"
+              f"全量导入的 {update_seconds / full_seconds:.0%}）：新增 {counts['inserted']}，修改 {counts['changed']}，"
+              f"删除 {counts['deleted']}，未变 {counts['unchanged']}")
+
+        same = contents(full) == contents(incremental)
+        full.close()
+        incremental.close()
+        print(f"内容一致：{'是' if same else '否'}")
+        rolled_back = check_rollback(old_path, new_dump, directory)
+        print(f"中断后回滚：{'是' if rolled_back else '否'}")
+        if not (same and rolled_back):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
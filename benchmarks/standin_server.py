@@ -0,0 +1,315 @@
+"""
+dblp.org 的本地替身服务，用于可重复的负载、缓存与限速测试，不访问网络。
+
+模拟以下接口，内容按请求参数用固定随机种子生成（同一请求每次返回相同内容）：
+    /search/publ/api  /search/author/api  /search/venue/api   dblp 搜索接口（JSON，支持 q/h/f）
+    /pid/...[.html]                                           作者主页
+    /db/conf/<会议>/[index.html]   /db/conf/<会议>/<届>.html   会议 index 与论文集
+    /db/journals/<期刊>/[index.html]   /db/journals/<期刊>/<卷>.html   期刊主页与各卷
+    /rec/<key>[.html]?view=bibtex                             BibTeX 页面
+    /graph/v1/paper/DOI:<doi>                                 Semantic Scholar 摘要
+    POST /graph/v1/paper/batch                                Semantic Scholar 批量查询引用数
+    /api/trans/vip/translate                                  百度翻译
+    /__stats                                                  各接口请求数与返回状态统计
+--recorded 时优先返回 benchmarks/fixtures 下录制的真实页面（页面中的 dblp.org 链接改写为本服务地址）。
+
+可注入的故障：
+    --latency / --jitter   每个请求固定延迟 + 0~jitter 秒的随机延迟
+    --error-rate           按比例返回 500
+    --throttle             超过每秒请求数时返回 429（带 Retry-After），与 dblp.org 的限流一致
+
+启动后用环境变量让程序和性能测试改为访问本服务：
+    python benchmarks/standin_server.py --port 8800 --latency 0.2 --jitter 0.1 --throttle 20
+    DBLP_BASE_URL=http://127.0.0.1:8800 S2_API_URL=http://127.0.0.1:8800 \
+    BAIDU_TRANSLATE_URL=http://127.0.0.1:8800/api/trans/vip/translate python main.py
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import fixtures  # noqa: E402
+
+DEFAULT_PORT = 8800
+MAX_HITS = 1000      # dblp 搜索接口单次最多返回的条数
+MAX_FIRST = 10000    # dblp 搜索接口最多可翻到的位置
+
+
+def query_seed(*parts):
+    """由请求参数得到固定的随机种子"""
+    return zlib.crc32("\0".join(parts).encode("utf-8"))
+
+
+class StandinServer(ThreadingHTTPServer):
+    """保存故障注入参数和请求统计，请求由 StandinHandler 处理"""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, jitter=0.0, error_rate=0.0, throttle=0.0, recorded=False,
+                 seed=1, verbose=False):
+        super().__init__(address, StandinHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle = throttle
+        self.recorded = recorded
+        self.verbose = verbose
+        self.base_url = f"http://{self.server_address[0]}:{self.server_address[1]}"
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = throttle
+        self._updated = time.monotonic()
+        self.stats = {"requests": 0, "routes": {}, "status": {}}
+
+    def fault(self):
+        """决定本次请求的延迟（秒）和注入的错误状态码（None 表示正常返回）"""
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+            if self.throttle:
+                # 令牌桶：每秒补充 throttle 个令牌，桶容量也是 throttle
+                now = time.monotonic()
+                self._tokens = min(self.throttle, self._tokens + (now - self._updated) * self.throttle)
+                self._updated = now
+                if self._tokens < 1:
+                    return 0, 429
+                self._tokens -= 1
+            if self.error_rate and self._rng.random() < self.error_rate:
+                return delay, 500
+            return delay, None
+
+    def count(self, route, status):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["routes"][route] = self.stats["routes"].get(route, 0) + 1
+            self.stats["status"][str(status)] = self.stats["status"].get(str(status), 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return json.loads(json.dumps(self.stats))
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = {name: values[0] for name, values in parse_qs(parsed.query).items()}
+        if parsed.path == "/__stats":
+            self._send(200, json.dumps(self.server.snapshot(), indent=2), "application/json")
+            return
+
+        self._respond(*_route(parsed.path, ROUTES), parsed.path, params)
+
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        params = {name: values[0] for name, values in parse_qs(parsed.query).items()}
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        try:
+            params["body"] = json.loads(body or b"null")
+        except ValueError:
+            self._send(400, "请求体不是 JSON")
+            return
+        self._respond(*_route(parsed.path, POST_ROUTES), parsed.path, params)
+
+    def _respond(self, route, handler, path, params):
+        if handler is None:
+            self.server.count("other", 404)
+            self._send(404, "Not Found")
+            return
+
+        delay, error = self.server.fault()
+        if delay:
+            time.sleep(delay)
+        if error == 429:
+            self.server.count(route, 429)
+            self._send(429, "Too Many Requests", headers={"Retry-After": "1"})
+        elif error:
+            self.server.count(route, error)
+            self._send(error, "Internal Server Error")
+        else:
+            try:
+                body, content_type = handler(self.server, path, params)
+            except ValueError as e:
+                self.server.count(route, 400)
+                self._send(400, str(e))
+                return
+            self.server.count(route, 200)
+            self._send(200, body, content_type)
+
+    def _send(self, status, body, content_type="text/plain", headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def _recorded(server, name):
+    """--recorded 时返回录制文件内容（链接改写为本服务地址），否则返回 None"""
+    if not server.recorded or name is None:
+        return None
+    text = fixtures.recorded(name)
+    return text.replace(fixtures.DBLP_URL, server.base_url) if text is not None else None
+
+
+def _search(generator, recorded_name):
+    def handle(server, path, params):
+        query = params.get("q", "")
+        hits = min(int(params.get("h", 30)), MAX_HITS)
+        first = int(params.get("f", 0))
+        if hits < 0 or not 0 <= first <= MAX_FIRST:
+            raise ValueError("h 或 f 参数超出范围")
+        text = _recorded(server, recorded_name)
+        if text is None:
+            seed = query_seed(path, query.lower())
+            total = min(seed % 3000, MAX_FIRST)
+            text = generator(hits, base=server.base_url, seed=seed, start=first, total=total)
+        return text, "application/json"
+    return handle
+
+
+def _profile(server, path, params):
+    text = _recorded(server, "profile_large.html")
+    if text is None:
+        seed = query_seed(path)
+        text = fixtures.profile_html(20 + seed % 400, base=server.base_url, seed=seed)
+    return text, "text/html"
+
+
+def _conference(server, path, params):
+    conf, page = re.match(r"/db/conf/([^/]+)/(.*)", path).groups()
+    seed = query_seed(path)
+    if page in ("", "index.html"):
+        text = _recorded(server, "conference_index.html")
+        if text is None:
+            text = fixtures.conference_index_html(10 + seed % 30, base=server.base_url, seed=seed, conf=conf)
+    else:
+        text = _recorded(server, "proceedings.html")
+        if text is None:
+            text = fixtures.proceedings_html(100 + seed % 900, base=server.base_url, seed=seed,
+                                             venue=conf.upper())
+    return text, "text/html"
+
+
+def _journal(server, path, params):
+    journal, page = re.match(r"/db/journals/([^/]+)/(.*)", path).groups()
+    seed = query_seed(path)
+    if page in ("", "index.html"):
+        text = _recorded(server, "journal_index.html")
+        if text is None:
+            text = fixtures.journal_index_html(10 + seed % 40, base=server.base_url, journal=journal)
+    else:
+        text = fixtures.proceedings_html(30 + seed % 120, base=server.base_url, seed=seed,
+                                         type_key="article", venue=journal.upper())
+    return text, "text/html"
+
+
+def _bibtex(server, path, params):
+    key = re.sub(r"\.html$", "", path[len("/rec/"):])
+    return fixtures.bibtex_html(key, base=server.base_url), "text/html"
+
+
+def _abstract(server, path, params):
+    doi = path.split("DOI:", 1)[1]
+    return fixtures.semantic_scholar_json(doi, seed=query_seed(doi)), "application/json"
+
+
+def _citations(server, path, params):
+    """Semantic Scholar 批量接口：约 10% 的 DOI 查不到（返回 null），其余引用数按 DOI 固定生成"""
+    ids = (params.get("body") or {}).get("ids")
+    if not isinstance(ids, list) or len(ids) > 500:
+        raise ValueError("ids 必须是不超过 500 个元素的列表")
+    result = []
+    for paper_id in ids:
+        seed = query_seed(str(paper_id).lower())
+        if seed % 10 == 0:
+            result.append(None)
+        else:
+            citations = seed % 5000
+            result.append({"paperId": f"{seed:08x}", "citationCount": citations,
+                           "influentialCitationCount": citations // 20})
+    return json.dumps(result), "application/json"
+
+
+def _translate(server, path, params):
+    lines = params.get("q", "").split("\n")
+    result = {"from": params.get("from", "auto"), "to": params.get("to", "zh"),
+              "trans_result": [{"src": line, "dst": f"[{params.get('to', 'zh')}] {line}"} for line in lines]}
+    return json.dumps(result, ensure_ascii=False), "application/json"
+
+
+ROUTES = (
+    ("publ", r"/search/publ/api$", _search(fixtures.search_publications_json, "search_publ_1000.json")),
+    ("author", r"/search/author/api$", _search(fixtures.search_authors_json, "search_author_1000.json")),
+    ("venue", r"/search/venue/api$", _search(fixtures.search_venues_json, None)),
+    ("pid", r"/pid/.+", _profile),
+    ("conf", r"/db/conf/[^/]+/", _conference),
+    ("journals", r"/db/journals/[^/]+/", _journal),
+    ("rec", r"/rec/.+", _bibtex),
+    ("s2", r"/graph/v1/paper/DOI:.+", _abstract),
+    ("translate", r"/api/trans/vip/translate$", _translate),
+)
+POST_ROUTES = (
+    ("s2_batch", r"/graph/v1/paper/batch$", _citations),
+)
+
+
+def _route(path, routes):
+    """返回 (统计用的接口名, 处理函数)，没有匹配的接口时处理函数为 None"""
+    for name, pattern, handler in routes:
+        if re.match(pattern, path):
+            return name, handler
+    return None, None
+
+
+def start(host="127.0.0.1", port=0, **options):
+    """在后台线程中启动服务（port=0 时随机选择空闲端口），返回 StandinServer；用完调用 shutdown()"""
+    server = StandinServer((host, port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="dblp.org 本地替身服务（负载与限速测试用）")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="监听端口")
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的固定延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="额外随机延迟的上限（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 500 的比例（0~1）")
+    parser.add_argument("--throttle", type=float, default=0.0, help="每秒最多处理的请求数，超过返回 429（0 表示不限）")
+    parser.add_argument("--recorded", action="store_true", help="优先返回 benchmarks/fixtures 下录制的真实页面")
+    parser.add_argument("--seed", type=int, default=1, help="延迟抖动与错误注入的随机种子")
+    parser.add_argument("-v", "--verbose", action="store_true", help="打印每个请求")
+    args = parser.parse_args()
+
+    server = StandinServer((args.host, args.port), latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, throttle=args.throttle, recorded=args.recorded,
+                           seed=args.seed, verbose=args.verbose)
+    print(f"dblp 替身服务已启动：{server.base_url}（请求统计：{server.base_url}/__stats）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
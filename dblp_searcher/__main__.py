@@ -0,0 +1,5 @@
+import sys
+
+from dblp_searcher.dblp_cli import main
+
+sys.exit(main())
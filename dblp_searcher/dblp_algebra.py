@@ -0,0 +1,211 @@
+"""
+多个查询结果的集合运算：按 dblp key 求交、并、差，例如
+    profile:"Wei Wang" & publications:"graph neural network"     某作者在某方向上的论文
+    publications:"diffusion" - publications:"survey"             查询 X 减去查询 Y
+    profile:https://dblp.org/db/conf/cvpr/cvpr2023.html | profile:https://dblp.org/db/conf/cvpr/cvpr2022.html
+
+语法：操作数为 类型:查询，查询含空格或运算符时用双引号括起；
+运算符 &（交）优先于 |（并）和 -（差），同级从左到右结合，可用括号改变顺序。
+
+论文 key 映射为整数编号，每个子查询的结果是一个位图（Python 整数，第 i 位表示编号 i，
+与 dblp_index 相同）。各子查询并发执行，每到一批结果就重新求值表达式的上下界：
+    下界：已经确定属于结果的论文（子查询的结果只会增加），可以立即输出；
+    上界：仍可能属于结果的论文，未完成的子查询按“全部论文”计（位图 -1，即所有位为 1）。
+上下界相等时结果已确定，其余子查询直接取消，例如 A & B 中 A 的结果为空时不必等 B。
+"""
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from dblp_searcher.dblp_http import CancelToken
+from dblp_searcher.dblp_index import bits_to_rows
+
+OPERATORS = {"&": 2, "|": 1, "-": 1}  # 运算符 -> 优先级
+ALL = -1  # 全集位图
+
+_TOKEN_RE = re.compile(r'\s*(?:([&|()-])|([A-Za-z_]+):(?:"((?:[^"\\]|\\.)*)"|([^\s&|()]+)))')
+
+
+class ExpressionError(ValueError):
+    """表达式语法错误"""
+
+
+class Leaf:
+    """表达式中的一个子查询"""
+
+    def __init__(self, kind, query):
+        self.kind = kind
+        self.query = query
+
+    def __repr__(self):
+        return f'{self.kind}:"{self.query}"'
+
+
+def parse_expression(text, kinds=None):
+    """
+    把表达式解析为语法树：Leaf 或 (运算符, 左子树, 右子树)。
+    kinds 不为空时，子查询类型必须是其中之一。
+    """
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN_RE.match(text, position)
+        if match is None:
+            raise ExpressionError(f"无法解析：{text[position:]}")
+        operator, kind, quoted, bare = match.groups()
+        if operator:
+            tokens.append(operator)
+        else:
+            if kinds is not None and kind not in kinds:
+                raise ExpressionError(f"未知的查询类型：{kind}（可用：{', '.join(kinds)}）")
+            query = re.sub(r"\\(.)", r"\1", quoted) if quoted is not None else bare
+            tokens.append(Leaf(kind, query))
+        position = match.end()
+    if not tokens:
+        raise ExpressionError("表达式为空")
+
+    tokens.reverse()
+
+    def operand():
+        if not tokens:
+            raise ExpressionError("表达式不完整")
+        token = tokens.pop()
+        if token == "(":
+            node = expression(0)
+            if not tokens or tokens.pop() != ")":
+                raise ExpressionError("缺少右括号")
+            return node
+        if isinstance(token, Leaf):
+            return token
+        raise ExpressionError(f"此处应为查询：{token}")
+
+    def expression(min_priority):
+        node = operand()
+        while tokens and tokens[-1] in OPERATORS and OPERATORS[tokens[-1]] > min_priority:
+            operator = tokens.pop()
+            node = (operator, node, expression(OPERATORS[operator]))
+        return node
+
+    tree = expression(0)
+    if tokens:
+        raise ExpressionError(f"多余的内容：{tokens[-1]}")
+    return tree
+
+
+def leaves(tree):
+    """语法树中的全部子查询（从左到右）"""
+    if isinstance(tree, Leaf):
+        return [tree]
+    return leaves(tree[1]) + leaves(tree[2])
+
+
+def paper_key(paper):
+    """集合运算用的论文标识：dblp key，缺失时用小写标题"""
+    key = paper.get("key")
+    if key and key != "N/A":
+        return key
+    return "title:" + (paper.get("title") or "").strip().lower()
+
+
+class KeyTable:
+    """dblp key 与整数编号的对应表，同一 key 只保存第一次出现的论文"""
+
+    def __init__(self):
+        self._ids = {}
+        self.papers = []
+
+    def __len__(self):
+        return len(self.papers)
+
+    def add(self, papers):
+        """加入一批论文，返回它们对应的位图"""
+        bits = 0
+        for paper in papers:
+            key = paper_key(paper)
+            number = self._ids.get(key)
+            if number is None:
+                number = self._ids[key] = len(self.papers)
+                self.papers.append(paper)
+            bits |= 1 << number
+        return bits
+
+
+def bounds(tree, results, done):
+    """
+    表达式的 (下界, 上界) 位图。
+    results[i] 为第 i 个子查询（leaves 的顺序）目前的结果，done[i] 表示它是否已完成。
+    """
+    counter = iter(range(len(results)))
+
+    def walk(node):
+        if isinstance(node, Leaf):
+            i = next(counter)
+            return results[i], results[i] if done[i] else ALL
+        operator, left, right = node
+        low_a, high_a = walk(left)
+        low_b, high_b = walk(right)
+        if operator == "&":
+            return low_a & low_b, high_a & high_b
+        if operator == "|":
+            return low_a | low_b, high_a | high_b
+        return low_a & ~high_b, high_a & ~low_b
+
+    return walk(tree)
+
+
+def evaluate(tree, sources, jobs=4, cancel_token=None):
+    """
+    并发执行表达式中的子查询并求值，逐批返回已确定属于结果的论文（list）。
+
+    参数：
+        tree: parse_expression() 的结果
+        sources: 子查询类型 -> fn(query, cancel_token)，返回论文 dict 的批次（可迭代）
+        jobs: 同时执行的子查询数
+        cancel_token: 可选，取消时其余子查询也随之取消
+    子查询失败时抛出其异常。
+    """
+    queries = leaves(tree)
+    table = KeyTable()
+    results = [0] * len(queries)
+    done = [False] * len(queries)
+    inner_token = CancelToken()  # 结果提前确定时只取消子查询，不影响调用方的 cancel_token
+    events = queue.Queue()
+
+    def run(i, leaf):
+        try:
+            for batch in sources[leaf.kind](leaf.query, inner_token):
+                events.put((i, batch, None))
+        except Exception as e:
+            events.put((i, None, e))
+        else:
+            events.put((i, None, None))
+
+    executor = ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix="dblp-algebra")
+    try:
+        for i, leaf in enumerate(queries):
+            executor.submit(run, i, leaf)
+        emitted = 0
+        while not all(done):
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()  # finally 中随之取消子查询
+            try:
+                i, batch, error = events.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if error is not None and not inner_token.cancelled:
+                raise error
+            if batch is not None:
+                results[i] |= table.add(batch)
+            else:
+                done[i] = True
+            low, high = bounds(tree, results, done)
+            new = low & ~emitted
+            if new:
+                emitted |= new
+                yield [table.papers[number] for number in bits_to_rows(new)]
+            if low == high:
+                break  # 结果已确定
+    finally:
+        inner_token.cancel()
+        executor.shutdown(wait=True)
@@ -1,35 +1,73 @@
+import os
+
 import requests
-from bs4 import BeautifulSoup
-import requests
+from dblp_searcher import dblp_trace
+from dblp_searcher.dblp_http import http_get
 
-BASE_URL = "https://dblp.org/search"
+# 环境变量 DBLP_BASE_URL 可指向镜像站或本地替身服务（benchmarks/standin_server.py）
+DBLP_URL = os.environ.get("DBLP_BASE_URL", "https://dblp.org").rstrip("/")
+BASE_URL = f"{DBLP_URL}/search"
+CACHE_TTL = 24 * 3600  # 搜索结果缓存一天
 
-def query_publications(keyword, max_results=1000):
+def query_publications(keyword, max_results=1000, cancel_token=None, first=0):
     url = f"{BASE_URL}/publ/api?q={keyword}&format=json&h={max_results}"
+    if first:
+        url += f"&f={first}"
     try:
-        response = requests.get(url)
+        response = http_get(url, cancel_token=cancel_token, cache_ttl=CACHE_TTL)
         response.raise_for_status()
-        return response.json()
+        with dblp_trace.span("decode.json", bytes=len(response.content)):
+            return response.json()
     except requests.RequestException as e:
         print(f"查询文献失败: {e}")
         return {}
 
-def search_author(author_name, max_results=1000):
+def iter_publications(keyword, max_results=1000, page_size=100, cancel_token=None):
+    """
+    分页查询文献，每次返回一页 JSON（通过 f 参数指定起始位置），
+    第一页返回后即可展示结果，不必等待全部结果下载完成。
+    """
+    def fetch_page(hits, first):
+        return query_publications(keyword, hits, cancel_token=cancel_token, first=first)
+    return iter_result_pages(fetch_page, max_results, page_size)
+
+def iter_result_pages(fetch_page, max_results, page_size):
+    """
+    按页调用 fetch_page(本页条数, 起始位置) 直到取满 max_results 条或结果取完；
+    fetch_page 返回空 dict（请求失败）时停止。
+    """
+    first = 0
+    while first < max_results:
+        hits = min(page_size, max_results - first)
+        data = fetch_page(hits, first)
+        if not data:
+            return
+        yield data
+
+        result_hits = data.get("result", {}).get("hits", {})
+        total = int(result_hits.get("@total", 0) or 0)
+        first += hits
+        if int(result_hits.get("@sent", 0) or 0) < hits or first >= total:
+            return
+
+def search_author(author_name, max_results=1000, cancel_token=None):
     url = f"{BASE_URL}/author/api?q={author_name}&format=json&h={max_results}"
     try:
-        response = requests.get(url)
+        response = http_get(url, cancel_token=cancel_token, cache_ttl=CACHE_TTL)
         response.raise_for_status()
-        return response.json()
+        with dblp_trace.span("decode.json", bytes=len(response.content)):
+            return response.json()
     except requests.RequestException as e:
         print(f"查询作者失败: {e}")
         return {}
 
-def search_venue(venue_name, max_results=1000):
+def search_venue(venue_name, max_results=1000, cancel_token=None):
     url = f"{BASE_URL}/venue/api?q={venue_name}&format=json&h={max_results}"
     try:
-        response = requests.get(url)
+        response = http_get(url, cancel_token=cancel_token, cache_ttl=CACHE_TTL)
         response.raise_for_status()
-        return response.json()
+        with dblp_trace.span("decode.json", bytes=len(response.content)):
+            return response.json()
     except requests.RequestException as e:
         print(f"查询出版源失败: {e}")
         return {}
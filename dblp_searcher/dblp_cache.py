@@ -0,0 +1,193 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+
+from dblp_searcher.dblp_compress import Compressor, MIN_SIZE, TRAIN_SAMPLES
+
+# 缓存目录，可通过环境变量 DBLP_CACHE_DIR 修改
+CACHE_DIR = os.environ.get("DBLP_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".dblp_viewer", "cache")
+
+
+class DiskCache:
+    """
+    简单的磁盘缓存：每个键一个文件，按键的 sha1 分目录存放。
+
+    文件格式：第一行为 JSON 头（原始键、写入时间），其后为内容。
+    内容按 dblp_compress 压缩（带训练出的字典，字典存放在 dict 子目录），JSON 头中记录编码、字典编号
+    和原始大小，读取时透明解压；没有编码字段的旧文件按原始字节读取。
+    """
+
+    SUFFIX = ".cache"
+
+    def __init__(self, directory=CACHE_DIR, codec=None):
+        self.directory = directory
+        self.compressor = Compressor(os.path.join(directory, "dict"), codec)
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + self.SUFFIX)
+
+    def get(self, key, ttl=None):
+        """读取缓存；不存在或超过 ttl 秒时返回 None"""
+        entry = self._read(self._path(key))
+        if entry is None:
+            return None
+        header, value = entry
+        if header.get("key") != key:
+            return None
+        if ttl is not None and time.time() - header.get("time", 0) > ttl:
+            return None
+        return value
+
+    def set(self, key, value):
+        """写入缓存（value 为 bytes），先写临时文件再替换，避免读到半个文件"""
+        self._write(self._path(key), {"key": key, "time": time.time()}, value)
+
+    def _write(self, path, header, value):
+        meta, data = self.compressor.compress(value)
+        header = json.dumps(dict(header, **meta), ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(header + b"\n" + data)
+            os.replace(temp_path, path)
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _paths(self):
+        if not os.path.isdir(self.directory):
+            return
+        for sub in sorted(os.listdir(self.directory)):
+            sub_dir = os.path.join(self.directory, sub)
+            if not os.path.isdir(sub_dir):
+                continue
+            for name in os.listdir(sub_dir):
+                if name.endswith(self.SUFFIX):
+                    yield os.path.join(sub_dir, name)
+
+    def items(self, key_filter=None):
+        """遍历缓存中的 (键, 内容)，key_filter 为可选的键过滤函数"""
+        for path in self._paths():
+            header = self._read_header(path)
+            if header is None:
+                continue
+            if key_filter is None or key_filter(header.get("key", "")):
+                entry = self._read(path)  # 只解压需要的条目
+                if entry is not None:
+                    yield entry[0].get("key", ""), entry[1]
+
+    def stats(self):
+        """缓存占用：{"entries": 条数, "disk_bytes": 文件总大小, "raw_bytes": 解压后的内容总大小, "compressed": 压缩的条数}"""
+        result = {"entries": 0, "disk_bytes": 0, "raw_bytes": 0, "compressed": 0}
+        for path in self._paths():
+            header = self._read_header(path)
+            if header is None:
+                continue
+            disk_bytes = os.path.getsize(path)
+            result["entries"] += 1
+            result["disk_bytes"] += disk_bytes
+            if header.get("codec"):
+                result["compressed"] += 1
+                result["raw_bytes"] += header.get("size", 0)
+            else:
+                result["raw_bytes"] += disk_bytes - len(json.dumps(header, ensure_ascii=False).encode("utf-8")) - 1
+        return result
+
+    def compact(self, train=True, progress=None):
+        """
+        用当前字典重新压缩全部条目（未压缩的旧条目、用旧字典压缩的条目），返回重写的条数。
+        train 为 True 且还没有字典时，先用已有条目训练字典。progress 可选，参数为 (已处理, 总数)
+        """
+        compressor = self.compressor
+        paths = list(self._paths())
+        if train and compressor.dict_id is None and compressor.codec != "none":
+            samples = []
+            for path in paths:
+                entry = self._read(path)
+                if entry is not None and len(entry[1]) >= MIN_SIZE:
+                    samples.append(entry[1])
+                if len(samples) >= TRAIN_SAMPLES:
+                    break
+            if samples:
+                compressor.train(samples)
+        rewritten = 0
+        for done, path in enumerate(paths):
+            if progress is not None:
+                progress(done, len(paths))
+            entry = self._read(path)
+            if entry is None:
+                continue
+            header, value = entry
+            if header.get("codec") == compressor.codec and header.get("dict") == compressor.dict_id:
+                continue
+            if not header.get("codec") and len(value) < MIN_SIZE:
+                continue  # 太小，不压缩
+            self._write(path, {"key": header.get("key"), "time": header.get("time", 0)}, value)
+            rewritten += 1
+        return rewritten
+
+    @staticmethod
+    def _read_header(path):
+        try:
+            with open(path, "rb") as f:
+                return json.loads(f.readline().decode("utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _read(self, path):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        header, sep, value = data.partition(b"\n")
+        if not sep:
+            return None
+        try:
+            header = json.loads(header.decode("utf-8"))
+            return header, self.compressor.decompress(header, value)
+        except ValueError:
+            return None
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """返回全局共享的磁盘缓存"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DiskCache()
+        return _cache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m dblp_searcher.dblp_cache",
+                                     description="查看磁盘缓存占用，或用训练出的字典重新压缩已有条目")
+    parser.add_argument("command", choices=("stats", "compact"),
+                        help="stats: 条数与压缩前后的大小; compact: 训练字典（若还没有）并重新压缩全部条目")
+    parser.add_argument("--dir", default=CACHE_DIR, help=f"缓存目录（默认 {CACHE_DIR}）")
+    args = parser.parse_args(argv)
+
+    cache = DiskCache(args.dir)
+    if args.command == "compact":
+        print(f"重新压缩 {cache.compact()} 条（编码 {cache.compressor.codec}，字典 {cache.compressor.dict_id}）")
+    stats = cache.stats()
+    ratio = stats["disk_bytes"] / stats["raw_bytes"] if stats["raw_bytes"] else 1.0
+    print(f"{stats['entries']} 条（压缩 {stats['compressed']} 条）："
+          f"原始 {stats['raw_bytes'] / 2 ** 20:.1f} MB，磁盘 {stats['disk_bytes'] / 2 ** 20:.1f} MB（{ratio:.1%}）")
+
+
+if __name__ == "__main__":
+    main()
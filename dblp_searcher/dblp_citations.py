@@ -0,0 +1,132 @@
+"""
+引用数补充：按 DOI 向 Semantic Scholar（与 dblp_spider.get_abstract_by_doi 相同的服务）批量查询
+引用数（citationCount）和高影响引用数（influentialCitationCount）。
+
+- 每次 POST /graph/v1/paper/batch 查询最多 BATCH_SIZE 个 DOI，5000 篇论文的会议只需 10 次请求；
+- 所有请求经过同一个令牌桶（每秒 RATE 个），遇到 429 / 5xx 按 Retry-After（没有时指数退避）
+  暂停整个令牌桶后重试，并发的多个补充任务也不会超出限额；
+- 结果（包括查不到的 DOI）写入磁盘缓存，有效期 CACHE_TTL，缓存中已有的 DOI 不再请求。
+
+环境变量：S2_API_KEY 随请求发送（x-api-key），有 key 时可用 S2_RATE 调高每秒请求数。
+"""
+import json
+import os
+import threading
+import time
+
+from dblp_searcher.dblp_cache import get_cache
+from dblp_searcher.dblp_http import http_post
+
+# 与 dblp_spider 相同，可用环境变量 S2_API_URL 改为本地替身服务
+S2_API_URL = os.environ.get("S2_API_URL", "https://api.semanticscholar.org").rstrip("/")
+S2_API_KEY = os.environ.get("S2_API_KEY", "")
+BATCH_SIZE = 500          # 批量接口单次最多的论文数
+RATE = float(os.environ.get("S2_RATE") or 1.0)  # 每秒请求数（匿名请求的建议上限）
+CACHE_TTL = 7 * 24 * 3600  # 引用数变化较慢，缓存一周
+MAX_RETRIES = 5
+BACKOFF = 2.0             # 没有 Retry-After 时第一次重试前等待的秒数，之后逐次加倍
+FIELDS = "citationCount,influentialCitationCount"
+
+
+class RateLimiter:
+    """令牌桶限速（线程安全）：平均每秒 rate 个请求，最多积攒 burst 个"""
+
+    def __init__(self, rate=RATE, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, cancel_token=None):
+        """取得一个令牌，等待期间每 0.2 秒检查一次取消"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(min(wait, 0.2))
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+
+    def pause(self, seconds):
+        """服务端要求限速（429）时，让之后的请求至少再等 seconds 秒"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+
+_limiter = RateLimiter()
+
+
+def normalize_doi(doi):
+    """DOI 不区分大小写；缺失（N/A、空）时返回 None"""
+    if not doi or doi == "N/A":
+        return None
+    return doi.strip().lower()
+
+
+def _cache_key(doi):
+    return f"s2:citations:{doi}"
+
+
+def _retry_after(response, attempt):
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return BACKOFF * 2 ** attempt
+
+
+def _request_batch(dois, cancel_token=None):
+    """查询一批 DOI，返回与 dois 等长的列表，查不到的位置为 None"""
+    url = f"{S2_API_URL}/graph/v1/paper/batch?fields={FIELDS}"
+    headers = {"x-api-key": S2_API_KEY} if S2_API_KEY else None
+    for attempt in range(MAX_RETRIES + 1):
+        _limiter.acquire(cancel_token)
+        response = http_post(url, {"ids": [f"DOI:{doi}" for doi in dois]}, headers=headers,
+                             cancel_token=cancel_token)
+        if response.status_code == 429 or response.status_code >= 500:
+            if attempt < MAX_RETRIES:
+                _limiter.pause(_retry_after(response, attempt))
+                continue
+        response.raise_for_status()
+        data = response.json()
+        if not isinstance(data, list) or len(data) != len(dois):
+            raise ValueError("Semantic Scholar 批量接口返回的条数与请求不一致")
+        return data
+
+
+def fetch_citations(dois, cancel_token=None, cache_ttl=CACHE_TTL):
+    """
+    查询论文的引用数，逐批返回 {DOI（小写）: {"citations": 引用数, "influential": 高影响引用数}}，
+    Semantic Scholar 中没有的论文对应 None。先一次返回缓存中已有的，再逐批返回新请求的结果。
+    """
+    cache = get_cache()
+    cached = {}
+    missing = []
+    for doi in dict.fromkeys(filter(None, map(normalize_doi, dois))):
+        value = cache.get(_cache_key(doi), ttl=cache_ttl)
+        if value is None:
+            missing.append(doi)
+        else:
+            cached[doi] = json.loads(value)
+    if cached:
+        yield cached
+
+    for start in range(0, len(missing), BATCH_SIZE):
+        batch = missing[start:start + BATCH_SIZE]
+        result = {}
+        for doi, item in zip(batch, _request_batch(batch, cancel_token)):
+            value = None
+            if item is not None:
+                value = {"citations": item.get("citationCount"), "influential": item.get("influentialCitationCount")}
+            cache.set(_cache_key(doi), json.dumps(value).encode("utf-8"))
+            result[doi] = value
+        yield result
@@ -0,0 +1,249 @@
+"""
+命令行批量查询（不依赖 Qt），用法见 python -m dblp_searcher --help。
+
+    python -m dblp_searcher publications "graph neural network" -n 200
+    python -m dblp_searcher authors -f names.txt -j 8 -o authors.jsonl
+    python -m dblp_searcher profile -f names.txt -o papers.jsonl   # 适合 cron 定时抓取
+    python -m dblp_searcher combine 'profile:"Wei Wang" & publications:"graph neural network"'
+
+查询可以写在命令行上，也可以用 -f 从文件（"-" 表示标准输入）读取，每行一个，
+空行和以 # 开头的行忽略。多个查询在线程池中并发执行，共用 dblp_http 的连接池和磁盘缓存；
+设置了环境变量 DBLP_SERVER 时改为请求共享查询服务（dblp_server）。
+
+输出为 JSON Lines，每个结果一行，结果一批批到达时立即写出：
+    {"command": ..., "query": ..., "result": {...}}
+查询失败时输出 {"command": ..., "query": ..., "error": "..."} 并继续处理其余查询。
+进度和错误信息写到标准错误。有查询失败时退出码为 1，被 Ctrl+C 中断时为 130。
+"""
+import argparse
+import contextlib
+import json
+import queue
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dblp_searcher import dblp_profiler
+from dblp_searcher.dblp_algebra import evaluate, parse_expression
+from dblp_searcher.dblp_http import CancelToken, TaskCancelled
+from dblp_searcher.dblp_json2dic import parse_authors, parse_venues, parse_publications
+from dblp_searcher.dblp_remote import backend
+
+DEFAULT_JOBS = 4
+DEFAULT_MAX_RESULTS = 1000
+
+
+def _checked(data):
+    """dblp_api 请求失败时只打印错误并返回空 dict，这里把它当作查询失败"""
+    if not data:
+        raise RuntimeError("请求失败（详见标准错误中的提示）")
+    return data
+
+
+def _publications(query, args, cancel_token):
+    pages = 0
+    for data in backend("dblp_api").iter_publications(query, args.max_results, cancel_token=cancel_token):
+        pages += 1
+        yield parse_publications(data)
+    if not pages:
+        _checked(None)
+
+
+def _authors(query, args, cancel_token):
+    yield parse_authors(_checked(backend("dblp_api").search_author(query, args.max_results, cancel_token=cancel_token)))
+
+
+def _venues(query, args, cancel_token):
+    yield parse_venues(_checked(backend("dblp_api").search_venue(query, args.max_results, cancel_token=cancel_token)))
+
+
+def _volumes(query, args, cancel_token):
+    """会议（/conf/）返回各届链接，期刊返回各卷链接"""
+    spider = backend("dblp_spider")
+    if "/conf/" in query:
+        links = spider.get_dblp_search_conference_links(query, cancel_token=cancel_token)
+    else:
+        links = spider.get_journal_volumes(query, cancel_token=cancel_token)
+    yield [{"name": name, "url": url} for name, url in links]
+
+
+def _profile(query, args, cancel_token):
+    """
+    作者/期卷页面的全部论文。
+    query 不是链接时按作者名搜索，取第一个匹配作者的主页。
+    """
+    spider = backend("dblp_spider")
+    url = query
+    if not query.startswith(("http://", "https://")):
+        authors = parse_authors(_checked(backend("dblp_api").search_author(query, 1, cancel_token=cancel_token)))
+        if not authors:
+            raise LookupError(f"未找到作者：{query}")
+        url = authors[0]["url"]
+    for raw_papers in spider.iter_dblp_profile(url, cancel_token=cancel_token):
+        yield spider.parse_dblp_entries(raw_papers)
+
+
+def _combine(query, args, cancel_token):
+    """
+    按 dblp key 对多个查询的结果求交（&）、并（|）、差（-），语法见 dblp_algebra，例如
+    profile:"Wei Wang" & publications:"graph" - profile:https://dblp.org/db/conf/cvpr/cvpr2023.html
+    各子查询并发执行，确定属于结果的论文随子查询结果的到达逐批输出。
+    """
+    tree = parse_expression(query, COMBINE_SOURCES)
+    sources = {kind: lambda text, token, function=function: function(text, args, token)
+               for kind, function in COMBINE_SOURCES.items()}
+    yield from evaluate(tree, sources, args.jobs, cancel_token)
+
+
+# combine 表达式中可用的子查询类型
+COMBINE_SOURCES = {
+    "publications": _publications,
+    "profile": _profile,
+}
+
+COMMANDS = {
+    "publications": (_publications, "按关键词搜索文献"),
+    "authors": (_authors, "按姓名搜索作者"),
+    "venues": (_venues, "按名称搜索期刊/会议"),
+    "volumes": (_volumes, "列出期刊/会议主页中的各卷/各届链接"),
+    "profile": (_profile, "爬取作者主页或期卷页面中的全部论文（可直接给作者名）"),
+    "combine": (_combine, "对 publications/profile 查询的结果求交(&)、并(|)、差(-)，"
+                          "如 'profile:\"Wei Wang\" & publications:graph'"),
+}
+
+
+def read_queries(args):
+    """合并命令行和 -f 文件中的查询，去掉空行、注释和重复项（保持顺序）"""
+    queries = list(args.queries)
+    for path in args.file or ():
+        if path == "-":
+            queries.extend(sys.stdin)
+        else:
+            with open(path, encoding="utf-8") as f:
+                queries.extend(f)
+    seen = set()
+    result = []
+    for query in queries:
+        query = query.strip()
+        if query and not query.startswith("#") and query not in seen:
+            seen.add(query)
+            result.append(query)
+    return result
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m dblp_searcher",
+        description="DBLP 命令行批量查询，结果以 JSON Lines 输出")
+    parser.add_argument("command", choices=COMMANDS,
+                        help="; ".join(f"{name}: {text}" for name, (_, text) in COMMANDS.items()))
+    parser.add_argument("queries", nargs="*", help="查询关键词 / 作者名 / 页面链接")
+    parser.add_argument("-f", "--file", action="append",
+                        help="从文件读取查询，每行一个；- 表示标准输入；可重复指定")
+    parser.add_argument("-o", "--output", help="输出文件（默认标准输出）")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"并发查询数（默认 {DEFAULT_JOBS}）")
+    parser.add_argument("-n", "--max-results", type=int, default=DEFAULT_MAX_RESULTS,
+                        help=f"publications/authors/venues 每个查询的最大结果数（默认 {DEFAULT_MAX_RESULTS}）")
+    parser.add_argument("--cache-ttl", type=int,
+                        help="搜索接口缓存的有效期（秒），0 表示不使用缓存中的旧结果")
+    parser.add_argument("-q", "--quiet", action="store_true", help="不输出进度")
+    return parser
+
+
+class BatchRunner:
+    """
+    在线程池中并发执行查询。工作线程把每批结果放入队列，
+    主线程从队列中取出并写出，因此输出只在一个线程中进行，行与行不会交错。
+    """
+
+    def __init__(self, command, args, output, log):
+        self.function = COMMANDS[command][0]
+        self.command = command
+        self.args = args
+        self.output = output
+        self.log = log
+        self.cancel_token = CancelToken()
+        self._queue = queue.Queue()
+        self.failed = 0
+
+    def _run(self, query):
+        count = 0
+        try:
+            with dblp_profiler.profiled(f"{self.command}_{query}"):  # 设置了 DBLP_PROFILE 时分析每个查询
+                for batch in self.function(query, self.args, self.cancel_token):
+                    count += len(batch)
+                    self._queue.put(("batch", query, batch))
+        except TaskCancelled:
+            self._queue.put(("cancelled", query, None))
+        except Exception as e:
+            self._queue.put(("error", query, f"{type(e).__name__}: {e}"))
+        else:
+            self._queue.put(("done", query, count))
+
+    def _write(self, line):
+        self.output.write(json.dumps(line, ensure_ascii=False))
+        self.output.write("\n")
+
+    def run(self, queries):
+        total = len(queries)
+        finished = 0
+        start = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=max(1, self.args.jobs), thread_name_prefix="dblp-cli")
+        try:
+            for query in queries:
+                executor.submit(self._run, query)
+            while finished < total:
+                try:
+                    kind, query, payload = self._queue.get(timeout=0.5)  # 超时以便响应 Ctrl+C
+                except queue.Empty:
+                    continue
+                if kind == "batch":
+                    for item in payload:
+                        self._write({"command": self.command, "query": query, "result": item})
+                    continue
+                finished += 1
+                if kind == "error":
+                    self.failed += 1
+                    self._write({"command": self.command, "query": query, "error": payload})
+                    self.log(f"[{finished}/{total}] {query}: 失败 {payload}")
+                elif kind == "done":
+                    self.log(f"[{finished}/{total}] {query}: {payload} 条")
+                self.output.flush()
+        except KeyboardInterrupt:
+            # 正在进行的请求在下一次读取响应时中止，排队的查询在发请求前即退出
+            self.cancel_token.cancel()
+            executor.shutdown(wait=True)
+            raise
+        executor.shutdown(wait=True)
+        self.log(f"完成 {total} 个查询，失败 {self.failed} 个，用时 {time.perf_counter() - start:.1f} 秒")
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    queries = read_queries(args)
+    if not queries:
+        build_parser().error("没有查询：请在命令行给出查询或用 -f 指定查询文件")
+    if args.cache_ttl is not None:
+        import dblp_searcher.dblp_api as dblp_api
+        dblp_api.CACHE_TTL = args.cache_ttl
+
+    quiet = args.quiet
+
+    def log(message):
+        if not quiet:
+            print(message, file=sys.stderr, flush=True)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    runner = BatchRunner(args.command, args, output, log)
+    try:
+        # 搜索模块出错时用 print 输出提示，重定向到标准错误，避免混进 JSON Lines
+        with contextlib.redirect_stdout(sys.stderr):
+            runner.run(queries)
+    except KeyboardInterrupt:
+        log("已中断")
+        return 130
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 1 if runner.failed else 0
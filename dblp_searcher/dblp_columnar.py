@@ -0,0 +1,267 @@
+"""
+简单的列式二进制文件格式，可直接内存映射读取。
+
+文件布局（整数均为小端序）：
+    8 字节   魔数 b"DBLPCOL1"
+    8 字节   头部长度 H
+    H 字节   头部 JSON：{"meta": 任意 JSON, "tables": {表名: {"rows": n, "columns": [列描述]}}}
+    数据区   每列两段，均按 8 字节对齐：
+             offsets：n+1 个 uint64，第 i 个值在 data 中的范围是 [offsets[i], offsets[i+1])
+             data：   所有值的编码首尾相接
+列描述为 {"name", "type", "offsets", "data", "size"}，type 为：
+    "str"   字符串（UTF-8）
+    "list"  字符串列表，元素之间用 \\x1f 分隔
+    "ids"   整数列表（uint32 数组，如倒排表、指向另一张表的行号）
+    "u32"   单个整数（uint32）；定长，没有 offsets 段（为 null），data 为 n 个 uint32
+
+读取时只解析头部，单元格在被访问时才从映射区解码。
+"""
+import json
+import mmap
+import shutil
+import sys
+import tempfile
+from array import array
+
+MAGIC = b"DBLPCOL1"
+LIST_SEPARATOR = "\x1f"
+_ALIGN = 8
+
+
+class ColumnarFormatError(Exception):
+    """文件不是有效的列式文件"""
+
+
+def _uint_array(typecode, values=()):
+    values = array(typecode, values)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _encode(value, kind):
+    if kind == "list":
+        return LIST_SEPARATOR.join(value).encode("utf-8")
+    if kind == "ids":
+        return _uint_array("I", value).tobytes()
+    return ("" if value is None else str(value)).encode("utf-8")
+
+
+def write_columnar(path, tables, meta=None):
+    """
+    写入列式文件。
+
+    参数：
+        path: 输出路径
+        tables: dict，表名 -> (列定义, 行)；列定义为 [(列名, "str"/"list"/"ids"/"u32")]。
+                行是与列定义顺序一致的元组的序列；也可以是函数 rows(i)，返回第 i 列各行的值（按行序），
+                用于逐列从数据库等处读取、不必把整张表放进内存
+        meta: 可选，随文件保存的任意 JSON 数据
+
+    数据区先逐列写入临时文件，内存中只保留当前列的偏移数组。
+    """
+    header_tables = {}
+    with tempfile.TemporaryFile() as data_file:
+        def add_blob(blob):
+            start = data_file.tell()
+            data_file.write(blob)
+            padding = -data_file.tell() % _ALIGN
+            if padding:
+                data_file.write(b"\0" * padding)
+            return start
+
+        for name, (columns, rows) in tables.items():
+            if callable(rows):
+                column_values = rows
+            else:
+                rows = rows if isinstance(rows, list) else list(rows)
+                column_values = lambda i, rows=rows: (row[i] for row in rows)  # noqa: E731
+            row_count = None
+            column_specs = []
+            for i, (column, kind) in enumerate(columns):
+                data_start = data_file.tell()
+                if kind == "u32":
+                    values = _uint_array("I", column_values(i))
+                    data_file.write(values.tobytes())
+                    count, offsets_start = len(values), None
+                else:
+                    offsets = array("Q", [0])
+                    position = 0
+                    for value in column_values(i):
+                        encoded = _encode(value, kind)
+                        data_file.write(encoded)
+                        position += len(encoded)
+                        offsets.append(position)
+                    count = len(offsets) - 1
+                size = data_file.tell() - data_start
+                add_blob(b"")  # 对齐
+                if kind != "u32":
+                    if sys.byteorder == "big":
+                        offsets.byteswap()
+                    offsets_start = add_blob(offsets.tobytes())
+                if row_count is not None and count != row_count:
+                    raise ValueError(f"表 {name} 的列 {column} 有 {count} 行，其他列为 {row_count} 行")
+                row_count = count
+                column_specs.append({"name": column, "type": kind, "offsets": offsets_start,
+                                     "data": data_start, "size": size})
+            header_tables[name] = {"rows": row_count or 0, "columns": column_specs}
+
+        header = json.dumps({"meta": meta, "tables": header_tables}, ensure_ascii=False).encode("utf-8")
+        header += b" " * (-(len(MAGIC) + 8 + len(header)) % _ALIGN)
+
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(header).to_bytes(8, "little"))
+            f.write(header)
+            data_file.seek(0)
+            shutil.copyfileobj(data_file, f, 1 << 20)
+
+
+def _uint_view(view, typecode):
+    """把小端序的字节视图转换为整数视图（大端机器上复制并交换字节序）"""
+    if sys.byteorder == "big":
+        swapped = array(typecode, view.tobytes())
+        swapped.byteswap()
+        return memoryview(swapped)
+    return view.cast(typecode)
+
+
+class ColumnarColumn:
+    """
+    映射区中的一列，按下标解码单个值。
+    "ids" 列的值为 array（复制）；view() 直接返回映射区上的视图，适合只访问其中少数元素的倒排表。
+    """
+
+    def __init__(self, buffer, rows, spec):
+        self.name = spec["name"]
+        self.type = spec["type"]
+        self._rows = rows
+        self._data = buffer[spec["data"]:spec["data"] + spec["size"]]
+        if self.type == "u32":
+            self._offsets = None
+            self._values = _uint_view(self._data, "I")
+        else:
+            self._offsets = _uint_view(buffer[spec["offsets"]:spec["offsets"] + (rows + 1) * 8], "Q")
+            self._values = None
+
+    def __len__(self):
+        return self._rows
+
+    def __getitem__(self, row):
+        if self._values is not None:
+            return self._values[row]
+        data = self._data[self._offsets[row]:self._offsets[row + 1]]
+        if self.type == "ids":
+            values = array("I")
+            values.frombytes(data)
+            if sys.byteorder == "big":
+                values.byteswap()
+            return values
+        text = str(data, "utf-8")
+        if self.type == "list":
+            return tuple(text.split(LIST_SEPARATOR)) if text else ()
+        return text
+
+    def view(self, row):
+        """"ids" 列第 row 行的 uint32 视图（不复制；用完后应 release()，否则文件无法关闭）"""
+        return _uint_view(self._data[self._offsets[row]:self._offsets[row + 1]], "I")
+
+    def release(self):
+        if self._offsets is not None:
+            self._offsets.release()
+        if self._values is not None:
+            self._values.release()
+        self._data.release()
+
+
+class ColumnarTable:
+    """映射区中的一张表；table[i] 返回第 i 行各列组成的元组"""
+
+    def __init__(self, buffer, spec):
+        self._buffer = buffer
+        self.rows = spec["rows"]
+        self.columns = [ColumnarColumn(buffer, self.rows, column) for column in spec["columns"]]
+        self.names = [column.name for column in self.columns]
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self.rows
+        if not 0 <= row < self.rows:
+            raise IndexError(row)
+        return tuple(column[row] for column in self.columns)
+
+    def column(self, name):
+        return self.columns[self.names.index(name)]
+
+    def release(self):
+        for column in self.columns:
+            column.release()
+        self._buffer.release()
+
+
+class ColumnarFile:
+    """
+    以只读内存映射方式打开的列式文件。
+    表中的数据引用映射区，close() 之后不能再访问。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 空文件
+            self._file.close()
+            raise ColumnarFormatError(f"{path} 不是有效的列式文件")
+        self._buffer = memoryview(self._mmap)
+        self._tables = {}
+        try:
+            header = self._read_header()
+        except (ValueError, KeyError) as e:
+            self.close()
+            raise ColumnarFormatError(f"{path} 不是有效的列式文件：{e}")
+        self.meta = header.get("meta")
+        self._table_specs = header["tables"]
+
+    def _read_header(self):
+        if bytes(self._buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError("魔数不匹配")
+        header_start = len(MAGIC) + 8
+        header_size = int.from_bytes(self._buffer[len(MAGIC):header_start], "little")
+        header = json.loads(str(self._buffer[header_start:header_start + header_size], "utf-8"))
+        self._data_start = header_start + header_size
+        for spec in header["tables"].values():
+            for column in spec["columns"]:
+                end = column["data"] + column["size"]
+                if column["offsets"] is not None:
+                    end = max(end, column["offsets"] + (spec["rows"] + 1) * 8)
+                if self._data_start + end > len(self._buffer):
+                    raise ValueError("数据区不完整")
+        return header
+
+    def table_names(self):
+        return list(self._table_specs)
+
+    def table(self, name):
+        """返回表（首次访问时创建列视图，不读取数据）"""
+        table = self._tables.get(name)
+        if table is None:
+            table = ColumnarTable(self._buffer[self._data_start:], self._table_specs[name])
+            self._tables[name] = table
+        return table
+
+    def close(self):
+        """释放所有视图并关闭映射（Windows 上关闭后才能替换该文件）"""
+        for table in self._tables.values():
+            table.release()
+        self._tables = {}
+        if self._buffer is not None:
+            self._buffer.release()
+            self._buffer = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
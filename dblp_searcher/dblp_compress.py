@@ -0,0 +1,208 @@
+"""
+磁盘缓存（以及本地记录库）的压缩存储。
+
+dblp 的 HTML/XML 页面高度重复（相同的标签、class、链接前缀），用从已缓存页面训练出的字典压缩，
+小页面也能得到接近大文件的压缩率：
+- 安装了可选依赖 zstandard 时使用 zstd，字典由 zstandard.train_dictionary 训练；
+- 否则使用标准库 zlib，字典取样本中出现在最多页面里的标签与 JSON 键值片段（zlib 预设字典，最多 32 KB）。
+
+字典按内容的哈希编号，保存在 directory 下（<编号>.<编码>），压缩数据记录编码和字典编号，
+读取时按编号找到对应字典解压，重新训练字典后旧数据仍然可读。
+还没有字典时先不用字典压缩，同时收集样本，攒够 TRAIN_SAMPLES 个后自动训练。
+
+环境变量 DBLP_CACHE_CODEC 可指定编码：zstd / zlib / none（不压缩）。
+"""
+import hashlib
+import os
+import re
+import threading
+import zlib
+from collections import Counter
+
+MIN_SIZE = 512             # 小于此大小的值不压缩（压缩头和字典查找的开销不划算）
+TRAIN_SAMPLES = 64         # 自动训练字典所需的样本数
+SAMPLE_BYTES = 128 * 1024  # 每个样本最多取的字节数
+ZSTD_DICT_SIZE = 112 * 1024
+ZLIB_DICT_SIZE = 32 * 1024  # zlib 窗口大小，更长的预设字典没有意义
+ZSTD_LEVEL = 6
+ZLIB_LEVEL = 6
+CODECS = ("zstd", "zlib", "none")
+
+_FRAGMENT_RE = re.compile(rb"[<{,][^<{,]*")  # HTML 标签及其后的文本、JSON 对象的键值片段
+
+
+def _zstd():
+    """可选依赖 zstandard，未安装时返回 None"""
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def default_codec():
+    codec = os.environ.get("DBLP_CACHE_CODEC", "").lower()
+    if codec in CODECS and (codec != "zstd" or _zstd() is not None):
+        return codec
+    return "zstd" if _zstd() is not None else "zlib"
+
+
+def zlib_dictionary(samples, size=ZLIB_DICT_SIZE):
+    """
+    zlib 预设字典：按“出现在多少个样本中 × 长度”挑选标签/键值片段直到 size 字节，
+    最常见的片段放在末尾（距离被压缩数据最近，引用的编码最短）
+    """
+    counts = Counter()
+    for sample in samples:
+        counts.update(set(_FRAGMENT_RE.findall(sample)))
+    fragments = []
+    total = 0
+    for fragment, count in sorted(counts.items(), key=lambda item: item[1] * len(item[0]), reverse=True):
+        if count < 2 or total + len(fragment) > size:
+            continue
+        fragments.append(fragment)
+        total += len(fragment)
+    return b"".join(reversed(fragments))
+
+
+def train_dictionary(samples, codec):
+    """用样本训练 codec 的字典，返回字典内容（bytes）"""
+    samples = [sample[:SAMPLE_BYTES] for sample in samples if sample]
+    if codec == "zstd":
+        return _zstd().train_dictionary(ZSTD_DICT_SIZE, samples).as_bytes()
+    return zlib_dictionary(samples)
+
+
+class Compressor:
+    """
+    带字典的压缩/解压（线程安全）。
+    compress() 返回 (元信息, 数据)，元信息为空 dict 表示未压缩，否则含 "codec" 和可选的 "dict"；
+    decompress() 按同样的元信息还原。
+    """
+
+    def __init__(self, directory, codec=None, auto_train=True):
+        self.directory = directory
+        self.codec = codec or default_codec()
+        self.auto_train = auto_train and self.codec != "none"
+        self.dict_id = None       # 当前用于压缩的字典
+        self._dicts = {}          # 字典编号 -> 内容
+        self._samples = []
+        self._lock = threading.Lock()
+        self._local = threading.local()  # 每个线程各自的 zstd 压缩/解压对象（不能跨线程共用）
+        self._load_latest()
+
+    # ---- 字典 ----
+
+    def _dict_path(self, dict_id, codec):
+        return os.path.join(self.directory, f"{dict_id}.{codec}")
+
+    def _load_latest(self):
+        """使用目录中最新的本编码字典"""
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith("." + self.codec)]
+        except OSError:
+            return
+        if names:
+            latest = max(names, key=lambda name: os.path.getmtime(os.path.join(self.directory, name)))
+            self.dict_id = latest.rsplit(".", 1)[0]
+
+    def _dictionary(self, dict_id, codec):
+        data = self._dicts.get(dict_id)
+        if data is None:
+            with open(self._dict_path(dict_id, codec), "rb") as f:
+                data = self._dicts[dict_id] = f.read()
+        return data
+
+    def set_dictionary(self, data):
+        """保存字典并用于之后的压缩，返回字典编号"""
+        dict_id = hashlib.sha1(data).hexdigest()[:12]
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._dict_path(dict_id, self.codec)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        with self._lock:
+            self._dicts[dict_id] = data
+            self.dict_id = dict_id
+            self._samples = []
+        return dict_id
+
+    def train(self, samples):
+        """用样本训练新字典并启用，返回字典编号"""
+        return self.set_dictionary(train_dictionary(samples, self.codec))
+
+    def _collect(self, value):
+        """还没有字典时收集样本，攒够后训练（在写入缓存的线程中进行，约一秒）"""
+        with self._lock:
+            if self.dict_id is not None or len(self._samples) >= TRAIN_SAMPLES:
+                return
+            self._samples.append(value[:SAMPLE_BYTES])
+            if len(self._samples) < TRAIN_SAMPLES:
+                return
+            samples = self._samples
+        try:
+            self.train(samples)
+        except Exception:
+            with self._lock:
+                self._samples = []  # 样本不合适（如训练失败），重新收集
+
+    # ---- 压缩与解压 ----
+
+    def _zstd_object(self, kind, dict_id, codec="zstd"):
+        cache = self._local.__dict__.setdefault(kind, {})
+        obj = cache.get(dict_id)
+        if obj is None:
+            zstandard = _zstd()
+            dict_data = None
+            if dict_id is not None:
+                dict_data = zstandard.ZstdCompressionDict(self._dictionary(dict_id, codec))
+            if kind == "compressor":
+                obj = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dict_data)
+            else:
+                obj = zstandard.ZstdDecompressor(dict_data=dict_data)
+            cache[dict_id] = obj
+        return obj
+
+    def compress(self, value):
+        if self.codec == "none" or len(value) < MIN_SIZE:
+            return {}, value
+        if self.auto_train and self.dict_id is None:
+            self._collect(value)
+        dict_id = self.dict_id
+        if self.codec == "zstd":
+            data = self._zstd_object("compressor", dict_id).compress(value)
+        elif dict_id is not None:
+            compressor = zlib.compressobj(ZLIB_LEVEL, zdict=self._dictionary(dict_id, "zlib"))
+            data = compressor.compress(value) + compressor.flush()
+        else:
+            data = zlib.compress(value, ZLIB_LEVEL)
+        if len(data) >= len(value):
+            return {}, value
+        meta = {"codec": self.codec, "size": len(value)}
+        if dict_id is not None:
+            meta["dict"] = dict_id
+        return meta, data
+
+    def decompress(self, meta, data):
+        """按 compress() 返回的元信息解压；字典文件缺失或数据损坏时抛出 ValueError"""
+        codec = meta.get("codec")
+        if not codec:
+            return data
+        dict_id = meta.get("dict")
+        try:
+            if codec == "zstd":
+                zstandard = _zstd()
+                if zstandard is None:
+                    raise ValueError("数据以 zstd 压缩，需要安装 zstandard")
+                return self._zstd_object("decompressor", dict_id).decompress(data)
+            if codec == "zlib":
+                if dict_id is None:
+                    return zlib.decompress(data)
+                decompressor = zlib.decompressobj(zdict=self._dictionary(dict_id, "zlib"))
+                return decompressor.decompress(data) + decompressor.flush()
+        except ValueError:
+            raise
+        except Exception as e:  # zlib.error、zstandard.ZstdError、字典文件缺失（OSError）
+            raise ValueError(f"解压失败：{e}") from e
+        raise ValueError(f"未知的压缩编码：{codec}")
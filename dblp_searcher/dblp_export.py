@@ -0,0 +1,149 @@
+"""
+论文结果导出：CSV、JSON Lines、Parquet。
+
+所有格式都按 RECORD_FIELDS 导出完整字段（含已获取的引用数，CSV/Parquet 中未获取时为空，JSONL 中不写出），逐条（CSV/JSONL）或按批（Parquet）写出，
+内存占用与结果数量无关。先写入临时文件，完成后再改名，取消或出错时删除临时文件。
+Parquet 需要可选依赖 pyarrow。
+"""
+import csv
+import json
+import os
+
+from dblp_searcher.dblp_records import RECORD_FIELDS, paper_to_record, record_to_paper, iter_records
+
+EXPORT_FORMATS = {
+    "csv": "CSV 文件 (*.csv)",
+    "jsonl": "JSON Lines 文件 (*.jsonl)",
+    "parquet": "Parquet 文件 (*.parquet)",
+}
+AUTHOR_SEPARATOR = "; "  # CSV 中作者之间的分隔符
+BATCH_SIZE = 10000       # 每批的行数：Parquet 行组大小，也是进度汇报和取消检查的间隔
+
+_AUTHORS = RECORD_FIELDS.index("authors")
+
+
+class ExportError(Exception):
+    """导出失败（格式不支持、缺少依赖等）"""
+
+
+def format_for_path(path):
+    """按扩展名推断导出格式，无法识别时返回 None"""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension == "json":
+        extension = "jsonl"
+    return extension if extension in EXPORT_FORMATS else None
+
+
+def _select_records(papers, rows):
+    """rows 为 None 时按顺序导出全部论文，否则只导出 rows 中的行（按 rows 的顺序）"""
+    if rows is None:
+        return iter_records(papers)
+    return (paper_to_record(papers[row]) for row in rows)
+
+
+def _write_csv(f, records):
+    writer = csv.writer(f)
+    writer.writerow(RECORD_FIELDS)
+    for record in records:
+        row = list(record)
+        row[_AUTHORS] = AUTHOR_SEPARATOR.join(record[_AUTHORS])
+        writer.writerow(row)
+        yield
+
+
+def _write_jsonl(f, records):
+    for record in records:
+        # 引用数为 JSON 整数，未获取的补充字段不写出
+        f.write(json.dumps(record_to_paper(record), ensure_ascii=False))
+        f.write("\n")
+        yield
+
+
+def _write_parquet(path, records, batch_size):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportError("导出 Parquet 需要安装 pyarrow（pip install pyarrow）")
+
+    schema = pa.schema([(field, pa.list_(pa.string()) if field == "authors" else pa.string())
+                        for field in RECORD_FIELDS])
+    columns = [[] for _ in RECORD_FIELDS]
+
+    def flush(writer):
+        arrays = [pa.array(values, type=schema.field(i).type) for i, values in enumerate(columns)]
+        writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        for values in columns:
+            values.clear()
+
+    with pq.ParquetWriter(path, schema) as writer:
+        for record in records:
+            for values, value in zip(columns, record):
+                values.append(value)
+            if len(columns[0]) >= batch_size:
+                flush(writer)
+            yield
+        if columns[0]:
+            flush(writer)
+
+
+def export_papers(papers, path, fmt=None, rows=None, progress=None, cancel_token=None,
+                  batch_size=BATCH_SIZE):
+    """
+    导出论文，返回导出的条数。
+
+    参数：
+        papers: 论文序列（list 或 LazyPaperList）
+        path: 输出文件路径
+        fmt: "csv" / "jsonl" / "parquet"，为 None 时按扩展名推断
+        rows: 可选，只导出这些下标的论文（例如过滤、排序后的显示顺序）
+        progress: 可选，progress(已导出条数, 总条数)，每 batch_size 条调用一次
+        cancel_token: 可选，取消时抛出 TaskCancelled 并删除未完成的文件
+    """
+    fmt = fmt or format_for_path(path)
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"不支持的导出格式：{fmt or path}")
+
+    total = len(papers) if rows is None else len(rows)
+    records = _select_records(papers, rows)
+    if rows is None:
+        # 导出过程中表格可能还在追加数据，只导出开始时已有的部分
+        records = (record for _, record in zip(range(total), records))
+
+    temp_path = f"{path}.part"
+    steps = None
+    try:
+        if fmt == "parquet":
+            steps = _write_parquet(temp_path, records, batch_size)
+            count = _drive(steps, total, progress, cancel_token, batch_size)
+        else:
+            # utf-8-sig 让 Excel 正确识别中文
+            encoding = "utf-8-sig" if fmt == "csv" else "utf-8"
+            with open(temp_path, "w", encoding=encoding, newline="") as f:
+                steps = _write_csv(f, records) if fmt == "csv" else _write_jsonl(f, records)
+                count = _drive(steps, total, progress, cancel_token, batch_size)
+        os.replace(temp_path, path)
+    except BaseException:
+        if steps is not None:
+            steps.close()  # 关闭写入器持有的文件后才能删除
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+def _drive(steps, total, progress, cancel_token, batch_size):
+    """逐条推进写入；每 batch_size 条汇报进度并检查取消"""
+    count = 0
+    for _ in steps:
+        count += 1
+        if count % batch_size == 0:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            if progress is not None:
+                progress(count, total)
+    if progress is not None:
+        progress(count, total)
+    return count
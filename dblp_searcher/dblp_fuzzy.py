@@ -0,0 +1,205 @@
+"""
+容错的标题查找：用户粘贴记不全或有错字的标题、dblp 搜索没有结果时，在本地已知的论文标题中模糊查找。
+
+1. 标题规范化（小写、去重音和标点），按字符三元组（trigram）建立倒排表，每个三元组对应标题编号的有序数组；
+2. 候选：查询与标题的编辑距离不超过 k 时，二者至少共有 T = |查询三元组| - 3k 个三元组（每处编辑最多破坏 3 个）。
+   用 numpy 对查询各三元组的倒排表计数（bincount），常见三元组的长表只对候选做二分查找，
+   共有数不足 T 的标题排除；
+3. 核对：按共有数从多到少，用位并行（Myers）算法计算查询与标题中最接近的子串的编辑距离，
+   因此只记得标题的一部分也能找到；共有数给出编辑距离的下界 (|查询三元组| - 共有数) / 3，
+   下界超过“最好结果的距离 + RANK_SLACK”时提前结束。结果按（编辑距离，长度差）排序。
+
+标题来自磁盘缓存中的历史搜索结果和本次运行中加载过的论文（包括从本地快照搜索到的论文）。
+整个本地快照的标题不登记：完整 dblp 有数百万条，三元组倒排表要占用数 GB 内存。
+"""
+import json
+import re
+import threading
+import unicodedata
+from array import array
+
+from dblp_searcher.dblp_cache import get_cache
+from dblp_searcher.dblp_json2dic import parse_publications
+
+GRAM = 3
+MAX_ERROR_RATE = 0.15   # 允许的编辑距离占查询长度的比例
+MIN_QUERY_LENGTH = 8    # 规范化后短于此长度的查询不做模糊查找
+MAX_QUERY_LENGTH = 200  # 更长的部分截断（标题很少这么长，也避免候选统计过慢）
+MAX_CANDIDATES = 5000   # 按共有三元组数最多核对的候选数
+LONG_LIST_RATIO = 0.002  # 超过标题总数此比例的倒排表不参与计数，只对候选做二分查找
+MAX_SKIPPED_SHARE = 0.5  # 不参与计数的长表最多占 T 的比例（太多时短表筛出的候选过多）
+MAX_RESULTS = 20
+RANK_SLACK = 1          # 只列出编辑距离比最好结果多不超过此数的标题
+
+_NON_WORD_RE = re.compile(r"[\W_]+")
+_EMPTY = array("I")
+
+
+def normalize_title(title):
+    """小写、去掉重音符号，标点和连续空白替换为一个空格"""
+    if not title or title == "N/A":
+        return ""
+    title = title.lower()
+    if not title.isascii():
+        title = "".join(c for c in unicodedata.normalize("NFKD", title) if not unicodedata.combining(c))
+    return _NON_WORD_RE.sub(" ", title).strip()
+
+
+def _grams(text):
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+def _bit_masks(pattern):
+    masks = {}
+    for i, c in enumerate(pattern):
+        masks[c] = masks.get(c, 0) | (1 << i)
+    return masks
+
+
+def substring_distance(pattern, text, masks=None):
+    """pattern 与 text 中最接近的子串之间的编辑距离（Myers 位并行算法，每个字符十余次整数运算）"""
+    m = len(pattern)
+    if not m:
+        return 0
+    masks = masks or _bit_masks(pattern)
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    best = m
+    for c in text:
+        eq = masks.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+            if score < best:
+                best = score
+        ph = (ph << 1) & full  # 第 0 行恒为 0：匹配可以从 text 的任意位置开始
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return best
+
+
+class TitleIndex:
+    """
+    论文标题的三元组索引（可在后台线程中写入）。
+
+    每条标题约占 4 × 三元组数 字节的倒排表，百万条约三百 MB。
+    """
+
+    def __init__(self):
+        self.papers = []        # 编号 -> 论文 dict
+        self._titles = []       # 编号 -> 规范化标题
+        self._postings = {}     # 三元组 -> 标题编号数组（升序）
+        self._seen = set()      # 已登记的 dblp key / 标题，避免重复
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def __len__(self):
+        return len(self.papers)
+
+    def add(self, papers):
+        """登记一批论文（parse_publications / parse_dblp_entries 的结果）"""
+        with self._lock:
+            for paper in papers:
+                title = normalize_title(paper.get("title"))
+                if len(title) < GRAM:
+                    continue
+                key = paper.get("key")
+                seen_key = key if key and key != "N/A" else title
+                if seen_key in self._seen:
+                    continue
+                self._seen.add(seen_key)
+                number = len(self.papers)
+                self.papers.append(paper)
+                self._titles.append(title)
+                for gram in _grams(title):
+                    postings = self._postings.get(gram)
+                    if postings is None:
+                        postings = self._postings[gram] = array("I")
+                    postings.append(number)
+
+    def search(self, query, limit=MAX_RESULTS, max_distance=None):
+        """
+        返回 [(论文, 编辑距离)]，按（编辑距离，标题与查询的长度差）排序。
+        max_distance 默认为查询长度的 MAX_ERROR_RATE。
+        """
+        pattern = normalize_title(query)[:MAX_QUERY_LENGTH]
+        if len(pattern) < MIN_QUERY_LENGTH:
+            return []
+        grams = _grams(pattern)
+        k = max_distance if max_distance is not None else max(1, int(len(pattern) * MAX_ERROR_RATE))
+        k = min(k, (len(grams) - 1) // GRAM)  # 至少要求共有 1 个三元组，否则无法用倒排表筛选
+        required = len(grams) - GRAM * k
+
+        import numpy as np  # wordcloud 的依赖，用到时才导入
+
+        with self._lock:
+            # frombuffer 不复制；视图在锁内用完即释放，之后数组才能继续追加
+            lists = sorted((np.frombuffer(self._postings[gram], dtype=np.uint32)
+                            for gram in grams if gram in self._postings), key=len)
+            # 最长的几个表（常见三元组）不参与计数：共有数至少为 required 的标题在其余的短表中至少出现
+            # required - 长表数 次，先用短表筛出候选，再用二分查找补上长表中的计数
+            long_count = sum(1 for postings in lists if len(postings) > len(self.papers) * LONG_LIST_RATIO)
+            long_count = min(long_count, int(required * MAX_SKIPPED_SHARE))
+            short, long = lists[:len(lists) - long_count], lists[len(lists) - long_count:]
+            if not short:
+                return []
+            counts = np.bincount(np.concatenate(short))
+            candidates = np.flatnonzero(counts >= required - long_count).astype(np.uint32)  # 与倒排表同类型，避免转换
+            counts = counts[candidates]
+            for i, postings in enumerate(long):
+                positions = np.minimum(np.searchsorted(postings, candidates), len(postings) - 1)
+                counts += postings[positions] == candidates
+                keep = counts + (long_count - i - 1) >= required  # 剩下的长表全部命中也不够的候选提前排除
+                candidates, counts = candidates[keep], counts[keep]
+            del lists, short, long
+            # 共有数越多，编辑距离的下界 (|查询三元组| - 共有数) / 3 越小，按共有数从多到少核对
+            order = np.argsort(-counts, kind="stable")[:MAX_CANDIDATES]
+            candidates = [(int(counts[i]), self._titles[candidates[i]], int(candidates[i])) for i in order]
+
+        masks = _bit_masks(pattern)
+        matches = []
+        cutoff = k  # 仍需核对的编辑距离上限
+        for count, title, number in candidates:
+            if -(-(len(grams) - count) // GRAM) > cutoff:
+                break  # 之后的候选共有数更少，编辑距离的下界已超过上限
+            if len(title) < len(pattern) - cutoff:
+                continue
+            distance = substring_distance(pattern, title, masks)
+            if distance <= cutoff:
+                matches.append((distance, abs(len(title) - len(pattern)), number))
+                matches.sort()
+                # 比最好的结果多错 RANK_SLACK 处以上的标题不再列出；已有 limit 个结果时不必找更差的
+                cutoff = min(cutoff, matches[0][0] + RANK_SLACK)
+                if len(matches) >= limit:
+                    cutoff = min(cutoff, matches[limit - 1][0])
+        return [(self.papers[number], distance) for distance, _, number in matches[:limit]]
+
+    def load_from_cache(self, cache=None):
+        """从磁盘缓存中的历史文献搜索响应登记标题"""
+        cache = cache or get_cache()
+        for _, body in cache.items(lambda key: "/search/publ/api" in key):
+            try:
+                self.add(parse_publications(json.loads(body.decode("utf-8"))))
+            except ValueError:
+                continue
+        self.loaded = True
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_title_index():
+    """返回全局共享的标题索引"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = TitleIndex()
+        return _index
@@ -0,0 +1,217 @@
+import atexit
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+from dblp_searcher.dblp_records import papers_to_records, records_to_papers, records_size, \
+    pack_records, unpack_records
+
+
+class SpillStore:
+    """
+    历史记录的磁盘溢出区：压缩后的记录写入临时目录，每条一个文件。
+    只在本次运行中有效，程序退出时删除整个目录。
+    """
+
+    def __init__(self, directory=None):
+        self._directory = directory
+        self._owned = directory is None  # 自己创建的临时目录退出时删除
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _dir(self):
+        with self._lock:
+            if self._directory is None:
+                self._directory = tempfile.mkdtemp(prefix="dblp_history_")
+                atexit.register(self.close)
+            else:
+                os.makedirs(self._directory, exist_ok=True)
+            return self._directory
+
+    def put(self, data):
+        """写入一段字节，返回读取用的键"""
+        key = f"{next(self._ids)}.z"
+        with open(os.path.join(self._dir(), key), "wb") as f:
+            f.write(data)
+        return key
+
+    def get(self, key):
+        with open(os.path.join(self._dir(), key), "rb") as f:
+            return f.read()
+
+    def delete(self, key):
+        try:
+            os.remove(os.path.join(self._dir(), key))
+        except OSError:
+            pass
+
+    def close(self):
+        if self._owned and self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+
+
+_spill_store = None
+_spill_store_lock = threading.Lock()
+
+
+def get_spill_store():
+    """返回全局共享的溢出存储（各页签的历史共用一个临时目录）"""
+    global _spill_store
+    with _spill_store_lock:
+        if _spill_store is None:
+            _spill_store = SpillStore()
+        return _spill_store
+
+
+class HistoryEntry:
+    """一条历史：显示名称、页签状态、论文记录（已溢出到磁盘时为 None）"""
+    __slots__ = ("label", "state", "records", "size", "count", "spill_key")
+
+    def __init__(self, label, state, records):
+        self.label = label
+        self.state = state
+        self.records = records
+        self.size = records_size(records)
+        self.count = len(records)
+        self.spill_key = None
+
+
+class ResultHistory:
+    """
+    页签的结果集浏览历史（后退/前进）。
+
+    - 最多保留 max_entries 条；在中间位置产生新结果时丢弃“前进”部分
+    - 内存中的记录按最近使用（LRU）限制总字节数，超出 memory_limit 时
+      把最久未用的条目压缩写入溢出存储，再次访问时从磁盘读回
+    - 保存的是 RECORD_FIELDS 顺序的紧凑元组（含已获取的引用数），而不是论文 dict 或界面对象
+    """
+
+    def __init__(self, max_entries=50, memory_limit=32 * 1024 * 1024, store=None):
+        self.max_entries = max_entries
+        self.memory_limit = memory_limit
+        self._store = store
+        self._entries = []
+        self._position = -1
+        self._in_memory = OrderedDict()  # 内存中的条目，按最近使用排序
+        self._memory = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = get_spill_store()
+        return self._store
+
+    @property
+    def memory_usage(self):
+        """内存中记录的估算字节数"""
+        return self._memory
+
+    @property
+    def current(self):
+        if 0 <= self._position < len(self._entries):
+            return self._entries[self._position]
+        return None
+
+    def push(self, label, papers, state=None):
+        """记录一个新的结果集，成为当前位置"""
+        for entry in self._entries[self._position + 1:]:
+            self._drop(entry)
+        del self._entries[self._position + 1:]
+
+        entry = HistoryEntry(label, dict(state or {}), papers_to_records(papers))
+        self._entries.append(entry)
+        while len(self._entries) > self.max_entries:
+            self._drop(self._entries.pop(0))
+        self._position = len(self._entries) - 1
+        self._touch(entry)
+        return entry
+
+    def update_current(self, papers):
+        """
+        当前条目显示的论文在记入历史后被修改（如补充了引用数）时重新编码记录，
+        替换内存中的旧记录并删除磁盘上已过时的溢出副本
+        """
+        entry = self.current
+        if entry is None:
+            return
+        self._drop(entry)
+        entry.records = papers_to_records(papers)
+        entry.size = records_size(entry.records)
+        entry.count = len(entry.records)
+        self._touch(entry)
+
+    def can_go_back(self):
+        return self._position > 0
+
+    def can_go_forward(self):
+        return self._position < len(self._entries) - 1
+
+    def peek(self, offset):
+        """返回相对当前位置 offset 处的条目（不移动），不存在时返回 None"""
+        position = self._position + offset
+        if 0 <= position < len(self._entries):
+            return self._entries[position]
+        return None
+
+    def back(self):
+        return self.go(-1)
+
+    def forward(self):
+        return self.go(1)
+
+    def go(self, offset):
+        """移动 offset 步，返回 (名称, 论文列表, 状态)；越界时返回 None"""
+        entry = self.peek(offset)
+        if entry is None:
+            return None
+        self._position += offset
+        papers = self._load(entry)
+        return entry.label, papers, dict(entry.state)
+
+    def clear(self):
+        for entry in self._entries:
+            self._drop(entry)
+        self._entries = []
+        self._position = -1
+
+    def _load(self, entry):
+        if entry.records is None:
+            entry.records = unpack_records(self.store.get(entry.spill_key))
+        self._touch(entry)
+        return records_to_papers(entry.records)
+
+    def _touch(self, entry):
+        """把条目标记为最近使用，并按内存上限把最久未用的条目溢出到磁盘"""
+        if entry in self._in_memory:
+            self._in_memory.move_to_end(entry)
+        else:
+            self._in_memory[entry] = None
+            self._memory += entry.size
+        # 至少保留刚访问的条目在内存中
+        while self._memory > self.memory_limit and len(self._in_memory) > 1:
+            oldest = next(iter(self._in_memory))
+            self._spill(oldest)
+
+    def _spill(self, entry):
+        if entry.spill_key is None:
+            # 写过一次的条目内容不变，再次溢出时直接丢弃内存副本
+            entry.spill_key = self.store.put(pack_records(entry.records))
+        entry.records = None
+        del self._in_memory[entry]
+        self._memory -= entry.size
+
+    def _drop(self, entry):
+        if entry in self._in_memory:
+            del self._in_memory[entry]
+            self._memory -= entry.size
+        if entry.spill_key is not None:
+            self.store.delete(entry.spill_key)
+            entry.spill_key = None
+        entry.records = None
@@ -0,0 +1,116 @@
+import threading
+
+from dblp_searcher import dblp_trace
+from dblp_searcher.dblp_cache import get_cache
+
+# requests 在首次发请求时才导入：界面启动时只需要 CancelToken / TaskCancelled
+
+
+class TaskCancelled(Exception):
+    """任务已被取消"""
+
+
+class CancelToken:
+    """任务取消标记，HTTP 请求在读取响应的间隙检查它"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TaskCancelled()
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """返回全局共享的 requests.Session（复用连接池）"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def http_get(url, params=None, headers=None, cancel_token=None, timeout=30, chunk_size=64 * 1024,
+             cache_ttl=None):
+    """
+    发送 GET 请求并返回 requests.Response。
+
+    响应体分块读取，每读一块检查一次 cancel_token，
+    取消时立即关闭连接并抛出 TaskCancelled。
+    cache_ttl 不为 None 时先查磁盘缓存（有效期 cache_ttl 秒），成功的响应会写入缓存。
+    计时分为 net.cache（查缓存）、net.request（DNS、建连直到收到响应头）和 net.transfer（读取响应体）。
+    """
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+
+    cache_key = None
+    if cache_ttl is not None:
+        import requests
+        cache_key = requests.Request("GET", url, params=params).prepare().url
+        with dblp_trace.span("net.cache", url=cache_key) as span:
+            body = get_cache().get(cache_key, ttl=cache_ttl)
+            span.set(hit=body is not None)
+        if body is not None:
+            return _cached_response(cache_key, body)
+
+    with dblp_trace.span("net.request", url=url) as span:
+        response = get_session().get(url, params=params, headers=headers, timeout=timeout, stream=True)
+        span.set(status=response.status_code)
+    try:
+        with dblp_trace.span("net.transfer", url=url) as span:
+            chunks = []
+            for chunk in response.iter_content(chunk_size):
+                if cancel_token is not None and cancel_token.cancelled:
+                    raise TaskCancelled()
+                chunks.append(chunk)
+            # 读取完毕后写回响应，调用方可照常使用 .text / .json()
+            response._content = b"".join(chunks)
+            span.set(bytes=len(response._content))
+    finally:
+        response.close()
+
+    if cache_key is not None and response.status_code == 200:
+        get_cache().set(cache_key, response.content)
+    return response
+
+
+def http_post(url, json_body=None, headers=None, cancel_token=None, timeout=30):
+    """
+    发送 JSON POST 请求（如 Semantic Scholar 的批量接口）并返回 requests.Response。
+    响应不缓存，请求前后各检查一次 cancel_token；计时记为 net.request。
+    """
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+    with dblp_trace.span("net.request", url=url, method="POST") as span:
+        response = get_session().post(url, json=json_body, headers=headers, timeout=timeout)
+        span.set(status=response.status_code, bytes=len(response.content))
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+    return response
+
+
+def _cached_response(url, body):
+    """用缓存内容构造一个 200 响应"""
+    import requests
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.encoding = "utf-8"
+    response._content = body
+    return response
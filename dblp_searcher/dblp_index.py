@@ -0,0 +1,242 @@
+import re
+import time
+from bisect import bisect_left, insort
+from collections import deque
+from itertools import compress, repeat
+
+# 支持分面过滤的字段
+FACET_FIELDS = ("year", "venue", "type", "access")
+
+# 开放获取在 API 结果与网页结果中的取值不同
+OPEN_ACCESS_VALUES = ("open", "open access")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# 位图的二进制文本（"0"/"1"）转换为每行一个字节的 0/1，用于把位图在 C 代码中展开
+_BIT_FLAGS = bytes.maketrans(b"01", b"\x00\x01")
+_FLAG_BITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def field_text(paper, field):
+    """把论文字段转换为文本（列表用逗号连接）"""
+    value = paper.get(field, "N/A")
+    if isinstance(value, list):
+        return ", ".join(value)
+    return "" if value is None else str(value)
+
+
+def rows_to_bits(rows, size):
+    """把行号列表转换为位图（Python 整数，第 i 位表示第 i 行）"""
+    flags = bytearray(size)
+    _set_flags(flags, rows)
+    return flags_to_bits(flags)
+
+
+def _set_flags(flags, rows):
+    """把 flags 中 rows 各行的字节置为 1（逐行赋值在 C 代码中完成）"""
+    deque(map(flags.__setitem__, rows, repeat(1)), maxlen=0)
+
+
+def flags_to_bits(flags):
+    """bits_to_flags 的逆操作：每行一个字节的 0/1 转换为位图"""
+    return int(flags.translate(_FLAG_BITS)[::-1], 2) if flags else 0
+
+
+def bits_to_flags(bits, size):
+    """把位图展开为长度为 size 的 bytes，第 i 个字节为 1 表示第 i 行在位图中"""
+    flags = format(bits, "b")[::-1].encode("ascii").translate(_BIT_FLAGS) if bits else b""
+    return flags.ljust(size, b"\x00")
+
+
+def bits_to_rows(bits, start=0):
+    """把位图展开为升序的行号列表（start：位图中 start 之前的位都为 0，跳过不展开）"""
+    bits >>= start
+    if not bits:
+        return []
+    flags = bits_to_flags(bits, 0)
+    return list(compress(range(start, start + len(flags)), flags))
+
+
+class PublicationIndex:
+    """
+    已加载论文的内存索引，用于表格内过滤：
+    - 倒排索引：词 -> 行号列表（标题、作者、发表源中的词）
+    - 分面索引：字段值 -> 行号列表（年份、发表源、类型、开放获取）
+    查询时把行号列表转换为位图并缓存，多个条件用按位与组合。
+    只有一个字符的前缀会命中大量词，逐个合并很慢，可以用 warm_prefixes() 在空闲时预先算好。
+    索引可以分批建立，查询只覆盖已加入的行；start 参数只计算某行之后的行，用于分批补建时检查新加入的行。
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._size = 0
+        self._postings = {}
+        self._facets = {field: {} for field in FACET_FIELDS}
+        self._sorted_tokens = None  # 按前缀查找用的有序词表，首次前缀查询时建立
+        self._new_tokens = []       # 建立有序词表后新出现的词，下次前缀查询时并入
+        self._reset_caches()
+
+    def _reset_caches(self):
+        self._bits_cache = {}
+        self._prefix_cache = {}
+        self._cold_initials = None  # 尚未预先计算的单字符前缀
+        self._warming = None        # 正在预先计算的前缀：[前缀, 下一个词的位置, 结束位置, 标志]
+
+    def __len__(self):
+        return self._size
+
+    def add(self, papers):
+        """追加一批论文，行号接在已有数据之后"""
+        postings = self._postings
+        facets = self._facets
+        new_tokens = self._new_tokens if self._sorted_tokens is not None else None
+        row = self._size
+        for paper in papers:
+            text = " ".join((field_text(paper, "title"), field_text(paper, "authors"),
+                             field_text(paper, "venue"))).lower()
+            for token in set(_TOKEN_RE.findall(text)):
+                rows = postings.get(token)
+                if rows is None:
+                    postings[token] = [row]
+                    if new_tokens is not None:
+                        new_tokens.append(token)
+                else:
+                    rows.append(row)
+            for field in FACET_FIELDS:
+                value = field_text(paper, field)
+                rows = facets[field].get(value)
+                if rows is None:
+                    facets[field][value] = [row]
+                else:
+                    rows.append(row)
+            row += 1
+        self._size = row
+        self._reset_caches()
+
+    def all_bits(self, start=0):
+        return (1 << self._size) - (1 << start)
+
+    def facet_values(self, field):
+        """返回某字段的所有取值及数量，按数量降序"""
+        values = [(value, len(rows)) for value, rows in self._facets[field].items()]
+        values.sort(key=lambda item: (-item[1], item[0]))
+        return values
+
+    def _bits(self, key, rows, start=0):
+        if start:
+            # 只取 start 之后的行（行号列表升序），只用一次，不缓存
+            return rows_to_bits(rows[bisect_left(rows, start):], self._size)
+        bits = self._bits_cache.get(key)
+        if bits is None:
+            bits = rows_to_bits(rows, self._size)
+            self._bits_cache[key] = bits
+        return bits
+
+    def match_facet(self, field, values, start=0):
+        """匹配字段取值在 values 中的行"""
+        bits = 0
+        for value in values:
+            rows = self._facets[field].get(value)
+            if rows:
+                bits |= self._bits((field, value), rows, start)
+        return bits
+
+    def _tokens(self):
+        """有序词表；补建索引时新出现的词逐个插入，较多时排序后并入（两段有序序列的合并，不必整体重排）"""
+        tokens = self._sorted_tokens
+        if tokens is None:
+            tokens = self._sorted_tokens = sorted(self._postings)
+        elif len(self._new_tokens) <= 64:
+            for token in self._new_tokens:
+                insort(tokens, token)
+            self._new_tokens = []
+        else:
+            self._new_tokens.sort()
+            tokens.extend(self._new_tokens)
+            tokens.sort()
+            self._new_tokens = []
+        return tokens
+
+    def match_prefix(self, prefix, start=0):
+        """匹配含有以 prefix 开头的词的行"""
+        bits = self._prefix_cache.get(prefix) if not start else None
+        if bits is not None:
+            return bits
+        tokens = self._tokens()
+        first = end = bisect_left(tokens, prefix)
+        while end < len(tokens) and tokens[end].startswith(prefix):
+            end += 1
+
+        if end - first == 1:
+            bits = self._bits(("token", tokens[first]), self._postings[tokens[first]], start)
+        else:
+            # 短前缀会命中大量词，直接写入同一组标志比逐个转换再合并快得多
+            flags = bytearray(self._size)
+            for token in tokens[first:end]:
+                rows = self._postings[token]
+                _set_flags(flags, rows[bisect_left(rows, start):] if start else rows)
+            bits = flags_to_bits(flags)
+        if not start:
+            self._prefix_cache[prefix] = bits
+        return bits
+
+    def warm_prefixes(self, deadline):
+        """
+        预先计算各单字符前缀（词的首字符）的位图放入缓存，到 deadline（time.perf_counter() 的值）为止；
+        一个前缀没算完时记下进度，下次接着算。全部算完时返回 True。索引再加入论文后缓存失效，需要重新计算
+        """
+        if self._cold_initials is None:
+            self._cold_initials = sorted({token[0] for token in self._postings})
+        tokens = self._tokens()
+        while True:
+            if self._warming is None:
+                if not self._cold_initials:
+                    return True
+                prefix = self._cold_initials.pop()
+                if prefix in self._prefix_cache:
+                    continue  # 已经查询过
+                first = end = bisect_left(tokens, prefix)
+                while end < len(tokens) and tokens[end].startswith(prefix):
+                    end += 1
+                self._warming = [prefix, first, end, bytearray(self._size)]
+            prefix, position, end, flags = self._warming
+            while position < end:
+                _set_flags(flags, self._postings[tokens[position]])
+                position += 1
+                if time.perf_counter() >= deadline:
+                    break
+            if position < end:
+                self._warming[1] = position
+                return False
+            self._prefix_cache[prefix] = flags_to_bits(flags)
+            self._warming = None
+            if time.perf_counter() >= deadline:
+                return not self._cold_initials
+
+    def match_text(self, text, start=0):
+        """文本过滤：每个词按前缀匹配，多个词之间为“与”关系"""
+        bits = self.all_bits(start)
+        for term in _TOKEN_RE.findall(text.lower()):
+            bits &= self.match_prefix(term, start)
+            if not bits:
+                break
+        return bits
+
+    def query(self, text="", facets=None, start=0):
+        """
+        组合查询，返回匹配行的位图；没有任何条件时返回 None。
+
+        参数：
+            text: 文本过滤条件
+            facets: dict，字段 -> 允许的取值列表
+            start: 只计算行号不小于 start 的行（其余位为 0）
+        """
+        bits = None
+        if text and text.strip():
+            bits = self.match_text(text, start)
+        for field, values in (facets or {}).items():
+            facet_bits = self.match_facet(field, values, start)
+            bits = facet_bits if bits is None else bits & facet_bits
+        return bits
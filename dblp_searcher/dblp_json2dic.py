@@ -1,6 +1,3 @@
-from dblp_searcher.dblp_api import query_publications,search_author,search_venue
-
-
 def parse_publications(data):
     result_list = []
     try:
@@ -119,6 +116,8 @@ def display_venues(venue_results):
         print(f"  url: {item['url']}")
 
 if __name__ == "__main__":
+    from dblp_searcher.dblp_api import query_publications,search_author,search_venue
+
     # 查询文献
     pub_json = query_publications("transformer vision", max_results=10)
     pub_results = parse_publications(pub_json)
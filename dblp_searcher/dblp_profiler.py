@@ -0,0 +1,166 @@
+"""
+按操作的性能分析：用 cProfile（CPU）和/或 tracemalloc（内存）包住一次任务，
+结束后把结果写入 PROFILE_DIR，用于在用户机器上定位个别作者主页或大词云的 CPU、内存峰值。
+
+用环境变量开启（也可在界面的“调试”菜单中切换）：
+    DBLP_PROFILE=cpu | memory | cpu,memory
+    DBLP_PROFILE_DIR=结果目录（默认 ~/.dblp_viewer/profiles）
+    DBLP_PROFILE_TOP=摘要中列出的条数（默认 25）
+
+每次操作生成：
+    <时间>_<序号>_<操作名>.txt    摘要：累计耗时最多的函数、净增内存最多的分配位置、内存峰值
+    <时间>_<序号>_<操作名>.prof   cProfile 原始数据，可用 python -m pstats 或 snakeviz 查看
+
+说明：cProfile 只统计运行任务的线程；tracemalloc 统计整个进程，
+多个任务同时运行时分配位置会互相混入，定位内存问题时最好一次只运行一个任务。
+"""
+import datetime
+import io
+import itertools
+import os
+import re
+import threading
+import time
+
+PROFILE_DIR = os.environ.get("DBLP_PROFILE_DIR") or os.path.join(os.path.expanduser("~"), ".dblp_viewer", "profiles")
+MODES = ("cpu", "memory")
+
+
+def _top_n(default=25):
+    """DBLP_PROFILE_TOP 的值；未设置或不是正整数时用默认值（不因环境变量写错而无法启动）"""
+    try:
+        value = int(os.environ.get("DBLP_PROFILE_TOP") or default)
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+TOP_N = _top_n()
+
+_modes = frozenset(mode.strip() for mode in os.environ.get("DBLP_PROFILE", "").lower().split(",")
+                   if mode.strip() in MODES)
+_lock = threading.Lock()
+_memory_users = 0  # 正在使用 tracemalloc 的操作数，最后一个结束时停止跟踪
+_sequence = itertools.count(1)
+
+
+def modes():
+    return _modes
+
+
+def set_modes(new_modes):
+    """设置分析模式（MODES 的子集），空集合表示关闭"""
+    global _modes
+    _modes = frozenset(mode for mode in new_modes if mode in MODES)
+
+
+class _Null:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL = _Null()
+
+
+class _Profiled:
+    def __init__(self, name, modes_):
+        self.name = name
+        self.modes = modes_
+        self.profiler = None
+        self.start_snapshot = None
+        self.report_path = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        if "memory" in self.modes:
+            _start_memory()
+            self.start_snapshot = _snapshot()
+        if "cpu" in self.modes:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            try:
+                self.profiler.enable()
+            except ValueError:  # 同一线程中已有其他分析器在运行
+                self.profiler = None
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.profiler is not None:
+            self.profiler.disable()
+        elapsed = time.perf_counter() - self.started
+        memory = None
+        if self.start_snapshot is not None:
+            import tracemalloc
+            memory = (_snapshot(), tracemalloc.get_traced_memory())
+            _stop_memory()
+        try:
+            self.report_path = _write_report(self.name, elapsed, exc_type, self.profiler, self.start_snapshot, memory)
+            print(f"性能分析结果：{self.report_path}")
+        except OSError as e:
+            print(f"保存性能分析结果失败：{e}")
+        return False
+
+
+def profiled(name):
+    """
+    分析 with 块内的代码：with profiled("paper_search_task"): ...
+    未开启时返回空对象；开启时块结束后写出结果，路径见返回对象的 report_path。
+    """
+    if not _modes:
+        return _NULL
+    return _Profiled(name, _modes)
+
+
+def _start_memory():
+    global _memory_users
+    import tracemalloc
+    with _lock:
+        if _memory_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _memory_users += 1
+        if hasattr(tracemalloc, "reset_peak"):  # Python 3.9+
+            tracemalloc.reset_peak()
+
+
+def _stop_memory():
+    global _memory_users
+    import tracemalloc
+    with _lock:
+        _memory_users -= 1
+        if _memory_users == 0:
+            tracemalloc.stop()
+
+
+def _snapshot():
+    import tracemalloc
+    # 不统计 tracemalloc 自身的分配
+    return tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+
+
+def _write_report(name, elapsed, exc_type, profiler, start_snapshot, memory):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    safe_name = re.sub(r"[^\w.-]+", "_", name)[:60]
+    base = os.path.join(PROFILE_DIR, f"{datetime.datetime.now():%Y%m%d_%H%M%S}_{next(_sequence):03d}_{safe_name}")
+
+    lines = [f"操作：{name}", f"耗时：{elapsed:.3f} 秒" + (f"（异常 {exc_type.__name__}）" if exc_type else "")]
+    if profiler is not None:
+        import pstats
+        profiler.dump_stats(base + ".prof")
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).strip_dirs().sort_stats("cumulative").print_stats(TOP_N)
+        lines += ["", f"== CPU：累计耗时前 {TOP_N} 的函数（完整数据：{os.path.basename(base)}.prof）==",
+                  stream.getvalue().strip()]
+    if memory is not None:
+        end_snapshot, (current, peak) = memory
+        stats = end_snapshot.compare_to(start_snapshot, "lineno")
+        lines += ["", f"== 内存：峰值 {peak / 1024 / 1024:.1f} MB，当前 {current / 1024 / 1024:.1f} MB ==",
+                  f"净增内存前 {TOP_N} 的分配位置："]
+        lines += [f"  {stat}" for stat in stats[:TOP_N]]
+
+    path = base + ".txt"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
@@ -0,0 +1,134 @@
+import marshal
+import sys
+import zlib
+from collections.abc import Sequence
+
+# 论文字段的固定顺序（parse_publications / parse_dblp_entries 输出的字段）
+PAPER_FIELDS = ("title", "authors", "venue", "pages", "year", "type", "access",
+                "key", "doi", "ee", "url", "volume")
+# 加载后才补充的字段（Semantic Scholar 引用数、高影响引用数），不来自 dblp
+ENRICHED_FIELDS = ("citations", "influential_citations")
+# 紧凑记录的字段顺序：dblp 字段在前，补充字段在后（尚未补充时为空字符串）
+RECORD_FIELDS = PAPER_FIELDS + ENRICHED_FIELDS
+
+_intern = sys.intern
+
+
+def paper_to_record(paper):
+    """
+    把论文 dict 转换为紧凑记录：按 RECORD_FIELDS 顺序的元组，作者为元组。
+    取值重复度高的字段（发表源、年份、类型等）驻留字符串以共享内存；补充字段转为字符串，没有时为空字符串。
+    """
+    get = paper.get
+    authors = get("authors")
+    return (
+        get("title", "N/A"),
+        tuple(authors) if isinstance(authors, (list, tuple)) else (),
+        _intern(str(get("venue", "N/A"))),
+        get("pages", "N/A"),
+        _intern(str(get("year", "N/A"))),
+        _intern(str(get("type", "N/A"))),
+        _intern(str(get("access", "N/A"))),
+        get("key", "N/A"),
+        get("doi", "N/A"),
+        get("ee", "N/A"),
+        get("url", "N/A"),
+        _intern(str(get("volume", "N/A"))),
+        _enriched_text(get("citations")),
+        _enriched_text(get("influential_citations")),
+    )
+
+
+def _enriched_text(value):
+    return "" if value is None else str(value)
+
+
+def record_to_paper(record):
+    """把紧凑记录还原为论文 dict（补充字段为空时不加入，数值还原为整数）"""
+    paper = dict(zip(PAPER_FIELDS, record))
+    paper["authors"] = list(record[1])
+    for field, value in zip(ENRICHED_FIELDS, record[len(PAPER_FIELDS):]):
+        if value:
+            paper[field] = int(value) if value.isdigit() else value
+    return paper
+
+
+def papers_to_records(papers):
+    return [paper_to_record(paper) for paper in papers]
+
+
+def records_to_papers(records):
+    return [record_to_paper(record) for record in records]
+
+
+class LazyPaperList(Sequence):
+    """
+    只读的论文序列：底层是按下标返回紧凑记录的数据源（如内存映射的列式表），
+    论文 dict 在第一次访问时才解码，之后缓存。
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self._papers = [None] * len(records)
+
+    def __len__(self):
+        return len(self._papers)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self._papers)))]
+        paper = self._papers[row]
+        if paper is None:
+            paper = record_to_paper(self.records[row])
+            self._papers[row] = paper
+        return paper
+
+    def iter_records(self):
+        """按顺序返回紧凑记录；尚未解码的行直接取底层记录，不创建 dict"""
+        for row, paper in enumerate(self._papers):
+            yield self.records[row] if paper is None else paper_to_record(paper)
+
+
+def iter_records(papers):
+    """把论文序列逐条转换为紧凑记录（LazyPaperList 直接复用底层记录）"""
+    if isinstance(papers, LazyPaperList):
+        return papers.iter_records()
+    return map(paper_to_record, papers)
+
+
+def records_size(records, sample=256):
+    """
+    估算记录列表占用的内存字节数。
+    记录较多时均匀抽取 sample 条计算再按比例放大；同一对象（驻留字符串）在样本中只计一次。
+    """
+    count = len(records)
+    if not count:
+        return sys.getsizeof(records)
+    step = max(1, count // sample)
+    seen = set()
+    measured = 0
+    size = 0
+    for record in records[::step]:
+        measured += 1
+        size += sys.getsizeof(record)
+        for value in record:
+            if id(value) in seen:
+                continue
+            seen.add(id(value))
+            size += sys.getsizeof(value)
+            if isinstance(value, tuple):
+                size += sum(sys.getsizeof(item) for item in value)
+    return sys.getsizeof(records) + size * count // measured
+
+
+def pack_records(records, level=1):
+    """
+    把记录列表序列化为压缩字节（marshal + zlib）。
+    marshal 格式与 Python 版本相关，只用于本次运行内的临时数据。
+    """
+    return zlib.compress(marshal.dumps(records), level)
+
+
+def unpack_records(data):
+    """pack_records 的逆操作"""
+    return marshal.loads(zlib.decompress(data))
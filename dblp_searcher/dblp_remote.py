@@ -0,0 +1,119 @@
+"""
+共享查询服务（dblp_server）的客户端。
+
+函数与 dblp_api / dblp_spider / dblp_translate 中的同名函数参数和返回值一致，
+设置环境变量 DBLP_SERVER=http://主机:端口 后，界面和命令行通过 backend() 改用这些函数，
+所有查询都由服务端统一缓存、限速和合并。
+"""
+import importlib
+import os
+import sys
+
+from dblp_searcher import dblp_trace
+from dblp_searcher.dblp_http import http_get
+
+SERVER_URL = os.environ.get("DBLP_SERVER", "").rstrip("/")
+PROFILE_BATCH_SIZE = 200
+
+
+def backend(module):
+    """
+    返回提供查询函数的模块：设置了 DBLP_SERVER 时返回本模块，
+    否则返回 dblp_searcher 中的 module（直接访问 dblp.org）。
+    """
+    if SERVER_URL:
+        return sys.modules[__name__]
+    return importlib.import_module(f"dblp_searcher.{module}")
+
+
+def _get(endpoint, params, cancel_token=None):
+    response = http_get(f"{SERVER_URL}/api/{endpoint}", params=params, cancel_token=cancel_token)
+    if response.status_code != 200:
+        import requests
+        try:
+            message = response.json().get("error")
+        except ValueError:
+            message = None
+        raise requests.HTTPError(f"{response.status_code} {message or response.reason}", response=response)
+    with dblp_trace.span("decode.json", bytes=len(response.content)):
+        return response.json()
+
+
+def _search(endpoint, params, cancel_token, what):
+    """搜索接口：与 dblp_api 一样，失败时打印错误并返回空 dict"""
+    import requests
+    try:
+        return _get(endpoint, params, cancel_token)
+    except requests.RequestException as e:
+        print(f"{what}失败: {e}")
+        return {}
+
+
+def query_publications(keyword, max_results=1000, cancel_token=None, first=0):
+    return _search("publications", {"q": keyword, "h": max_results, "f": first}, cancel_token, "查询文献")
+
+
+def iter_publications(keyword, max_results=1000, page_size=100, cancel_token=None):
+    from dblp_searcher.dblp_api import iter_result_pages
+
+    def fetch_page(hits, first):
+        return query_publications(keyword, hits, cancel_token=cancel_token, first=first)
+    return iter_result_pages(fetch_page, max_results, page_size)
+
+
+def search_author(author_name, max_results=1000, cancel_token=None):
+    return _search("author", {"q": author_name, "h": max_results}, cancel_token, "查询作者")
+
+
+def search_venue(venue_name, max_results=1000, cancel_token=None):
+    return _search("venue", {"q": venue_name, "h": max_results}, cancel_token, "查询出版源")
+
+
+def get_dblp_search_conference_links(index_url, cancel_token=None):
+    return [tuple(link) for link in _get("conference_volumes", {"url": index_url}, cancel_token)]
+
+
+def get_journal_volumes(index_url, cancel_token=None):
+    return [tuple(volume) for volume in _get("journal_volumes", {"url": index_url}, cancel_token)]
+
+
+def crawl_dblp_profile(url, cancel_token=None):
+    return _get("profile", {"url": url}, cancel_token)
+
+
+def iter_dblp_profile(url, batch_size=PROFILE_BATCH_SIZE, cancel_token=None):
+    """服务端一次返回整页论文，这里按 batch_size 分批，便于调用方与本地爬取同样处理"""
+    papers = crawl_dblp_profile(url, cancel_token)
+    for start in range(0, len(papers), batch_size):
+        yield papers[start:start + batch_size]
+
+
+def parse_dblp_entries(entries):
+    from dblp_searcher.dblp_spider import parse_dblp_entries
+    return parse_dblp_entries(entries)
+
+
+def get_bibtex_from_url(dblp_url, cancel_token=None):
+    import requests
+    try:
+        return _get("bibtex", {"url": dblp_url}, cancel_token)
+    except requests.RequestException as e:
+        print(f"获取 BibTeX 时发生错误: {e}")
+        return "请求错误"
+
+
+def get_abstract_by_doi(doi, cancel_token=None):
+    import requests
+    try:
+        return _get("abstract", {"doi": doi}, cancel_token)
+    except requests.RequestException:
+        return "❌ Semantic Scholar 查询失败"
+
+
+def baidu_translate(text, from_lang='auto', to_lang='zh', cancel_token=None):
+    import requests
+    try:
+        return _get("translate", {"text": text, "from": from_lang, "to": to_lang}, cancel_token)
+    except requests.RequestException as e:
+        print(f"翻译失败: {e}")
+        return text
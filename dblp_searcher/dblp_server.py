@@ -0,0 +1,330 @@
+"""
+共享查询服务（可选，需要安装 aiohttp）。
+
+在一台机器上运行，把 dblp_api / dblp_spider / dblp_translate 的函数以 JSON 接口提供给多个客户端：
+
+    python -m dblp_searcher.dblp_server --host 0.0.0.0 --port 8765 --rate 5
+
+- 所有客户端共用一份结果缓存（内存 LRU，搜索接口下面还有 dblp_http 的磁盘缓存）
+- 所有访问上游（dblp.org 等）的请求经过同一个令牌桶限速
+- 同时到达的相同请求合并为一次上游请求（request coalescing）
+
+客户端设置环境变量 DBLP_SERVER=http://主机:8765 后，界面和命令行改为请求本服务（见 dblp_remote）。
+
+接口（GET，返回 JSON，与对应函数的返回值相同）：
+    /api/publications?q=&h=&f=    query_publications 的一页结果
+    /api/author?q=&h=             search_author
+    /api/venue?q=&h=              search_venue
+    /api/conference_volumes?url=  get_dblp_search_conference_links
+    /api/journal_volumes?url=     get_journal_volumes
+    /api/profile?url=             crawl_dblp_profile
+    /api/bibtex?url=              get_bibtex_from_url
+    /api/abstract?doi=            get_abstract_by_doi
+    /api/translate?text=&from=&to= baidu_translate
+    /stats                        服务统计
+参数错误返回 400，上游请求失败返回 502，均为 {"error": "..."}。
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_RATE = 5.0       # 每秒访问上游的请求数
+DEFAULT_BURST = 10       # 令牌桶容量：空闲后允许的突发请求数
+DEFAULT_WORKERS = 16     # 执行阻塞查询函数的线程数
+RESULT_CACHE_SIZE = 5000
+
+SEARCH_TTL = 24 * 3600        # 搜索结果
+PAGE_TTL = 24 * 3600          # 作者主页、期卷列表
+RECORD_TTL = 7 * 24 * 3600    # BibTeX、摘要、翻译，内容基本不变
+
+# url 参数只允许指向这些主机（以及 DBLP_BASE_URL 指定的镜像），服务不能被用来访问任意地址
+ALLOWED_HOSTS = ("dblp.org", "dblp.uni-trier.de", "dblp.dagstuhl.de",
+                 urlparse(os.environ.get("DBLP_BASE_URL", "https://dblp.org")).hostname)
+
+# 爬虫函数出错时返回的提示文字，不能当作结果缓存
+FAILED_RESULTS = {"请求错误", "❌ Semantic Scholar 查询失败"}
+
+
+class BadRequest(Exception):
+    """请求参数错误"""
+
+
+class UpstreamError(Exception):
+    """上游请求失败"""
+
+
+class RateLimiter:
+    """令牌桶限速：平均每秒 rate 个请求，最多积攒 burst 个；等待者按先后顺序放行"""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = None  # 在事件循环中首次使用时创建
+
+    async def acquire(self):
+        """取得一个令牌，返回等待的秒数"""
+        start = time.monotonic()
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return now - start
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class ResultCache:
+    """内存中的结果缓存：键 -> (写入时间, JSON 字节)，按最近使用淘汰"""
+
+    def __init__(self, max_entries=RESULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, ttl):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored, body = entry
+        if time.time() - stored > ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return body
+
+    def set(self, key, body):
+        self._entries[key] = (time.time(), body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _text(params, name, default=None):
+    value = params.get(name, default)
+    if value is None or not str(value).strip():
+        raise BadRequest(f"缺少参数 {name}")
+    return str(value).strip()
+
+
+def _number(params, name, default, maximum):
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise BadRequest(f"参数 {name} 必须是整数")
+    if not 0 <= value <= maximum:
+        raise BadRequest(f"参数 {name} 超出范围 0..{maximum}")
+    return value
+
+
+def _dblp_url(params):
+    url = _text(params, "url")
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or parsed.hostname not in ALLOWED_HOSTS:
+        raise BadRequest(f"不支持的地址：{url}")
+    return url
+
+
+def _search_result(data):
+    """dblp_api 请求失败时返回空 dict"""
+    if not data:
+        raise UpstreamError("dblp 搜索接口请求失败")
+    return data
+
+
+def _publications(params):
+    from dblp_searcher.dblp_api import query_publications
+    keyword, hits, first = _text(params, "q"), _number(params, "h", 100, 1000), _number(params, "f", 0, 10000)
+    return (keyword, hits, first), SEARCH_TTL, \
+        lambda: _search_result(query_publications(keyword, hits, first=first))
+
+
+def _author(params):
+    from dblp_searcher.dblp_api import search_author
+    keyword, hits = _text(params, "q"), _number(params, "h", 1000, 1000)
+    return (keyword, hits), SEARCH_TTL, lambda: _search_result(search_author(keyword, hits))
+
+
+def _venue(params):
+    from dblp_searcher.dblp_api import search_venue
+    keyword, hits = _text(params, "q"), _number(params, "h", 1000, 1000)
+    return (keyword, hits), SEARCH_TTL, lambda: _search_result(search_venue(keyword, hits))
+
+
+def _conference_volumes(params):
+    from dblp_searcher.dblp_spider import get_dblp_search_conference_links
+    url = _dblp_url(params)
+    return (url,), PAGE_TTL, lambda: get_dblp_search_conference_links(url)
+
+
+def _journal_volumes(params):
+    from dblp_searcher.dblp_spider import get_journal_volumes
+    url = _dblp_url(params)
+    return (url,), PAGE_TTL, lambda: get_journal_volumes(url)
+
+
+def _profile(params):
+    from dblp_searcher.dblp_spider import crawl_dblp_profile
+    url = _dblp_url(params)
+    return (url,), PAGE_TTL, lambda: crawl_dblp_profile(url)
+
+
+def _bibtex(params):
+    from dblp_searcher.dblp_spider import get_bibtex_from_url
+    url = _dblp_url(params)
+    return (url,), RECORD_TTL, lambda: get_bibtex_from_url(url)
+
+
+def _abstract(params):
+    from dblp_searcher.dblp_spider import get_abstract_by_doi
+    doi = _text(params, "doi")
+    return (doi,), RECORD_TTL, lambda: get_abstract_by_doi(doi)
+
+
+def _translate(params):
+    from dblp_searcher.dblp_translate import baidu_translate
+    text, from_lang, to_lang = _text(params, "text"), _text(params, "from", "auto"), _text(params, "to", "zh")
+    return (text, from_lang, to_lang), RECORD_TTL, lambda: baidu_translate(text, from_lang, to_lang)
+
+
+# 接口名 -> 函数：由请求参数返回 (缓存键参数, 缓存有效期, 执行查询的无参函数)
+ENDPOINTS = {
+    "publications": _publications,
+    "author": _author,
+    "venue": _venue,
+    "conference_volumes": _conference_volumes,
+    "journal_volumes": _journal_volumes,
+    "profile": _profile,
+    "bibtex": _bibtex,
+    "abstract": _abstract,
+    "translate": _translate,
+}
+
+
+class SearchService:
+    """缓存、请求合并与限速；查询函数是阻塞的，在线程池中执行"""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, workers=DEFAULT_WORKERS,
+                 cache_size=RESULT_CACHE_SIZE):
+        self.limiter = RateLimiter(rate, burst)
+        self.cache = ResultCache(cache_size)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dblp-server")
+        self._inflight = {}  # 键 -> 正在进行的上游查询
+        self.stats = {"requests": 0, "cache_hits": 0, "coalesced": 0, "upstream": 0,
+                      "upstream_errors": 0, "rate_wait_seconds": 0.0}
+
+    async def query(self, endpoint, params):
+        """执行一次接口调用，返回 JSON 字节"""
+        if endpoint not in ENDPOINTS:
+            raise BadRequest(f"未知接口：{endpoint}")
+        args, ttl, function = ENDPOINTS[endpoint](params)
+        key = json.dumps([endpoint, *args], ensure_ascii=False)
+        self.stats["requests"] += 1
+
+        body = self.cache.get(key, ttl)
+        if body is not None:
+            self.stats["cache_hits"] += 1
+            return body
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(key, function))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats["coalesced"] += 1
+        # 某个客户端断开时不取消共享的上游查询
+        return await asyncio.shield(future)
+
+    async def _fetch(self, key, function):
+        self.stats["rate_wait_seconds"] += await self.limiter.acquire()
+        self.stats["upstream"] += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, function)
+        except UpstreamError:
+            self.stats["upstream_errors"] += 1
+            raise
+        except Exception as e:
+            self.stats["upstream_errors"] += 1
+            raise UpstreamError(f"{type(e).__name__}: {e}")
+        body = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        if not (isinstance(result, str) and result in FAILED_RESULTS):
+            self.cache.set(key, body)
+        return body
+
+    def snapshot(self):
+        return dict(self.stats, cached=len(self.cache), inflight=len(self._inflight))
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+def create_app(service=None):
+    """创建 aiohttp 应用；service 为 None 时使用默认参数的 SearchService"""
+    from aiohttp import web
+
+    service = service or SearchService()
+
+    def error(status, message):
+        return web.json_response({"error": message}, status=status, dumps=lambda o: json.dumps(o, ensure_ascii=False))
+
+    async def handle_api(request):
+        try:
+            body = await service.query(request.match_info["endpoint"], request.query)
+        except BadRequest as e:
+            return error(400, str(e))
+        except UpstreamError as e:
+            return error(502, str(e))
+        return web.Response(body=body, content_type="application/json", charset="utf-8")
+
+    async def handle_stats(request):
+        return web.json_response(service.snapshot())
+
+    async def on_cleanup(app):
+        service.close()
+
+    # 翻译接口的文本放在查询参数中，放宽请求行长度限制
+    app = web.Application(handler_args={"max_line_size": 64 * 1024})
+    app["service"] = service
+    app.router.add_get("/api/{endpoint}", handle_api)
+    app.router.add_get("/stats", handle_stats)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m dblp_searcher.dblp_server",
+                                     description="DBLP 共享查询服务")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"监听地址（默认 {DEFAULT_HOST}）")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"监听端口（默认 {DEFAULT_PORT}）")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help=f"每秒访问上游的请求数（默认 {DEFAULT_RATE}）")
+    parser.add_argument("--burst", type=int, default=DEFAULT_BURST, help=f"允许的突发请求数（默认 {DEFAULT_BURST}）")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"执行查询的线程数（默认 {DEFAULT_WORKERS}）")
+    args = parser.parse_args(argv)
+
+    try:
+        from aiohttp import web
+    except ImportError:
+        parser.exit(1, "运行共享查询服务需要安装 aiohttp（pip install aiohttp）\n")
+    service = SearchService(args.rate, args.burst, args.workers)
+    web.run_app(create_app(service), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+
+from dblp_searcher.dblp_columnar import ColumnarFile, ColumnarFormatError, write_columnar
+from dblp_searcher.dblp_records import RECORD_FIELDS, LazyPaperList, iter_records
+
+# 会话快照文件，可通过环境变量 DBLP_SESSION_FILE 修改
+SESSION_PATH = os.environ.get("DBLP_SESSION_FILE") or \
+    os.path.join(os.path.expanduser("~"), ".dblp_viewer", "session.dcol")
+SESSION_VERSION = 2  # 2：论文表增加引用数列
+
+# 论文表的列定义：作者为字符串列表，其余（包括引用数等补充字段）为字符串
+PAPER_COLUMNS = [(field, "list" if field == "authors" else "str") for field in RECORD_FIELDS]
+
+
+class SessionStore:
+    """
+    会话快照：各页签的界面状态（JSON，存于文件头）与已加载的论文（每个页签一张列式表）。
+
+    读取时只映射文件、解析文件头，论文以 LazyPaperList 返回，显示到哪一行才解码哪一行。
+    """
+
+    def __init__(self, path=SESSION_PATH):
+        self.path = path
+        self._file = None
+
+    def load(self):
+        """
+        打开快照，返回 (meta, {页签名: LazyPaperList})。
+        文件不存在、损坏或版本不符时返回 None。
+        """
+        self.close()
+        if not os.path.exists(self.path):
+            return None
+        try:
+            snapshot = ColumnarFile(self.path)
+        except (OSError, ColumnarFormatError):
+            return None
+        meta = snapshot.meta or {}
+        expected = [field for field, _ in PAPER_COLUMNS]
+        if meta.get("version") != SESSION_VERSION or \
+                any(snapshot.table(name).names != expected for name in snapshot.table_names()):
+            snapshot.close()
+            return None
+        self._file = snapshot
+        papers = {name: LazyPaperList(snapshot.table(name)) for name in snapshot.table_names()}
+        return meta, papers
+
+    def save(self, meta, papers):
+        """
+        写入快照。
+
+        参数：
+            meta: 可 JSON 序列化的界面状态
+            papers: dict，页签名 -> 论文序列
+
+        先写临时文件再替换。替换前会关闭当前映射的旧快照，
+        之后不能再访问 load() 返回的论文序列。
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        tables = {name: (PAPER_COLUMNS, list(iter_records(sequence))) for name, sequence in papers.items()}
+        write_columnar(temp_path, tables, dict(meta, version=SESSION_VERSION))
+        self.close()  # Windows 上仍被映射的文件不能替换
+        os.replace(temp_path, self.path)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
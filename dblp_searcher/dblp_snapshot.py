@@ -0,0 +1,277 @@
+"""
+本地记录库的内存映射快照：打开只需映射文件、解析文件头（毫秒级），
+查询时只有用到的页面才从磁盘读入，多个进程打开同一快照时共享系统页缓存。
+
+快照是一个列式文件（dblp_columnar），包含四张表：
+    papers   论文表，每行一篇（按年份从新到旧），作者为 authors 表的行号，发表源为 venues 表的行号
+    authors  作者名（升序）及其论文的行号（倒排表）
+    venues   发表源名称（升序）
+    terms    检索词（升序）及包含它的论文的行号（倒排表）
+字符串按列首尾相接存放，用偏移数组定位；倒排表为 uint32 数组。
+检索词来自标题、作者名和发表源中的单词（小写）以及年份。与 dblp 检索接口一样，
+查询中的每个词按前缀匹配（在有序的检索词列中二分出以它开头的一段），多个词的查询返回同时包含全部词的论文；
+一段超过 PREFIX_TERMS 个检索词时（如只有一两个字母的词）该词只匹配完全相同的检索词。
+
+文献搜索默认仍然查询 dblp.org；设置环境变量 DBLP_SNAPSHOT_SEARCH=1 或调用 set_search_enabled(True)
+（界面“数据”菜单）后先查快照，快照中没有结果时再查询 dblp.org。
+"""
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left
+
+from dblp_searcher.dblp_columnar import ColumnarFile, ColumnarFormatError, write_columnar
+from dblp_searcher.dblp_records import ENRICHED_FIELDS, LazyPaperList, record_to_paper
+
+# 快照文件，可通过环境变量 DBLP_SNAPSHOT_FILE 修改
+SNAPSHOT_PATH = os.environ.get("DBLP_SNAPSHOT_FILE") or \
+    os.path.join(os.path.expanduser("~"), ".dblp_viewer", "dblp.snap")
+SNAPSHOT_VERSION = 1
+PREFIX_TERMS = 256  # 查询词按前缀匹配时最多展开的检索词数
+
+_search_enabled = os.environ.get("DBLP_SNAPSHOT_SEARCH", "") not in ("", "0")
+
+PAPER_ORDER = "year = 'N/A', year DESC, key"  # 论文表的行序（倒排表升序即从新到旧）
+PAPER_COLUMNS = [("key", "str"), ("title", "str"), ("authors", "ids"), ("venue", "u32"), ("pages", "str"),
+                 ("year", "str"), ("type", "str"), ("access", "str"), ("doi", "str"), ("ee", "str"),
+                 ("url", "str"), ("volume", "str")]
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(text.lower())
+
+
+def search_enabled():
+    """文献搜索是否先查本地快照"""
+    return _search_enabled
+
+
+def set_search_enabled(enabled):
+    global _search_enabled
+    _search_enabled = bool(enabled)
+
+
+def _add_posting(postings, term, row):
+    rows = postings.get(term)
+    if rows is None:
+        rows = postings[term] = array("I")
+    if not rows or rows[-1] != row:  # 同一论文中重复出现的词只记一次
+        rows.append(row)
+
+
+def export_snapshot(store, path):
+    """
+    把本地记录库（dblp_store.LocalStore）导出为快照，返回论文数。
+    先扫描一遍建立作者、发表源和检索词的倒排表，再逐列从库中读出论文表写入文件；
+    写入临时文件后替换，已打开旧快照的进程不受影响。
+    """
+    authors = {}
+    venues = set()
+    terms = {}
+    rows = 0
+    for row, (title, names, venue, year) in enumerate(
+            store.iter_columns(("title", "authors", "venue", "year"), PAPER_ORDER)):
+        for name in names:
+            _add_posting(authors, name, row)
+        venues.add(venue)
+        for term in tokenize(f"{title} {' '.join(names)} {venue}"):
+            _add_posting(terms, term, row)
+        if year.isdigit():
+            _add_posting(terms, year, row)
+        rows = row + 1
+
+    author_names = sorted(authors)
+    author_ids = {name: i for i, name in enumerate(author_names)}
+    venue_names = sorted(venues)
+    venue_ids = {name: i for i, name in enumerate(venue_names)}
+    term_names = sorted(terms)
+
+    def paper_column(i):
+        column = PAPER_COLUMNS[i][0]
+        values = (value for value, in store.iter_columns((column,), PAPER_ORDER))
+        if column == "authors":
+            return ([author_ids[name] for name in names] for names in values)
+        if column == "venue":
+            return (venue_ids[venue] for venue in values)
+        return values
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    write_columnar(temp_path, {
+        "papers": (PAPER_COLUMNS, paper_column),
+        "authors": ([("name", "str"), ("papers", "ids")], ((name, authors[name]) for name in author_names)),
+        "venues": ([("name", "str")], [(name,) for name in venue_names]),
+        "terms": ([("term", "str"), ("papers", "ids")], ((term, terms[term]) for term in term_names)),
+    }, {"version": SNAPSHOT_VERSION, "release": store.get_meta("release"), "papers": rows})
+    os.replace(temp_path, path)
+    return rows
+
+
+class _PaperRecords:
+    """论文表的紧凑记录视图（RECORD_FIELDS 顺序，补充字段为空），作者和发表源在访问时从各自的表中取出"""
+
+    _NOT_ENRICHED = ("",) * len(ENRICHED_FIELDS)
+
+    def __init__(self, snapshot):
+        self._papers = snapshot.papers
+        self._author_names = snapshot.authors.column("name")
+        self._venue_names = snapshot.venues.column("name")
+        self._columns = [self._papers.column(name) for name, _ in PAPER_COLUMNS]
+
+    def __len__(self):
+        return len(self._papers)
+
+    def __getitem__(self, row):
+        key, title, authors, venue, pages, year, type_, access, doi, ee, url, volume = \
+            (column[row] for column in self._columns)
+        return (title, tuple(self._author_names[i] for i in authors), self._venue_names[venue], pages,
+                year, type_, access, key, doi, ee, url, volume) + self._NOT_ENRICHED
+
+
+class Snapshot:
+    """以只读内存映射方式打开的快照（可在多个线程中查询）"""
+
+    def __init__(self, path=SNAPSHOT_PATH):
+        self.path = path
+        self._file = ColumnarFile(path)
+        meta = self._file.meta or {}
+        if meta.get("version") != SNAPSHOT_VERSION or \
+                set(self._file.table_names()) != {"papers", "authors", "venues", "terms"}:
+            self._file.close()
+            raise ColumnarFormatError(f"{path} 不是版本 {SNAPSHOT_VERSION} 的快照")
+        self.release = meta.get("release")
+        self.papers = self._file.table("papers")
+        self.authors = self._file.table("authors")
+        self.venues = self._file.table("venues")
+        self.terms = self._file.table("terms")
+        self.records = _PaperRecords(self)
+
+    def __len__(self):
+        return len(self.papers)
+
+    def paper(self, row):
+        return record_to_paper(self.records[row])
+
+    def rows_papers(self, rows):
+        """按行号取论文（LazyPaperList，显示到哪一行才解码哪一行）"""
+        return LazyPaperList(_RowSubset(self.records, rows))
+
+    @staticmethod
+    def _lookup(column, value):
+        """在升序的字符串列中二分查找，返回行号或 None（只解码约 log2(n) 个值）"""
+        row = bisect_left(column, value)
+        return row if row < len(column) and column[row] == value else None
+
+    def _word_postings(self, word):
+        """
+        查询词对应的倒排表：以该词开头的各检索词的倒排表（检索词列升序，二分出以它开头的一段）；
+        这一段超过 PREFIX_TERMS 个检索词时只取完全相同的检索词。
+        """
+        term_column = self.terms.column("term")
+        postings_column = self.terms.column("papers")
+        start = bisect_left(term_column, word)
+        end = bisect_left(term_column, word[:-1] + chr(ord(word[-1]) + 1), start)
+        if end - start > PREFIX_TERMS:
+            end = start + 1 if term_column[start] == word else start
+        return [postings_column.view(row) for row in range(start, end)]
+
+    @staticmethod
+    def _contains(views, positions, candidate):
+        """candidate 是否在 views 的某个倒排表中（候选按升序检查，positions 记录各表已查到的位置）"""
+        for i, postings in enumerate(views):
+            position = positions[i] = bisect_left(postings, candidate, positions[i])
+            if position < len(postings) and postings[position] == candidate:
+                return True
+        return False
+
+    def search_rows(self, query, limit=None):
+        """
+        同时包含查询中全部词（按前缀匹配）的论文行号（升序，即从新到旧），最多 limit 个。
+        从论文最少的词开始逐个候选在其余词的倒排表中二分查找，找够 limit 个即停止，
+        长倒排表只有被查找到的几页会读入内存。
+        """
+        words = set(tokenize(query))
+        if not words:
+            return []
+        groups = []
+        try:
+            for word in words:
+                views = self._word_postings(word)
+                groups.append(views)
+                if not views:
+                    return []
+            groups.sort(key=lambda views: sum(map(len, views)))
+            first, others = groups[0], groups[1:]
+            # 只展开一个检索词时直接按倒排表顺序读取，否则合并成升序的行号列表
+            candidates = first[0] if len(first) == 1 else sorted(set().union(*first))
+            positions = [[0] * len(views) for views in others]
+            result = []
+            for candidate in candidates:
+                for views, group_positions in zip(others, positions):
+                    if not self._contains(views, group_positions, candidate):
+                        break
+                else:
+                    result.append(candidate)
+                    if limit is not None and len(result) >= limit:
+                        break
+            return result
+        finally:
+            for views in groups:
+                for view in views:
+                    view.release()
+
+    def search(self, query, limit=None):
+        """与 dblp 检索接口类似的文献搜索，返回论文序列（LazyPaperList）"""
+        return self.rows_papers(self.search_rows(query, limit))
+
+    def author_papers(self, name):
+        """作者（全名，区分大小写）的全部论文"""
+        row = self._lookup(self.authors.column("name"), name)
+        return self.rows_papers(self.authors.column("papers")[row] if row is not None else [])
+
+    def close(self):
+        self._file.close()
+
+
+class _RowSubset:
+    def __init__(self, records, rows):
+        self._records = records
+        self._rows = rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, i):
+        return self._records[self._rows[i]]
+
+
+_snapshot = None
+_snapshot_stamp = None  # 打开 _snapshot 时文件的 (inode, 大小, 修改时间)
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot():
+    """
+    返回全局共享的快照；快照文件不存在或无效时返回 None。
+    每次调用都检查文件，重新导出（文件被替换）后打开新的快照，无需重启。
+    旧快照不主动关闭：已显示的结果可能仍在按需解码，不再被引用时随对象回收。
+    """
+    global _snapshot, _snapshot_stamp
+    with _snapshot_lock:
+        try:
+            stat = os.stat(SNAPSHOT_PATH)
+        except OSError:
+            _snapshot = _snapshot_stamp = None
+            return None
+        stamp = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if stamp != _snapshot_stamp:
+            _snapshot = None
+            try:
+                _snapshot = Snapshot(SNAPSHOT_PATH)
+            except (OSError, ColumnarFormatError):
+                return None
+            _snapshot_stamp = stamp
+        return _snapshot
@@ -1,11 +1,18 @@
 from bs4 import BeautifulSoup, SoupStrainer
 import requests
+import os
 import re
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
+import time
+from dblp_searcher import dblp_trace
+from dblp_searcher.dblp_http import http_get
+
+# Semantic Scholar 接口地址，可用环境变量 S2_API_URL 改为本地替身服务
+S2_API_URL = os.environ.get("S2_API_URL", "https://api.semanticscholar.org").rstrip("/")
+# 作者主页/论文集/期卷页面的缓存有效期（秒，压缩存放在磁盘缓存中），整个会议重复统计时不必重新下载
+PAGE_CACHE_TTL = 24 * 3600
 
 # paper： 点击获取bibtex
-def get_bibtex_from_url(dblp_url):
+def get_bibtex_from_url(dblp_url, cancel_token=None):
     """
     根据 DBLP 文献条目的 URL 获取 BibTeX 信息
     例如输入: https://dblp.org/rec/conf/ciarp/RozendoRNNL23
@@ -13,10 +20,11 @@ def get_bibtex_from_url(dblp_url):
     """
     bibtex_url = f"{dblp_url}?view=bibtex"
     try:
-        response = requests.get(bibtex_url)
+        response = http_get(bibtex_url, cancel_token=cancel_token)
         response.raise_for_status()
         # soup = BeautifulSoup(response.text, "html.parser")
-        soup = BeautifulSoup(response.text, 'lxml')
+        with dblp_trace.span("parse.html", page="bibtex", bytes=len(response.content)):
+            soup = BeautifulSoup(response.text, 'lxml')
 
         # 找到 <div id="bibtex-section" class="section">
         bibtex_div = soup.find("div", id="bibtex-section")
@@ -33,9 +41,9 @@ def get_bibtex_from_url(dblp_url):
         return "请求错误"
 
 # paper： 点击获取摘要
-def get_abstract_by_doi(doi):
-    url = f"https://api.semanticscholar.org/graph/v1/paper/DOI:{doi}?fields=title,abstract,authors,year"
-    response = requests.get(url)
+def get_abstract_by_doi(doi, cancel_token=None):
+    url = f"{S2_API_URL}/graph/v1/paper/DOI:{doi}?fields=title,abstract,authors,year"
+    response = http_get(url, cancel_token=cancel_token)
     if response.status_code == 200:
         data = response.json()
         return data.get("abstract", "⚠️ 找不到摘要")
@@ -44,13 +52,14 @@ def get_abstract_by_doi(doi):
 
 # conference: 点击获取n年会议连接
 
-def get_dblp_conference_links(index_url):
+def get_dblp_conference_links(index_url, cancel_token=None):
     """
     从 dblp 会议 index 页面中提取最近 n 个会议年份的链接和名称。
 
     参数：
         index_url: str - 会议 index 页 URL，例如 https://dblp.org/db/conf/cvpr/index.html
         recent_n: int - 只返回最近的 n 个会议（按年份倒序）
+        cancel_token: CancelToken - 可选，用于取消请求
 
     返回：
         List[Tuple[会议名称, 会议链接]]
@@ -59,7 +68,7 @@ def get_dblp_conference_links(index_url):
         "User-Agent": "Mozilla/5.0"
     }
 
-    response = requests.get(index_url, headers=headers)
+    response = http_get(index_url, headers=headers, cancel_token=cancel_token)
     if response.status_code != 200:
         raise Exception(f"请求失败，状态码：{response.status_code}")
 
@@ -98,13 +107,14 @@ def get_dblp_conference_links(index_url):
     return [(name, link) for _, name, link in results]
 
 # conference: 点击获取n卷期刊连接
-def get_dblp_search_conference_links(index_url):
+def get_dblp_search_conference_links(index_url, cancel_token=None):
     """
     从 dblp 会议 index 页面中提取最近 n 个会议年份的链接和名称。
 
     参数：
         index_url: str - 会议 index 页 URL，例如 https://dblp.org/db/conf/cvpr/index.html
         recent_n: int - 只返回最近的 n 个会议（按年份倒序）
+        cancel_token: CancelToken - 可选，用于取消请求
 
     返回：
         List[Tuple[会议名称, 会议链接]]
@@ -113,12 +123,16 @@ def get_dblp_search_conference_links(index_url):
         "User-Agent": "Mozilla/5.0"
     }
 
-    response = requests.get(index_url, headers=headers)
+    response = http_get(index_url, headers=headers, cancel_token=cancel_token)
     if response.status_code != 200:
         raise Exception(f"请求失败，状态码：{response.status_code}")
+    return parse_conference_links(response.text, index_url)
 
-    # soup = BeautifulSoup(response.text, 'html.parser')
-    soup = BeautifulSoup(response.text, 'lxml')
+def parse_conference_links(html, index_url):
+    """解析会议 index 页面，返回按年份倒序的 [(会议名称, 会议链接)]；index_url 用于提取会议简称"""
+    # soup = BeautifulSoup(html, 'html.parser')
+    with dblp_trace.span("parse.html", page="conference_index", bytes=len(html)):
+        soup = BeautifulSoup(html, 'lxml')
 
     # 从 URL 提取会议简称（如 cvpr）
     match = re.search(r"/conf/([^/]+)/", index_url)
@@ -152,24 +166,29 @@ def get_dblp_search_conference_links(index_url):
     # 去掉年份，只返回 (name, link)
     return [(name, link) for _, name, link in results]
 
-def get_journal_volumes(index_url):
+def get_journal_volumes(index_url, cancel_token=None):
     """
     爬取dblp期刊主页中的期刊卷号和对应链接。
 
     参数：
         index_url: str - 期刊主页URL，如 https://dblp.org/db/journals/pami/index.html
         recent_n: int or None - 返回最近的n个卷号，默认返回全部
+        cancel_token: CancelToken - 可选，用于取消请求
 
     返回：
         List[(卷号字符串, 链接字符串)]，例如 [('Volume 47: 2025', 'https://dblp.org/db/journals/pami/pami47.html'), ...]
     """
     headers = {"User-Agent": "Mozilla/5.0"}
-    r = requests.get(index_url, headers=headers)
+    r = http_get(index_url, headers=headers, cancel_token=cancel_token)
     if r.status_code != 200:
         raise Exception(f"请求失败，状态码：{r.status_code}")
+    return parse_journal_volumes(r.text)
 
-    # soup = BeautifulSoup(r.text, 'html.parser')
-    soup = BeautifulSoup(r.text, 'lxml')
+def parse_journal_volumes(html):
+    """解析期刊主页，返回按卷号倒序的 [(卷号字符串, 链接)]"""
+    # soup = BeautifulSoup(html, 'html.parser')
+    with dblp_trace.span("parse.html", page="journal_index", bytes=len(html)):
+        soup = BeautifulSoup(html, 'lxml')
 
     volumes = []
     # 查找所有<li>标签下的<a>标签
@@ -195,18 +214,36 @@ def get_journal_volumes(index_url):
 
 # authors: 点击获取作者所有论文
 
-def crawl_dblp_profile(url):
+def crawl_dblp_profile(url, cancel_token=None):
+    """爬取作者/期卷页面中的全部论文，一次性返回完整列表"""
+    papers = []
+    for batch in iter_dblp_profile(url, cancel_token=cancel_token):
+        papers.extend(batch)
+    return papers
+
 
+def iter_dblp_profile(url, batch_size=200, cancel_token=None):
+    """
+    爬取作者/期卷页面中的论文，每解析出 batch_size 条就返回一批，
+    便于界面在整页解析完成前就开始显示结果。
+    """
     headers = {
         "User-Agent": "Mozilla/5.0",
         "Accept-Encoding": "gzip, deflate"
     }
 
-    response = requests.get(url, headers=headers)
+    response = http_get(url, headers=headers, cancel_token=cancel_token, cache_ttl=PAGE_CACHE_TTL)
     response.raise_for_status()
-    soup = BeautifulSoup(response.text, 'lxml',parse_only=SoupStrainer('ul', class_='publ-list'))
-    papers = []
+    yield from iter_profile_entries(response.text, batch_size, cancel_token)
+
+
+def iter_profile_entries(html, batch_size=200, cancel_token=None):
+    """解析作者/期卷页面的论文列表，每 batch_size 条返回一批"""
+    with dblp_trace.span("parse.html", page="profile", bytes=len(html)):
+        soup = BeautifulSoup(html, 'lxml',parse_only=SoupStrainer('ul', class_='publ-list'))
+    batch = []
     current_year = None
+    started = time.perf_counter()  # 生成器在 yield 处暂停，只统计本函数内提取条目的耗时
 
     for li in soup.find_all('li', class_='entry'):
         # 更新年份信息
@@ -217,70 +254,86 @@ def crawl_dblp_profile(url):
         # 只处理论文条目
         if 'class' in li.attrs and 'entry' in li['class']:
             try:
-                # 标题
-                title_tag = li.find('span', class_='title')
-                title = title_tag.text.strip() if title_tag else "N/A"
-
-                # 作者
-                author_tags = li.find_all('span', itemprop='author')
-                authors = [a.text.strip() for a in author_tags] if author_tags else []
-
-                # 发表 venue
-                venue_tag = li.find('span', class_='venue')
-                venue = venue_tag.text.strip() if venue_tag else "N/A"
-
-                # 页码
-                pages_tag = li.find('span', itemprop='pagination')
-                pages = pages_tag.text.strip() if pages_tag else "N/A"
-
-                # 类型
-                type_classes = li.get('class', [])
-                type_ = next((cls for cls in type_classes if cls != 'entry'), 'N/A')
-
-                # 访问权限
-                access = "open access" if li.find('img', alt='open access') else "N/A"
-
-                # dblp key
-                key = li.get('id', 'N/A')
-
-                # DOI 和电子版链接
-                doi = "N/A"
-                ee = "N/A"
-                for a_tag in li.find_all('a', href=True):
-                    href = a_tag['href']
-                    if href.startswith('https://doi.org/'):\
-                        doi = re.sub(r"https?://doi\.org/", "", href)
-                    elif 'electronic edition' in a_tag.text.lower():
-                        ee = href
-
-                # 详情页 URL
-                detail_tag = li.find('a', href=re.compile(r'/rec/'))
-                url = f"{detail_tag['href']}" if detail_tag else "N/A"
-
-                # 卷号
-                volume_tag = li.find('span', itemprop='volumeNumber')
-                volume = volume_tag.text.strip() if volume_tag else "N/A"
-
-                entry = {
-                    "title": title,
-                    "authors": authors,
-                    "venue": venue,
-                    "pages": pages,
-                    "year": current_year,
-                    "type": type_,
-                    "access": access,
-                    "key": key,
-                    "doi": doi,
-                    "ee": ee,
-                    "url": url,
-                    "volume": volume
-                }
-
-                papers.append(entry)
+                batch.append(_parse_profile_entry(li, current_year))
             except Exception as e:
                 print(f"Error parsing entry: {e}")
-
-    return papers
+            if len(batch) >= batch_size:
+                dblp_trace.record("parse.entries", started, count=len(batch))
+                yield batch
+                started = time.perf_counter()
+                batch = []
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+
+    if batch:
+        dblp_trace.record("parse.entries", started, count=len(batch))
+        yield batch
+
+
+def _parse_profile_entry(li, current_year):
+    """解析页面中的单条论文条目"""
+    # 标题
+    title_tag = li.find('span', class_='title')
+    title = title_tag.text.strip() if title_tag else "N/A"
+
+    # 作者
+    author_tags = li.find_all('span', itemprop='author')
+    authors = [a.text.strip() for a in author_tags] if author_tags else []
+
+    # 发表 venue
+    venue_tag = li.find('span', class_='venue')
+    venue = venue_tag.text.strip() if venue_tag else "N/A"
+
+    # 页码
+    pages_tag = li.find('span', itemprop='pagination')
+    pages = pages_tag.text.strip() if pages_tag else "N/A"
+
+    # 类型
+    type_classes = li.get('class', [])
+    type_ = next((cls for cls in type_classes if cls != 'entry'), 'N/A')
+
+    # 访问权限
+    access = "open access" if li.find('img', alt='open access') else "N/A"
+
+    # dblp key
+    key = li.get('id', 'N/A')
+
+    # DOI 和电子版链接
+    doi = "N/A"
+    ee = "N/A"
+    for a_tag in li.find_all('a', href=True):
+        href = a_tag['href']
+        if href.startswith('https://doi.org/'):\
+            doi = re.sub(r"https?://doi\.org/", "", href)
+        elif 'electronic edition' in a_tag.text.lower():
+            ee = href
+
+    # 详情页 URL
+    detail_tag = li.find('a', href=re.compile(r'/rec/'))
+    url = f"{detail_tag['href']}" if detail_tag else "N/A"
+
+    # 卷号
+    volume_tag = li.find('span', itemprop='volumeNumber')
+    volume = volume_tag.text.strip() if volume_tag else "N/A"
+
+    # 年份（条目自带的发表年份优先，页面中的年份分组标题作为后备）
+    year_tag = li.find('span', itemprop='datePublished')
+    year = year_tag.text.strip() if year_tag else current_year
+
+    return {
+        "title": title,
+        "authors": authors,
+        "venue": venue,
+        "pages": pages,
+        "year": year,
+        "type": type_,
+        "access": access,
+        "key": key,
+        "doi": doi,
+        "ee": ee,
+        "url": url,
+        "volume": volume
+    }
 
 
 def parse_dblp_entries(entries):
@@ -0,0 +1,280 @@
+"""
+本地 dblp 记录库：把 dblp 的 XML dump（https://dblp.org/xml/dblp.xml.gz，需与 dblp.dtd 放在同一目录）
+导入 SQLite，供离线查询和导出内存映射快照（dblp_snapshot）使用。
+
+    python -m dblp_searcher.dblp_store import dblp.xml.gz     # 导入（约七百万条，需要几十分钟）
+    python -m dblp_searcher.dblp_store update dblp.xml.gz     # 用新版 dump 增量更新（只改动变化的记录）
+    python -m dblp_searcher.dblp_store snapshot               # 导出快照，之后文献搜索直接查本地快照
+    python -m dblp_searcher.dblp_store info
+
+dump 用 lxml 的 iterparse 逐条解析，处理完的元素立即清除，内存占用与 dump 大小无关；
+记录的字段与 parse_publications 相同，另有 dblp 的修改日期 mdate。
+库中只有论文表（以 key 为主键）；按作者、检索词的离线查询由导出的快照提供。
+
+增量更新按 dblp key 与 mdate 比较新 dump 与库中的记录：mdate 相同的记录只读两个属性、不解析内容，
+新增和修改的记录写入，新 dump 中没有的记录删除。
+导入和更新都在一个事务中进行，中途出错、被中断或进程退出时自动回滚，库保持原样。
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+from dblp_searcher.dblp_api import DBLP_URL
+from dblp_searcher.dblp_columnar import LIST_SEPARATOR
+from dblp_searcher.dblp_records import PAPER_FIELDS
+
+# 本地记录库，可通过环境变量 DBLP_STORE_FILE 修改
+STORE_PATH = os.environ.get("DBLP_STORE_FILE") or \
+    os.path.join(os.path.expanduser("~"), ".dblp_viewer", "dblp.sqlite3")
+BATCH_SIZE = 10000  # 每批写入的记录数（也是进度回调的间隔）
+
+# dump 中的记录类型 -> 检索接口中的类型名（www 是作者主页记录，不导入）
+RECORD_TYPES = {
+    "article": "Journal Articles",
+    "inproceedings": "Conference and Workshop Papers",
+    "proceedings": "Editorship",
+    "book": "Books and Theses",
+    "incollection": "Parts in Books or Collections",
+    "phdthesis": "Books and Theses",
+    "mastersthesis": "Books and Theses",
+    "data": "Data and Artifacts",
+}
+INFORMAL_TYPE = "Informal and Other Publications"  # publtype="informal"（如 CoRR 预印本）
+
+STORE_COLUMNS = ("key", "mdate") + tuple(field for field in PAPER_FIELDS if field != "key")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS publications (
+    key TEXT PRIMARY KEY,
+    {", ".join(f"{column} TEXT" for column in STORE_COLUMNS[1:])}
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def _text(element):
+    return "".join(element.itertext()).strip() if element is not None else "N/A"
+
+
+def parse_record(element):
+    """把 dump 中的一条记录元素转换为论文 dict（parse_publications 的字段，外加 mdate）"""
+    key = element.get("key", "N/A")
+    type_ = RECORD_TYPES.get(element.tag, "N/A")
+    if element.get("publtype") == "informal" or key.startswith("journals/corr/"):
+        type_ = INFORMAL_TYPE
+    authors = [_text(child) for child in element.iterfind("author")] or \
+        [_text(child) for child in element.iterfind("editor")]
+    ee_elements = element.findall("ee")
+    doi = "N/A"
+    for ee in ee_elements:
+        link = _text(ee)
+        if link.startswith(("https://doi.org/", "http://doi.org/")):
+            doi = link.split("doi.org/", 1)[1]
+            break
+    venue = element.find("journal")
+    if venue is None:
+        venue = element.find("booktitle")
+    return {
+        "key": key,
+        "mdate": element.get("mdate", ""),
+        "title": _text(element.find("title")),
+        "authors": authors,
+        "venue": _text(venue),
+        "pages": _text(element.find("pages")),
+        "year": _text(element.find("year")),
+        "type": type_,
+        "access": "open" if any(ee.get("type") == "oa" for ee in ee_elements) else "closed",
+        "doi": doi,
+        "ee": _text(ee_elements[0]) if ee_elements else "N/A",
+        "url": f"{DBLP_URL}/rec/{key}",
+        "volume": _text(element.find("volume")),
+    }
+
+
+def iter_dump_elements(path):
+    """
+    逐条返回 dump 中的记录元素，调用方处理完（取下一条）后清除。
+    path 可以是 .xml 或 .xml.gz；dump 中的字符实体定义在 dblp.dtd 中，需放在同一目录。
+    """
+    from lxml import etree  # 只有导入 dump 时才需要
+
+    for _, element in etree.iterparse(path, events=("end",), tag=tuple(RECORD_TYPES),
+                                      load_dtd=True, resolve_entities=True, huge_tree=True):
+        yield element
+        element.clear()
+        while element.getprevious() is not None:  # 已处理的兄弟元素仍挂在根元素下，一并删除
+            del element.getparent()[0]
+
+
+def iter_dump(path):
+    """逐条返回 dump 中的记录（parse_record 的结果）"""
+    return map(parse_record, iter_dump_elements(path))
+
+
+def _row(paper):
+    return tuple(LIST_SEPARATOR.join(paper["authors"]) if column == "authors" else paper.get(column, "N/A")
+                 for column in STORE_COLUMNS)
+
+
+def _paper(row):
+    paper = dict(zip(STORE_COLUMNS, row))
+    paper["authors"] = paper["authors"].split(LIST_SEPARATOR) if paper["authors"] else []
+    return paper
+
+
+class LocalStore:
+    """SQLite 中的本地记录库（每个线程各自打开一个实例）"""
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM publications").fetchone()[0]
+
+    def get_meta(self, name, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, name, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (name, str(value)))
+
+    def get(self, key):
+        row = self.conn.execute(f"SELECT {', '.join(STORE_COLUMNS)} FROM publications WHERE key = ?",
+                                (key,)).fetchone()
+        return _paper(row) if row else None
+
+    _INSERT = f"INSERT OR REPLACE INTO publications VALUES ({', '.join('?' * len(STORE_COLUMNS))})"
+
+    def _finish_release(self, dump_path):
+        self._set_meta("release", os.path.basename(dump_path))
+        self._set_meta("imported", time.strftime("%Y-%m-%d %H:%M:%S"))
+
+    def import_dump(self, dump_path, progress=None):
+        """
+        用 dump 替换库中的全部记录（一个事务，中途失败时保留原有内容），返回导入的条数。
+        progress(条数) 每写入一批调用一次。
+        """
+        count = 0
+        with self.conn:
+            self.conn.execute("DELETE FROM publications")
+            batch = []
+            for paper in iter_dump(dump_path):
+                batch.append(_row(paper))
+                if len(batch) >= BATCH_SIZE:
+                    self.conn.executemany(self._INSERT, batch)
+                    count += len(batch)
+                    batch = []
+                    if progress:
+                        progress(count)
+            self.conn.executemany(self._INSERT, batch)
+            count += len(batch)
+            self._finish_release(dump_path)
+        return count
+
+    def update_from_dump(self, dump_path, progress=None):
+        """
+        用新版 dump 增量更新（一个事务，中途失败或被中断时回滚），
+        返回 {"records", "inserted", "changed", "deleted", "unchanged"}（records 为新 dump 的记录数）。
+        progress(已读条数) 每读一批调用一次。
+        """
+        counts = {"records": 0, "inserted": 0, "changed": 0, "deleted": 0, "unchanged": 0}
+        with self.conn:
+            self.conn.execute("BEGIN")
+            # 新 dump 中出现的 key，最后据此找出已删除的记录（临时表在磁盘上，不占内存）
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS dump_keys (key TEXT PRIMARY KEY) WITHOUT ROWID")
+            self.conn.execute("DELETE FROM dump_keys")
+            keys = []
+            for element in iter_dump_elements(dump_path):
+                key = element.get("key", "N/A")
+                keys.append((key,))
+                old = self.conn.execute("SELECT mdate FROM publications WHERE key = ?", (key,)).fetchone()
+                if old is not None and old[0] == element.get("mdate", ""):
+                    counts["unchanged"] += 1
+                else:
+                    counts["inserted" if old is None else "changed"] += 1
+                    self.conn.execute(self._INSERT, _row(parse_record(element)))
+                if len(keys) >= BATCH_SIZE:
+                    self.conn.executemany("INSERT OR IGNORE INTO dump_keys VALUES (?)", keys)
+                    counts["records"] += len(keys)
+                    keys = []
+                    if progress:
+                        progress(counts["records"])
+            self.conn.executemany("INSERT OR IGNORE INTO dump_keys VALUES (?)", keys)
+            counts["records"] += len(keys)
+
+            counts["deleted"] = self.conn.execute("DELETE FROM publications "
+                                                  "WHERE key NOT IN (SELECT key FROM dump_keys)").rowcount
+            self.conn.execute("DELETE FROM dump_keys")
+            self._finish_release(dump_path)
+        return counts
+
+    def iter_columns(self, columns, order=None):
+        """按 order（SQL 排序表达式）逐行返回若干列的值组成的元组，作者列为列表"""
+        cursor = self.conn.execute(f"SELECT {', '.join(columns)} FROM publications"
+                                   + (f" ORDER BY {order}" if order else ""))
+        if "authors" not in columns:
+            return cursor
+        i = columns.index("authors")
+        return (row[:i] + (row[i].split(LIST_SEPARATOR) if row[i] else [],) + row[i + 1:] for row in cursor)
+
+    def iter_papers(self, order=None):
+        cursor = self.conn.execute(f"SELECT {', '.join(STORE_COLUMNS)} FROM publications"
+                                   + (f" ORDER BY {order}" if order else ""))
+        return map(_paper, cursor)
+
+
+def main(argv=None):
+    from dblp_searcher.dblp_snapshot import SNAPSHOT_PATH, export_snapshot
+
+    parser = argparse.ArgumentParser(prog="python -m dblp_searcher.dblp_store",
+                                     description="导入 dblp 的 XML dump 到本地记录库，或导出内存映射快照")
+    parser.add_argument("command", choices=("import", "update", "snapshot", "info"),
+                        help="import: 导入 dump; update: 用新版 dump 增量更新; snapshot: 导出快照; "
+                             "info: 条数与 dump 版本")
+    parser.add_argument("dump", nargs="?", help="import/update 时为 dblp.xml 或 dblp.xml.gz 的路径")
+    parser.add_argument("--store", default=STORE_PATH, help=f"记录库路径（默认 {STORE_PATH}）")
+    parser.add_argument("-o", "--output", default=SNAPSHOT_PATH, help=f"快照路径（默认 {SNAPSHOT_PATH}）")
+    args = parser.parse_args(argv)
+
+    store = LocalStore(args.store)
+    start = time.perf_counter()
+    if args.command in ("import", "update") and not args.dump:
+        parser.error(f"{args.command} 需要指定 dump 文件")
+    if args.command == "import":
+        count = store.import_dump(args.dump, progress=lambda n: print(f"\r已导入 {n} 条", end="", flush=True))
+        elapsed = time.perf_counter() - start
+        print(f"\r导入 {count} 条，用时 {elapsed:.1f} 秒（{count / max(elapsed, 1e-9):.0f} 条/秒）")
+    elif args.command == "update":
+        try:
+            counts = store.update_from_dump(args.dump,
+                                            progress=lambda n: print(f"\r已比较 {n} 条", end="", flush=True))
+        except KeyboardInterrupt:
+            print("\r已中断，库已回滚到更新前的状态")
+            store.close()
+            sys.exit(130)
+        elapsed = time.perf_counter() - start
+        print(f"\r比较 {counts['records']} 条，用时 {elapsed:.1f} 秒（{counts['records'] / max(elapsed, 1e-9):.0f} 条/秒）："
+              f"新增 {counts['inserted']}，修改 {counts['changed']}，删除 {counts['deleted']}，"
+              f"未变 {counts['unchanged']}")
+    elif args.command == "snapshot":
+        count = export_snapshot(store, args.output)
+        size = os.path.getsize(args.output)
+        print(f"导出 {count} 条到 {args.output}（{size / 2 ** 20:.1f} MB），用时 {time.perf_counter() - start:.1f} 秒")
+    else:
+        print(f"{len(store)} 条（dump {store.get_meta('release', '无')}，导入于 {store.get_meta('imported', '-')}）")
+    if args.command in ("import", "update") and os.path.exists(args.output):
+        count = export_snapshot(store, args.output)  # 已有快照时一并更新
+        print(f"已重新导出快照（{count} 条），用时 {time.perf_counter() - start:.1f} 秒")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import json
+import re
+import threading
+from bisect import bisect_left, insort
+
+from dblp_searcher.dblp_cache import get_cache
+from dblp_searcher.dblp_json2dic import parse_authors, parse_venues
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class SuggestionIndex:
+    """
+    本地输入提示索引（期刊/会议或作者）。
+
+    每个条目按若干“提示键”登记到有序列表中：完整名称、缩写、名称中的每个词。
+    前缀查询用二分查找定位，不需要访问网络。可在后台线程中写入。
+    """
+
+    def __init__(self, kind):
+        self.kind = kind          # "venue" 或 "author"
+        self._entries = {}        # 条目标识 -> 条目 dict
+        self._keys = []           # 有序的 (提示键, 权重, 条目标识)
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, entries):
+        """登记一批条目（parse_venues / parse_authors 的结果）"""
+        with self._lock:
+            for entry in entries:
+                entry_id = entry.get("url") or self.display(entry)
+                if entry_id in self._entries:
+                    continue
+                self._entries[entry_id] = entry
+                for key, weight in self._suggest_keys(entry):
+                    insort(self._keys, (key, weight, entry_id))
+
+    def _suggest_keys(self, entry):
+        """返回 (提示键, 权重)；权重越小排名越靠前"""
+        if self.kind == "venue":
+            acronym = entry.get("acronym", "N/A")
+            name = entry.get("venue", "N/A")
+            if acronym and acronym != "N/A":
+                yield acronym.lower(), 0
+        else:
+            name = entry.get("author", "N/A")
+        if name and name != "N/A":
+            yield name.lower(), 1
+            for word in set(_WORD_RE.findall(name.lower())):
+                yield word, 2
+
+    def suggest(self, prefix, limit=10):
+        """按前缀返回最多 limit 个条目（缩写匹配优先，其次是名称/词匹配）"""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        with self._lock:
+            i = bisect_left(self._keys, (prefix,))
+            matches = {}
+            while i < len(self._keys) and self._keys[i][0].startswith(prefix):
+                key, weight, entry_id = self._keys[i]
+                rank = (weight, len(key))
+                if entry_id not in matches or rank < matches[entry_id]:
+                    matches[entry_id] = rank
+                i += 1
+            ranked = sorted(matches.items(), key=lambda item: item[1])[:limit]
+            return [self._entries[entry_id] for entry_id, _ in ranked]
+
+    def display(self, entry):
+        """条目在提示列表中的显示文字"""
+        if self.kind == "venue":
+            return f"{entry.get('acronym', 'N/A')} | {entry.get('venue', 'N/A')}"
+        return entry.get("author", "N/A")
+
+    def search_term(self, entry):
+        """选中提示后用于搜索的关键词"""
+        if self.kind == "venue":
+            acronym = entry.get("acronym", "N/A")
+            return acronym if acronym and acronym != "N/A" else entry.get("venue", "")
+        return entry.get("author", "")
+
+    def load_from_cache(self, cache=None):
+        """从磁盘缓存中的历史搜索响应构建索引"""
+        cache = cache or get_cache()
+        marker = "/search/venue/api" if self.kind == "venue" else "/search/author/api"
+        parse = parse_venues if self.kind == "venue" else parse_authors
+        for _, body in cache.items(lambda key: marker in key):
+            try:
+                self.add(parse(json.loads(body.decode("utf-8"))))
+            except ValueError:
+                continue
+        self.loaded = True
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_suggestion_index(kind):
+    """返回某类（"venue" / "author"）的全局提示索引"""
+    with _indexes_lock:
+        if kind not in _indexes:
+            _indexes[kind] = SuggestionIndex(kind)
+        return _indexes[kind]
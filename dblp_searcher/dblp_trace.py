@@ -0,0 +1,229 @@
+"""
+分阶段计时：记录一次操作中网络、解码、解析、表格填充和渲染各阶段的耗时（span）。
+
+默认关闭，关闭时 span() 返回一个什么都不做的共享对象，开销只有一次函数调用。
+设置环境变量 DBLP_TRACE=1 或调用 enable() 后开始记录：
+- 最近 RING_SIZE 条记录保存在内存环形缓冲中，供界面的性能面板统计 p50/p95；
+- 设置 DBLP_TRACE_FILE=路径（或 enable(路径)）时，每条记录同时以一行 JSON 追加到该文件。
+
+span 名称的第一段是阶段（见 STAGES），如 net.request、parse.html、model.append。
+一次用户操作（如一次搜索）对应一个 Operation：后台任务运行时和界面线程处理该任务的结果时
+都用 bind() 把它绑定到当前线程，期间记录的 span 都归到这次操作下。
+"""
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+RING_SIZE = 5000
+STAGES = ("net", "decode", "parse", "model", "render")
+
+_enabled = False
+_ring = deque(maxlen=RING_SIZE)
+_lock = threading.Lock()
+_file = None
+_local = threading.local()
+_operation_ids = itertools.count(1)
+
+
+def enabled():
+    return _enabled
+
+
+def enable(path=None):
+    """开始记录；path 不为空时同时把记录追加写入该 JSON 行文件"""
+    global _enabled, _file
+    with _lock:
+        if path and _file is None:
+            _file = open(path, "a", encoding="utf-8", buffering=1)
+        _enabled = True
+
+
+def disable():
+    """停止记录并关闭 JSON 行文件（已记录的内容保留在环形缓冲中）"""
+    global _enabled, _file
+    with _lock:
+        _enabled = False
+        if _file is not None:
+            _file.close()
+            _file = None
+
+
+def clear():
+    with _lock:
+        _ring.clear()
+
+
+def spans():
+    """环形缓冲中的全部记录（旧的在前）"""
+    with _lock:
+        return list(_ring)
+
+
+class Operation:
+    """一次用户操作（通常对应一个后台任务），由 new_operation() 创建"""
+    __slots__ = ("id", "name", "start")
+
+    def __init__(self, name):
+        self.id = next(_operation_ids)
+        self.name = name
+        self.start = time.perf_counter()
+
+
+def new_operation(name):
+    """开始一次操作；未启用时返回 None（后续 bind/finish_operation 均不做任何事）"""
+    return Operation(name) if _enabled else None
+
+
+def current_operation():
+    return getattr(_local, "operation", None)
+
+
+def finish_operation(operation, status="finished"):
+    """记录操作从开始到现在的总耗时（名称为 op），status 为 finished / failed / cancelled"""
+    if operation is not None and _enabled:
+        _record("op", operation.start, operation, {"status": status})
+
+
+class _Null:
+    """未启用时 span() / bind() 返回的空对象"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL = _Null()
+
+
+class _Span:
+    __slots__ = ("name", "attrs", "operation", "start")
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.operation = current_operation()
+        self.start = time.perf_counter()
+        return self
+
+    def set(self, **attrs):
+        """补充属性（如解析出的条数），在 with 块结束时一起记录"""
+        self.attrs.update(attrs)
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        _record(self.name, self.start, self.operation, self.attrs)
+        return False
+
+
+class _Bind:
+    __slots__ = ("operation", "previous")
+
+    def __init__(self, operation):
+        self.operation = operation
+
+    def __enter__(self):
+        self.previous = current_operation()
+        _local.operation = self.operation
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _local.operation = self.previous
+        return False
+
+
+def span(name, **attrs):
+    """
+    计时上下文：with span("parse.html", bytes=n) as s: ...
+    s.set(...) 可在结束前补充属性；抛出异常时记录异常类型。
+    """
+    if not _enabled:
+        return _NULL
+    return _Span(name, attrs)
+
+
+def bind(operation):
+    """在 with 块内把 operation 设为当前线程的操作"""
+    if operation is None:
+        return _NULL
+    return _Bind(operation)
+
+
+def record(name, start, **attrs):
+    """记录从 start（time.perf_counter() 的值）到现在的耗时，用于不便使用 with 的地方（如生成器）"""
+    if _enabled:
+        _record(name, start, current_operation(), attrs)
+
+
+def _record(name, start, operation, attrs):
+    elapsed = time.perf_counter() - start
+    entry = {"name": name, "ms": round(elapsed * 1000, 3), "time": round(time.time() - elapsed, 3),
+             "thread": threading.current_thread().name}
+    if operation is not None:
+        entry["op"] = operation.id
+        entry["op_name"] = operation.name
+    entry.update(attrs)
+    with _lock:
+        _ring.append(entry)
+        if _file is not None:
+            _file.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+
+def stage(name):
+    """span 名称所属的阶段（名称的第一段）"""
+    return name.split(".", 1)[0]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def summary(entries=None):
+    """
+    按名称统计耗时：{名称: {"count", "p50_ms", "p95_ms", "total_ms"}}。
+    操作的总耗时按操作名统计，名称为 "op:操作名"。
+    """
+    groups = {}
+    for entry in spans() if entries is None else entries:
+        name = f"op:{entry.get('op_name')}" if entry["name"] == "op" else entry["name"]
+        groups.setdefault(name, []).append(entry["ms"])
+    return {name: {"count": len(values), "p50_ms": percentile(values, 50), "p95_ms": percentile(values, 95),
+                   "total_ms": sum(values)}
+            for name, values in sorted(groups.items())}
+
+
+def operations(entries=None, limit=20):
+    """
+    最近 limit 次已结束的操作（新的在前）：
+    [{"id", "name", "ms", "status", "stages": {阶段: 毫秒}}]，stages 是该操作下各阶段 span 的耗时之和。
+    """
+    entries = spans() if entries is None else entries
+    stages = {}
+    for entry in entries:
+        if "op" in entry and entry["name"] != "op":
+            totals = stages.setdefault(entry["op"], {})
+            key = stage(entry["name"])
+            totals[key] = totals.get(key, 0) + entry["ms"]
+    result = []
+    for entry in reversed(entries):
+        if entry["name"] == "op":
+            result.append({"id": entry["op"], "name": entry["op_name"], "ms": entry["ms"],
+                           "status": entry.get("status"), "stages": stages.get(entry["op"], {})})
+            if len(result) >= limit:
+                break
+    return result
+
+
+if os.environ.get("DBLP_TRACE") or os.environ.get("DBLP_TRACE_FILE"):
+    enable(os.environ.get("DBLP_TRACE_FILE"))
@@ -1,10 +1,12 @@
-import asyncio
-import aiohttp
 import hashlib
+import os
 import random
-import requests
+from dblp_searcher.dblp_http import http_get
 
-def baidu_translate(text, from_lang='auto', to_lang='zh'):
+# 百度翻译接口地址，可用环境变量 BAIDU_TRANSLATE_URL 改为本地替身服务
+BAIDU_TRANSLATE_URL = os.environ.get("BAIDU_TRANSLATE_URL", 'http://api.fanyi.baidu.com/api/trans/vip/translate')
+
+def baidu_translate(text, from_lang='auto', to_lang='zh', cancel_token=None):
     """调用百度翻译 API 进行翻译"""
     appid = ''  # 替换为你的 APP ID
     secret_key = ''  # 替换为你的密钥
@@ -15,7 +17,7 @@ def baidu_translate(text, from_lang='auto', to_lang='zh'):
     sign = hashlib.md5(sign.encode()).hexdigest()
 
     # 发送请求
-    url = 'http://api.fanyi.baidu.com/api/trans/vip/translate'
+    url = BAIDU_TRANSLATE_URL
     params = {
         'q': text,
         'from': from_lang,
@@ -25,7 +27,7 @@ def baidu_translate(text, from_lang='auto', to_lang='zh'):
         'sign': sign
     }
 
-    response = requests.get(url, params=params)
+    response = http_get(url, params=params, cancel_token=cancel_token)
     result = response.json()
 
     # 处理结果
@@ -0,0 +1,103 @@
+"""
+期刊/会议的整体统计：每年论文数、每年作者数、篇均作者数、高产作者、开放获取比例。
+
+VenueStats 保存的是累计量（计数器和每年的作者集合），各卷论文解析出一批就 add() 一批，
+更新只与这批论文的条数有关，不需要重新扫描已统计的论文；summary() 从累计量生成展示用的结果。
+统计结果连同已统计的卷按会议/期刊缓存到磁盘，再次打开时直接显示，只需补统计新增的卷。
+"""
+import json
+from collections import Counter
+
+from dblp_searcher.dblp_cache import get_cache
+from dblp_searcher.dblp_index import OPEN_ACCESS_VALUES
+
+TOP_AUTHORS = 20
+SKIPPED_TYPES = ("editor",)  # 论文集本身的条目（作者为编者），不计入统计
+
+
+class VenueStats:
+    """一个期刊/会议的累计统计"""
+
+    def __init__(self, venue_url):
+        self.venue_url = venue_url
+        self.volumes = set()          # 已完整统计的卷（链接）
+        self.papers = 0
+        self.author_slots = 0         # 各论文作者数之和
+        self.open_access = 0
+        self.papers_per_year = Counter()
+        self.authors_per_year = {}    # 年份 -> 作者集合
+        self.author_papers = Counter()  # 作者 -> 论文数
+
+    def add(self, papers):
+        """累加一批论文"""
+        for paper in papers:
+            if paper.get("type") in SKIPPED_TYPES:
+                continue
+            year = str(paper.get("year") or "N/A")
+            authors = paper.get("authors") or []
+            self.papers += 1
+            self.author_slots += len(authors)
+            if paper.get("access") in OPEN_ACCESS_VALUES:
+                self.open_access += 1
+            self.papers_per_year[year] += 1
+            self.authors_per_year.setdefault(year, set()).update(authors)
+            self.author_papers.update(authors)
+
+    def summary(self, top=TOP_AUTHORS):
+        """展示用的统计结果（可直接转成 JSON）"""
+        years = sorted(self.papers_per_year, reverse=True)
+        return {
+            "venue_url": self.venue_url,
+            "volumes": len(self.volumes),
+            "papers": self.papers,
+            "authors": len(self.author_papers),
+            "avg_authors": self.author_slots / self.papers if self.papers else 0.0,
+            "open_access": self.open_access / self.papers if self.papers else 0.0,
+            "years": [(year, self.papers_per_year[year], len(self.authors_per_year.get(year, ())))
+                      for year in years],
+            "top_authors": self.author_papers.most_common(top),
+        }
+
+    def to_json(self):
+        return json.dumps({
+            "venue_url": self.venue_url,
+            "volumes": sorted(self.volumes),
+            "papers": self.papers,
+            "author_slots": self.author_slots,
+            "open_access": self.open_access,
+            "papers_per_year": self.papers_per_year,
+            "authors_per_year": {year: sorted(authors) for year, authors in self.authors_per_year.items()},
+            "author_papers": self.author_papers,
+        }, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        stats = cls(data["venue_url"])
+        stats.volumes = set(data["volumes"])
+        stats.papers = data["papers"]
+        stats.author_slots = data["author_slots"]
+        stats.open_access = data["open_access"]
+        stats.papers_per_year = Counter(data["papers_per_year"])
+        stats.authors_per_year = {year: set(authors) for year, authors in data["authors_per_year"].items()}
+        stats.author_papers = Counter(data["author_papers"])
+        return stats
+
+
+def _cache_key(venue_url):
+    return f"venue_stats:{venue_url}"
+
+
+def load_stats(venue_url):
+    """读取缓存的统计，没有时返回空统计"""
+    data = get_cache().get(_cache_key(venue_url))
+    if data is not None:
+        try:
+            return VenueStats.from_json(data.decode("utf-8"))
+        except (ValueError, KeyError):
+            pass  # 格式不对的旧缓存当作没有
+    return VenueStats(venue_url)
+
+
+def save_stats(stats):
+    get_cache().set(_cache_key(stats.venue_url), stats.to_json().encode("utf-8"))
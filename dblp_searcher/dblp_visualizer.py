@@ -3,28 +3,6 @@ import re
 import sys
 from collections import Counter
 from wordcloud import WordCloud
-from PIL import Image
-
-def compress_image_before_loading(wc_path, max_width=1000):
-    """使用Pillow压缩图片，降低内存占用"""
-    try:
-        img = Image.open(wc_path)
-        width, height = img.size
-
-        # 计算缩放比例
-        if width > max_width:
-            scale = max_width / width
-            new_size = (int(width * scale), int(height * scale))
-            img = img.resize(new_size, Image.LANCZOS)  # 高质量缩放
-
-            # 保存临时压缩图
-            temp_path = os.path.splitext(wc_path)[0] + "_temp.jpg"
-            img.save(temp_path, "JPEG", quality=85)  # 质量可调整
-            return temp_path
-        return wc_path
-    except Exception as e:
-        # print(f"图片压缩失败：{str(e)}")
-        return wc_path
 
 def generate_wordcloud(text, output_path="assets/wordcloud.png", max_words=300, chunk_size=5000):
     """
@@ -102,8 +80,7 @@ def generate_wordcloud(text, output_path="assets/wordcloud.png", max_words=300,
 
         # print(f"词云生成成功，已保存至: {output_path}")
 
-        output_path = compress_image_before_loading(output_path)
-
+        # 界面按显示区域的大小解码（ImageLoaderWorker），不需要另存压缩图
         return output_path
 
     except Exception as e:
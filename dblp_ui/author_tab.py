@@ -1,13 +1,15 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
-                             QPushButton, QTableWidgetItem, QLabel,
-                             QMessageBox, QListWidget, QSplitter)
+from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QLineEdit,
+                             QPushButton, QLabel,
+                             QMessageBox, QListWidget, QSplitter, QCheckBox)
 from PyQt5.QtCore import Qt
-from dblp_searcher.dblp_visualizer import generate_wordcloud
-from dblp_ui.base_tab import BaseTab, ImageLoaderWorker, BaseTableWidget
-from dblp_ui.base_workers import AuthorSearchWorker, AuthorPaperWorker
+from dblp_ui.base_tab import BaseTab, BaseTableWidget
+from dblp_ui.base_workers import author_search_task, profile_papers_task
 
 
 class AuthorTab(BaseTab):
+    SESSION_LISTS = ("author_list",)
+    SESSION_ATTRS = ("current_author_url",)
+
     def __init__(self):
         super().__init__()
         self.current_author_url = None  # 记录当前选中作者的DBLP链接
@@ -23,9 +25,13 @@ class AuthorTab(BaseTab):
         self.keyword_input = QLineEdit()
         self.keyword_input.setPlaceholderText("输入作者关键词（如：leskovec）")
         self.search_btn = QPushButton("搜索作者")
+        self.live_search_check = QCheckBox("输入即搜")  # 输入停顿后自动搜索
+        search_layout.addWidget(self.back_btn)  # 结果集历史：后退/前进
+        search_layout.addWidget(self.forward_btn)
         search_layout.addWidget(QLabel("作者关键词："))
         search_layout.addWidget(self.keyword_input)
         search_layout.addWidget(self.search_btn)
+        search_layout.addWidget(self.live_search_check)
         
         # 作者列表展示（用于用户选择）
         self.author_list = QListWidget()
@@ -34,23 +40,26 @@ class AuthorTab(BaseTab):
 
 
         # 论文结果展示表格（与文献页签结构一致）
-        self.paper_table = BaseTableWidget()
-        self.paper_table.resizeColumnsToContents()
-        self.paper_table.setColumnCount(4)
-        self.paper_table.setHorizontalHeaderLabels([
-            "标题", "作者", "DOI", "操作"
+        self.paper_table = BaseTableWidget([
+            ("标题", "title"), ("作者", "authors"), ("DOI", "doi"), ("引用", "citations"), ("操作", None)
         ])
+        self.paper_table.resizeColumnsToContents()
         self.paper_table.setColumnWidth(0, 800)
         self.paper_table.setColumnWidth(1, 100)
         self.paper_table.setColumnWidth(2, 100)
-        self.paper_table.setColumnWidth(3, 200)
+        self.paper_table.setColumnWidth(3, 60)
+        self.paper_table.setColumnWidth(4, 200)
         
+        # 已加载结果的过滤栏
+        self.filter_bar = self.paper_table.create_filter_bar()
+
         # 词云展示区
         self.stats_label = QLabel()
 
         splitter = QSplitter(Qt.Vertical)
         splitter.addWidget(self.author_list)  # 下部分为统计标签
         splitter.addWidget(self.progress_bar)  # 下部分为统计标签
+        splitter.addWidget(self.filter_bar)  # 过滤栏
         splitter.addWidget(self.paper_table)  # 上部分为论文表格
         splitter.addWidget(self.stats_label)  # 下部分为统计标签
         splitter.setChildrenCollapsible(False)  # 禁止折叠子部件
@@ -62,9 +71,15 @@ class AuthorTab(BaseTab):
 
     def init_signals(self):
         """初始化信号连接"""
+        # 表格操作列的按钮点击
+        self.paper_table.bibtex_requested.connect(self.get_bibtex)
+        self.paper_table.abstract_requested.connect(self.get_abstract)
+        self.paper_table.papers_updated.connect(self.update_history_papers)  # 补充的引用数同步到历史
         self.search_btn.clicked.connect(self.start_author_search)
         # 添加回车键触发搜索
         self.keyword_input.returnPressed.connect(self.start_author_search)
+        # 输入提示（本地索引 + 防抖后的远程前缀查询）
+        self.init_suggestions("author", self.start_author_search)
         self.author_list.itemClicked.connect(self.on_author_selected)
 
     def start_author_search(self):
@@ -76,19 +91,19 @@ class AuthorTab(BaseTab):
             
         self.progress_bar.show()
         self.author_list.clear()  # 清空旧作者列表
-        self.paper_table.setRowCount(0)  # 清空旧论文数据
+        self.cancel_task("papers")  # 取消进行中的论文获取
+        self.paper_table.clear_papers()  # 清空旧论文数据
         
-        # 启动作者搜索线程
-        self.author_worker = AuthorSearchWorker(keyword)
-        self.author_worker.search_finished.connect(self.handle_author_result)
-        self.author_worker.search_failed.connect(self.handle_search_error)
-        self.author_worker.start()
+        # 在后台执行作者搜索
+        handle = self.run_task("authors", author_search_task, keyword, error_msg="作者搜索失败")
+        handle.finished.connect(self.handle_author_result)
 
     def handle_author_result(self, authors):
         """处理作者搜索结果（展示作者列表供选择）"""
         self.progress_bar.hide()
         if not authors:
-            QMessageBox.information(self, "提示", "未找到相关作者")
+            if not self.live_search_check.isChecked():  # 输入即搜时不弹窗打断输入
+                QMessageBox.information(self, "提示", "未找到相关作者")
             return
         # 填充作者列表（显示姓名+机构）
         for author in authors:
@@ -104,55 +119,22 @@ class AuthorTab(BaseTab):
             return
             
         self.progress_bar.show()
-        self.paper_table.setRowCount(0)  # 清空旧论文数据
+        self.paper_table.begin_loading()  # 清空旧数据，准备流式填充
         
-        # 启动论文获取线程
-        self.paper_worker = AuthorPaperWorker(self.current_author_url)
-        self.paper_worker.papers_fetched.connect(self.handle_paper_result)
-        self.paper_worker.fetch_failed.connect(self.handle_search_error)
-        self.paper_worker.start()
+        self.history_label = item.text()  # 结果返回后以此名称记入历史
+        # 在后台获取论文（切换作者会取消上一次获取）
+        handle = self.run_task("papers", profile_papers_task, self.current_author_url, error_msg="论文获取失败")
+        handle.batch_ready.connect(self.paper_table.append_papers)
+        handle.finished.connect(self.handle_paper_result)
 
     def handle_paper_result(self, papers):
         """处理论文获取结果（填充表格+生成词云）"""
         self.progress_bar.hide()
+        self.paper_table.finish_loading()  # 剩余行入表并恢复排序
         if not papers:
             QMessageBox.information(self, "提示", "该作者无论文记录")
             return
-            
-        # 填充论文表格（与文献页签逻辑一致）
-        self.paper_table.setRowCount(len(papers))
-        for row, paper in enumerate(papers):
-            self.paper_table.setItem(row, 0, QTableWidgetItem(paper['title']))
-            self.paper_table.setItem(row, 1, QTableWidgetItem(", ".join(paper['authors'])))
-            self.paper_table.setItem(row, 2, QTableWidgetItem(paper['doi']))
-            # ... 其他字段填充
-            
-            # 添加操作按钮（与文献页签逻辑一致）
-            op_layout = QHBoxLayout()
-            bib_btn = QPushButton("BibTeX")
-            bib_btn.setMinimumHeight(20)  # 设置最小高度
-
-            bib_btn.clicked.connect(lambda _, url=paper['url']: self.get_bibtex(url))
-            abstract_btn = QPushButton("摘要")
-            abstract_btn.setMinimumHeight(20)  # 设置最小高度
-
-            abstract_btn.clicked.connect(lambda _, doi=paper['doi']: self.get_abstract(doi))
-            op_layout.addWidget(bib_btn)
-            op_layout.addWidget(abstract_btn)
-            
-            op_widget = QWidget()
-            op_widget.setLayout(op_layout)
-            self.paper_table.setCellWidget(row, 3, op_widget)
-
-        # 生成词云（基于论文标题）
-        titles = " ".join([p['title'] for p in papers])
-        wc_path = generate_wordcloud(titles)
-        # 启动后台线程加载图片
-        self.image_loader = ImageLoaderWorker(wc_path)
-        self.image_loader.image_loaded.connect(self.update_wordcloud_display)
-        self.image_loader.start()
-
-    def update_wordcloud_display(self, pixmap):
-        """响应后台线程的图片加载完成信号，更新词云显示"""
-        # 假设使用stats_label显示词云（根据实际UI布局调整）
-        self.stats_label.setPixmap(pixmap)  # 适配标签宽度
\ No newline at end of file
+        self.record_history(papers)  # 记入后退/前进历史
+
+        # 生成词云（基于论文标题，同一论文的预印本与正式版本只计一次）
+        self.show_wordcloud()
@@ -1,14 +1,30 @@
+import os
+import threading
+from collections import OrderedDict
+
 from PyQt5.QtWidgets import QWidget, QMessageBox, QDialog, QVBoxLayout, QTextEdit, QPushButton, \
-    QAbstractItemView, QHeaderView, QProgressBar
-from dblp_searcher.dblp_spider import get_bibtex_from_url, get_abstract_by_doi
-from PyQt5.QtCore import QThread, pyqtSignal
-from PyQt5.QtGui import QPixmap
-from PyQt5.QtWidgets import QTableWidget, QMenu, QApplication
-from PyQt5.QtCore import Qt
-from dblp_searcher.dblp_translate import baidu_translate
+    QAbstractItemView, QHeaderView, QProgressBar, QToolButton, QStyle, QShortcut
+from PyQt5.QtCore import QThread, QTimer, pyqtSignal
+from PyQt5.QtGui import QPixmap, QKeySequence, QImage, QImageReader
+from PyQt5.QtWidgets import QTableView, QMenu, QApplication, QCompleter, QFileDialog, QProgressDialog
+from PyQt5.QtCore import Qt, QStringListModel, QSize
+from dblp_searcher import dblp_profiler, dblp_trace
+from dblp_ui.paper_model import PaperTableModel, PaperFilterProxyModel, PaperActionDelegate
+from dblp_ui.filter_bar import PaperFilterBar
+from dblp_ui.task_executor import shared_executor, PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_HIGH
+from dblp_ui.base_workers import bibtex_task, abstract_task, suggest_task, load_suggestions_task, export_task, \
+    duplicates_task, citations_task
+from dblp_searcher.dblp_citations import normalize_doi
+from dblp_searcher.dblp_dedup import DuplicateGroups, unique_papers
+from dblp_searcher.dblp_suggest import get_suggestion_index
+from dblp_searcher.dblp_history import ResultHistory
+from dblp_searcher.dblp_export import EXPORT_FORMATS, format_for_path
 
 
 class BaseTab(QWidget):
+    SESSION_LISTS = ()  # 会话快照中保存的列表控件（属性名）
+    SESSION_ATTRS = ()  # 会话快照中保存的普通属性（属性名）
+
     def __init__(self):
         super().__init__()
 
@@ -18,26 +34,271 @@ class BaseTab(QWidget):
         self.progress_bar.setRange(0, 0)  # 无限加载模式
         self.progress_bar.hide()
 
+        # 结果集浏览历史（后退/前进按钮由各页签放入搜索栏）
+        self.history = ResultHistory()
+        self.history_label = ""  # 正在加载的结果集名称，结果返回后记入历史
+        self._history_papers = None  # 表格中显示的当前历史条目的论文列表
+        self._wordcloud_source = None  # 等待重复检测结果的词云：(表格中的论文列表, 行数, dblp_trace 操作)
+        self._wordcloud_connected = False
+        self._wordcloud_generation = 0  # 每次生成或清除词云加一，用于丢弃已被取代的图片加载结果
+        self.back_btn = QToolButton()
+        self.back_btn.setIcon(self.style().standardIcon(QStyle.SP_ArrowBack))
+        self.back_btn.clicked.connect(self.go_back)
+        self.forward_btn = QToolButton()
+        self.forward_btn.setIcon(self.style().standardIcon(QStyle.SP_ArrowForward))
+        self.forward_btn.clicked.connect(self.go_forward)
+        for sequence, slot in (("Alt+Left", self.go_back), ("Alt+Right", self.go_forward)):
+            shortcut = QShortcut(QKeySequence(sequence), self)
+            shortcut.setContext(Qt.WidgetWithChildrenShortcut)
+            shortcut.activated.connect(slot)
+        self.update_history_buttons()
+
     def handle_search_error(self, error_msg):
         """处理搜索错误"""
         self.progress_bar.hide()
+        paper_table = getattr(self, "paper_table", None)
+        if paper_table is not None:
+            paper_table.finish_loading()
         QMessageBox.critical(self, "错误", error_msg)
 
+    def run_task(self, channel, fn, *args, error_msg="搜索失败", priority=PRIORITY_NORMAL):
+        """
+        在共享执行器中运行任务并返回句柄。
+        同一页签同一通道只保留最新的任务：旧任务被取消，其结果不会再送达。
+        任务失败时以 error_msg 为前缀提示错误（为 None 时不提示）。
+        """
+        handle = shared_executor().submit(fn, *args, channel=(id(self), channel), priority=priority)
+        if error_msg is not None:
+            handle.failed.connect(lambda e: self.handle_search_error(f"{error_msg}：{e}"))
+        return handle
+
+    def cancel_task(self, channel):
+        """取消本页签某个通道中正在进行的任务"""
+        shared_executor().cancel_channel((id(self), channel))
+
+    # ---- 结果集浏览历史 ----
+
+    def record_history(self, papers):
+        """把刚加载完成的结果集记入历史（名称取 history_label）"""
+        self.history.push(self.history_label, papers, self.history_state())
+        self._history_papers = self.paper_table.papers()
+        self.update_history_buttons()
+
+    def update_history_papers(self, papers):
+        """表格中的论文补充了字段（如引用数）：是当前历史条目的论文时重新记入，后退再前进时仍能看到"""
+        if papers is self._history_papers:
+            self.history.update_current(papers)
+
+    def history_state(self):
+        """随结果集一起保存的页签状态，子类可扩展"""
+        return {"keyword": self.keyword_input.text()}
+
+    def restore_history_state(self, state):
+        self.keyword_input.setText(state.get("keyword", ""))
+
+    def go_back(self):
+        self.show_history_entry(self.history.back())
+
+    def go_forward(self):
+        self.show_history_entry(self.history.forward())
+
+    def show_history_entry(self, item):
+        """直接显示历史中的结果集，不重新请求网络"""
+        if item is None:
+            return
+        label, papers, state = item
+        self.cancel_task("papers")  # 丢弃进行中的加载
+        self.progress_bar.hide()
+        self.paper_table.set_papers(papers)
+        self._history_papers = self.paper_table.papers()
+        self.restore_history_state(state)
+        self.stats_label.clear()  # 词云对应的是其他结果集
+        self._wordcloud_generation += 1  # 尚未加载完的旧词云不再显示
+        self.update_history_buttons()
+
+    def show_wordcloud(self):
+        """
+        用表格中论文的标题生成词云，并在后台线程解码后显示到 stats_label，四个页签共用。
+        同一论文的预印本与正式版本只计一次：沿用表格在后台查找重复论文的结果（不在界面线程重新检测），
+        结果到达后才生成词云。生成耗时计入当前操作的 render.wordcloud 阶段，开启性能分析时按 wordcloud 操作记录。
+        """
+        papers = self.paper_table.papers()
+        self._wordcloud_source = (papers, len(papers), dblp_trace.current_operation())
+        if not self._wordcloud_connected:
+            self.paper_table.filter_model.duplicates_changed.connect(self._show_pending_wordcloud)
+            self._wordcloud_connected = True
+        self._show_pending_wordcloud()
+
+    def _show_pending_wordcloud(self):
+        if self._wordcloud_source is None:
+            return
+        papers, size, operation = self._wordcloud_source
+        if self.paper_table.papers() is not papers or len(papers) != size:
+            self._wordcloud_source = None  # 表格已换成其他结果集
+            return
+        groups = self.paper_table.filter_model.duplicates()
+        if size >= 2 and (groups is None or groups.size != size):
+            return  # 重复检测尚未完成（少于两篇时不检测）
+        self._wordcloud_source = None
+        if groups is not None:
+            papers = unique_papers(papers, groups)
+
+        from dblp_searcher.dblp_visualizer import generate_wordcloud  # wordcloud/matplotlib 较重，用到时才导入
+        titles = " ".join([p['title'] for p in papers])
+        with dblp_trace.bind(operation), dblp_trace.span("render.wordcloud", papers=len(papers)), \
+                dblp_profiler.profiled("wordcloud"):
+            wc_path = generate_wordcloud(titles)
+        # 启动后台线程加载图片：线程以页签为父对象，运行结束后才释放（运行中被回收会使 Qt 直接退出）
+        self._wordcloud_generation += 1
+        generation = self._wordcloud_generation
+        loader = ImageLoaderWorker(wc_path, self.stats_label, parent=self)
+        loader.image_loaded.connect(lambda pixmap: self.update_wordcloud_display(pixmap, generation))
+        loader.finished.connect(loader.deleteLater)
+        loader.start()
+
+    def update_wordcloud_display(self, pixmap, generation):
+        """响应后台线程的图片加载完成信号，更新词云显示；之后又生成或清除过词云时丢弃这次的结果"""
+        if generation == self._wordcloud_generation:
+            self.stats_label.setPixmap(pixmap)  # 适配标签宽度
+
+    def update_history_buttons(self):
+        for button, offset, name in ((self.back_btn, -1, "后退 (Alt+←)"), (self.forward_btn, 1, "前进 (Alt+→)")):
+            entry = self.history.peek(offset)
+            button.setEnabled(entry is not None)
+            button.setToolTip(f"{name}：{entry.label}（{entry.count} 条）" if entry is not None else name)
+
+    # ---- 会话快照 ----
+
+    def session_state(self):
+        """页签的界面状态（可 JSON 序列化），已加载的论文另行保存"""
+        state = {"keyword": self.keyword_input.text(), "history_label": self.history_label,
+                 "lists": {}, "attrs": {}}
+        for name in self.SESSION_LISTS:
+            widget = getattr(self, name)
+            items = [widget.item(row) for row in range(widget.count())]
+            state["lists"][name] = {"items": [[item.text(), item.data(1)] for item in items],
+                                    "current": widget.currentRow(),
+                                    "visible": not widget.isHidden()}
+        for name in self.SESSION_ATTRS:
+            state["attrs"][name] = getattr(self, name)
+        return state
+
+    def restore_session(self, state, papers):
+        """按 session_state() 的结果恢复界面，论文直接交给表格（不重新请求网络）"""
+        self.keyword_input.setText(state.get("keyword", ""))
+        self.history_label = state.get("history_label", "")
+        for name, saved in state.get("lists", {}).items():
+            widget = getattr(self, name, None)
+            if widget is None:
+                continue
+            widget.clear()
+            for text, url in saved.get("items", []):
+                widget.addItem(text)
+                widget.item(widget.count() - 1).setData(1, url)
+            widget.setCurrentRow(saved.get("current", -1))
+            widget.setVisible(saved.get("visible", True))
+        for name, value in state.get("attrs", {}).items():
+            if name in self.SESSION_ATTRS:
+                setattr(self, name, value)
+        self.paper_table.set_papers(papers)
+
+    # ---- 输入提示与输入即搜 ----
+
+    SUGGEST_DELAY = 300  # 输入停止多久后发起远程查询（毫秒）
+    MIN_LIVE_SEARCH_LENGTH = 2  # “输入即搜”的最短关键词长度
+
+    def init_suggestions(self, kind, search_slot):
+        """
+        为 keyword_input 启用输入提示：
+        本地索引的提示随输入立即显示，输入停顿后再做一次少量结果的远程前缀查询；
+        勾选 live_search_check 时，停顿后直接执行 search_slot 完整搜索。
+        """
+        self.suggest_index = get_suggestion_index(kind)
+        self.suggest_kind = kind
+        self.search_slot = search_slot
+        self._suggested = {}  # 提示文字 -> 条目
+
+        self.suggest_model = QStringListModel(self)
+        self.completer = QCompleter(self.suggest_model, self)
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.completer.activated[str].connect(self.on_suggestion_activated)
+        self.keyword_input.setCompleter(self.completer)
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(self.SUGGEST_DELAY)
+        self.debounce_timer.timeout.connect(self.on_keyword_settled)
+        self.keyword_input.textEdited.connect(self.on_keyword_edited)
+
+        if not self.suggest_index.loaded:
+            self.run_task("suggest_load", load_suggestions_task, kind, error_msg=None, priority=PRIORITY_LOW)
+
+    def on_keyword_edited(self, text):
+        """输入变化：立即显示本地提示，并重新开始防抖计时"""
+        self.cancel_task("suggest")
+        self.show_suggestions(self.suggest_index.suggest(text))
+        self.debounce_timer.start()
+
+    def on_keyword_settled(self):
+        """输入停顿：远程补充提示；开启“输入即搜”时执行完整搜索"""
+        keyword = self.keyword_input.text().strip()
+        if not keyword:
+            return
+        if self.live_search_check.isChecked():
+            # 完整搜索的结果也会写入提示索引，不必再单独查询提示
+            if len(keyword) >= self.MIN_LIVE_SEARCH_LENGTH:
+                self.search_slot()
+            return
+        handle = self.run_task("suggest", suggest_task, self.suggest_kind, keyword,
+                               error_msg=None, priority=PRIORITY_LOW)
+        handle.finished.connect(lambda entries, k=keyword: self.on_remote_suggestions(k, entries))
+
+    def on_remote_suggestions(self, keyword, entries):
+        if self.keyword_input.text().strip() == keyword:
+            self.show_suggestions(entries)
+
+    def show_suggestions(self, entries):
+        self._suggested = {self.suggest_index.display(entry): entry for entry in entries}
+        self.suggest_model.setStringList(list(self._suggested))
+        if self._suggested and self.keyword_input.hasFocus():
+            self.completer.complete()
+
+    def on_suggestion_activated(self, text):
+        """选中提示：以其缩写/姓名作为关键词搜索"""
+        entry = self._suggested.get(text)
+        if entry is None:
+            return
+        self.debounce_timer.stop()
+        self.keyword_input.setText(self.suggest_index.search_term(entry))
+        self.search_slot()
+
     def show_info(self,title, bibtex):
         dialog = CopyableInfoDialog(self, title, bibtex)
         dialog.exec_()
 
+    def open_loading_dialog(self, title, fn, *args):
+        """立即打开加载中的信息框，在后台执行任务 fn，结果返回后填入信息框"""
+        dialog = CopyableInfoDialog(self, title, "加载中...")
+        dialog.set_loading(True)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+
+        handle = shared_executor().submit(fn, *args, priority=PRIORITY_HIGH)
+        handle.finished.connect(dialog.set_content)
+        handle.failed.connect(lambda error_msg: dialog.set_content(f"获取失败：{error_msg}"))
+        # 信息框关闭后不再需要结果
+        dialog.finished.connect(lambda _: handle.cancel())
+
+        dialog.show()
+        return dialog
+
     def get_bibtex(self, dblp_url):
         """获取BibTeX信息"""
-        bibtex = get_bibtex_from_url(dblp_url)
-        self.show_info('Bibtex',bibtex)
+        self.open_loading_dialog('Bibtex', bibtex_task, dblp_url)
 
     def get_abstract(self, doi):
         """获取论文摘要"""
-        abstract = get_abstract_by_doi(doi)
-        if abstract is not None:
-            abstract = baidu_translate(abstract)
-        self.show_info('摘要',abstract)
+        self.open_loading_dialog('摘要', abstract_task, doi)
 
 # 信息框类
 class CopyableInfoDialog(QDialog):
@@ -65,6 +326,14 @@ class CopyableInfoDialog(QDialog):
         self.ok_button.clicked.connect(self.accept)
         layout.addWidget(self.ok_button)
 
+    def set_loading(self, loading):
+        """加载期间禁用复制按钮"""
+        self.copy_button.setEnabled(not loading)
+
+    def set_content(self, content):
+        self.text_edit.setPlainText(content if content is not None else "")
+        self.set_loading(False)
+
     def copy_to_clipboard(self):
         clipboard = QApplication.clipboard()
         clipboard.setText(self.text_edit.toPlainText())
@@ -72,33 +341,119 @@ class CopyableInfoDialog(QDialog):
 
 # 图像加载类
 class ImageLoaderWorker(QThread):
-    """后台加载图片的工作线程"""
+    """
+    后台加载图片的工作线程。
+
+    QPixmap 只能在界面线程中创建：后台线程把图片解码为 QImage，并直接缩小到目标标签的设备像素宽度
+    （QImageReader 解码时缩放，不再保留原图；标签高度由分割条决定、常常只有几十像素，按高度缩放会把词云缩得看不清，
+    因此只按宽度适配），回到界面线程后再转换为 QPixmap 发出 image_loaded。
+    解码结果按（文件、修改时间、目标宽度）缓存最近的 CACHE_SIZE 张。
+    """
     image_loaded = pyqtSignal(QPixmap)  # 参数：加载完成的图片对象
+    _decoded = pyqtSignal(QImage)       # 后台线程 -> 界面线程
 
-    def __init__(self, image_path):
-        super().__init__()
+    CACHE_SIZE = 8
+    _cache = OrderedDict()  # 缓存键 -> QImage，最近使用的在末尾
+    _cache_lock = threading.Lock()
+
+    def __init__(self, image_path, target=None, parent=None):
+        """target 为显示图片的控件，图片按其内容区宽度缩小（只缩小不放大）；None 时保持原图大小"""
+        super().__init__(parent)
         self.image_path = image_path  # 图片路径
+        self.operation = dblp_trace.current_operation()  # 计时归到创建本线程的操作下
+        self.target_width = None  # 目标宽度（设备像素）
+        self.device_pixel_ratio = 1.0
+        if target is not None:  # 控件只能在界面线程中访问，在这里取好大小
+            self.device_pixel_ratio = target.devicePixelRatioF()
+            width = target.contentsRect().width()
+            if width > 0:
+                self.target_width = round(width * self.device_pixel_ratio)
+        self._decoded.connect(self._on_decoded)  # 本对象属于界面线程，信号排队到界面线程处理
 
     def run(self):
-        # 在后台线程加载图片
-        pixmap = QPixmap(self.image_path)
-        self.image_loaded.emit(pixmap)  # 加载完成后发送信号
+        # 在后台线程解码图片
+        with dblp_trace.bind(self.operation), dblp_trace.span("render.image") as span:
+            image, cached = self._load()
+            span.set(width=image.width(), height=image.height(), cached=cached)
+        self._decoded.emit(image)
+
+    def _cache_key(self):
+        try:
+            stat = os.stat(self.image_path)
+        except OSError:
+            return None
+        return self.image_path, stat.st_mtime_ns, stat.st_size, self.target_width, self.device_pixel_ratio
+
+    def _load(self):
+        """返回 (QImage, 是否来自缓存)；文件不存在或无法解码时为空图片"""
+        key = self._cache_key()
+        if key is None:
+            return QImage(), False
+        with self._cache_lock:
+            image = self._cache.get(key)
+            if image is not None:
+                self._cache.move_to_end(key)
+                return image, True
+
+        reader = QImageReader(self.image_path)
+        size = reader.size()
+        if self.target_width is not None and size.isValid() and size.width() > self.target_width:
+            height = max(1, round(size.height() * self.target_width / size.width()))
+            reader.setScaledSize(QSize(self.target_width, height))
+        image = reader.read()
+        if image.isNull():
+            return image, False
+        image.setDevicePixelRatio(self.device_pixel_ratio)
+
+        with self._cache_lock:
+            self._cache[key] = image
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return image, False
+
+    def _on_decoded(self, image):
+        # 界面线程：QImage 转 QPixmap 很快（不需要再解码）
+        self.image_loaded.emit(QPixmap.fromImage(image))
 
 # 自定义表格类
 
-class BaseTableWidget(QTableWidget):
-    def __init__(self, parent=None):
+class BaseTableWidget(QTableView):
+    """论文结果表格：模型/视图结构，操作列由委托绘制，支持十万行级别的数据"""
+    bibtex_requested = pyqtSignal(str)    # 参数：论文DBLP链接
+    abstract_requested = pyqtSignal(str)  # 参数：论文DOI
+    papers_updated = pyqtSignal(object)   # 参数：在原处补充了字段（如引用数）的论文列表
+
+    ROW_HEIGHT = 30
+    FLUSH_INTERVAL = 16      # 追加行的合并间隔（毫秒），约一帧
+    MAX_ROWS_PER_FLUSH = 5000  # 每帧最多插入的行数，避免单帧卡顿
+
+    def __init__(self, columns, parent=None):
         super(BaseTableWidget, self).__init__(parent)
 
-        # 表头可点击排序
+        # 源模型保存论文，代理模型负责索引过滤和排序
+        self.paper_model = PaperTableModel(columns, self)
+        self.filter_model = PaperFilterProxyModel(self)
+        self.filter_model.setSourceModel(self.paper_model)
+        self.setModel(self.filter_model)
+
+        # 操作列：绘制按钮，点击后转发为表格信号
+        action_column = self.paper_model.action_column()
+        if action_column >= 0:
+            self.action_delegate = PaperActionDelegate(self)
+            self.action_delegate.bibtex_clicked.connect(self.bibtex_requested)
+            self.action_delegate.abstract_clicked.connect(self.abstract_requested)
+            self.setItemDelegateForColumn(action_column, self.action_delegate)
+
+        # 表头可点击排序（初始不排序，保持DBLP原始顺序）
+        self.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
         self.setSortingEnabled(True)
 
         # 支持多选
         self.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.setSelectionBehavior(QAbstractItemView.SelectItems)
 
-        # 禁止编辑
-        self.setEditTriggers(QTableWidget.NoEditTriggers)
+        # 表格不可编辑
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
 
         # 列宽可拖动
         self.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
@@ -106,36 +461,217 @@ class BaseTableWidget(QTableWidget):
         # 自动调整列宽以适应内容（可选）
         self.horizontalHeader().setStretchLastSection(False)
 
-        # 表格不可编辑（可根据需要修改）
-        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        # 固定行高，滚动时无需逐行测量内容
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(self.ROW_HEIGHT)
 
         # 设置右键菜单策略
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self.open_menu)
 
+        # 流式加载：分批到达的论文先缓存，按帧合并插入
+        self._pending = []
+        self._loading = False
+        self._operation = None  # 追加论文的任务对应的 dblp_trace 操作，按帧插入时沿用
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL)
+        self._flush_timer.timeout.connect(self._flush_pending)
+
+    def set_papers(self, papers):
+        """填充论文数据（代理模型会沿用当前的过滤条件和排序列）"""
+        self.paper_model.set_papers(papers)
+        self.detect_duplicates()
+
+    def clear_papers(self):
+        """清空表格，并结束尚未完成的流式加载"""
+        if self._loading:
+            self._loading = False
+            self._flush_timer.stop()
+            self.setSortingEnabled(True)
+        self._pending = []
+        shared_executor().cancel_channel((id(self), "duplicates"))
+        shared_executor().cancel_channel((id(self), "citations"))
+        self.paper_model.clear()
+
+    def begin_loading(self):
+        """开始流式加载：清空旧数据，加载期间暂停排序"""
+        self.clear_papers()
+        self._loading = True
+        self.setSortingEnabled(False)
+        self._flush_timer.start()
+
+    def append_papers(self, papers):
+        """追加一批论文（由定时器合并后插入表格）"""
+        if not self._loading:
+            self.begin_loading()
+        self._operation = dblp_trace.current_operation()
+        self._pending.extend(papers)
+
+    def finish_loading(self):
+        """结束流式加载：插入剩余数据并恢复排序"""
+        if not self._loading:
+            return
+        self._loading = False
+        self._flush_timer.stop()
+        while self._pending:
+            self._flush_pending()
+        self.setSortingEnabled(True)
+        self.detect_duplicates()
+
+    def _flush_pending(self):
+        if not self._pending:
+            return
+        batch = self._pending[:self.MAX_ROWS_PER_FLUSH]
+        del self._pending[:self.MAX_ROWS_PER_FLUSH]
+        with dblp_trace.bind(self._operation):
+            self.paper_model.append_papers(batch)
+
+    def detect_duplicates(self):
+        """在后台查找重复论文，完成后交给代理模型标出或合并"""
+        papers = self.paper_model.papers()
+        if len(papers) < 2:
+            return
+        # 流式加载会在原列表上追加，后台只处理当前这些行的副本
+        snapshot = list(papers) if isinstance(papers, list) else papers
+        handle = shared_executor().submit(duplicates_task, snapshot, channel=(id(self), "duplicates"),
+                                          priority=PRIORITY_LOW)
+
+        def on_finished(groups):
+            if self.paper_model.papers() is papers and len(papers) == groups.size:
+                self.filter_model.set_duplicates(groups)
+
+        handle.finished.connect(on_finished)
+        # 检测失败时按没有重复处理，等待检测结果的词云仍会生成
+        handle.failed.connect(lambda error: on_finished(DuplicateGroups(len(snapshot), [])))
+
+    def papers(self):
+        """全部已加载的论文（加载顺序）"""
+        return self.paper_model.papers()
+
+    def visible_papers(self):
+        """当前过滤、排序后显示的论文"""
+        papers = self.paper_model.papers()
+        return [papers[row] for row in self.filter_model.source_rows()]
+
+    def create_filter_bar(self):
+        """创建与本表格联动的过滤栏"""
+        return PaperFilterBar(self)
+
     def open_menu(self, position):
         menu = QMenu()
+        copy_action = export_all_action = export_visible_action = citations_action = None
 
         if self.selectedIndexes():
             copy_action = menu.addAction("复制选中单元格")
-            action = menu.exec_(self.viewport().mapToGlobal(position))
-            if action == copy_action:
-                self.copy_selected_cells()
+        if self.paper_model.rowCount():
+            export_all_action = menu.addAction("导出全部结果...")
+            if self.filter_model.is_filtered():
+                export_visible_action = menu.addAction("导出过滤后的结果...")
+            if self.has_field("citations"):
+                citations_action = menu.addAction("获取引用数（Semantic Scholar）")
+        if menu.isEmpty():
+            return
 
-    def copy_selected_cells(self):
-        selected_ranges = self.selectedRanges()
-        if not selected_ranges:
+        action = menu.exec_(self.viewport().mapToGlobal(position))
+        if action is None:
+            return
+        if action == copy_action:
+            self.copy_selected_cells()
+        elif action == export_all_action:
+            self.export_papers()
+        elif action == export_visible_action:
+            self.export_papers(self.filter_model.source_rows())
+        elif action == citations_action:
+            self.enrich_citations()
+
+    def has_field(self, field):
+        return any(self.paper_model.field(column) == field for column in range(self.paper_model.columnCount()))
+
+    def enrich_citations(self):
+        """在后台按 DOI 批量查询引用数，每返回一批就填入引用列（按该列排序时随之重排）"""
+        papers = self.paper_model.papers()
+        rows_by_doi = {}
+        for row, paper in enumerate(papers):
+            doi = normalize_doi(paper.get("doi"))
+            if doi is not None:
+                rows_by_doi.setdefault(doi, []).append(row)
+        if not rows_by_doi:
+            QMessageBox.information(self, "提示", "当前结果中没有带 DOI 的论文")
             return
 
-        copied_text = ""
+        handle = shared_executor().submit(citations_task, list(rows_by_doi), channel=(id(self), "citations"),
+                                          priority=PRIORITY_LOW)
+
+        def on_batch(result):
+            if self.paper_model.papers() is not papers:
+                return
+            for doi, value in result.items():
+                for row in rows_by_doi.get(doi, ()):
+                    paper = papers[row]
+                    paper["citations"] = value["citations"] if value else "N/A"
+                    paper["influential_citations"] = value["influential"] if value else None
+            self.paper_model.refresh_field("citations")
+            self.papers_updated.emit(papers)
+
+        def on_failed(error_msg):
+            QMessageBox.warning(self, "错误", f"获取引用数失败：{error_msg}")
+
+        handle.batch_ready.connect(on_batch)
+        handle.failed.connect(on_failed)
+
+    def export_papers(self, rows=None):
+        """
+        选择文件后在后台导出完整的论文记录（所有字段，不只是表格中的列）。
+        rows 为 None 时按加载顺序导出全部，否则按 rows 中的源数据行导出。
+        """
+        filters = list(EXPORT_FORMATS.values())
+        path, selected_filter = QFileDialog.getSaveFileName(self, "导出结果", "dblp_results.csv", ";;".join(filters))
+        if not path:
+            return
+        fmt = format_for_path(path)
+        if fmt is None:
+            fmt = list(EXPORT_FORMATS)[filters.index(selected_filter)] if selected_filter in filters else "csv"
+            path = f"{path}.{fmt}"
+
+        papers = self.paper_model.papers()
+        total = len(papers) if rows is None else len(rows)
+        dialog = QProgressDialog(f"正在导出 {total} 条结果...", "取消", 0, max(total, 1), self)
+        dialog.setWindowTitle("导出结果")
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.setMinimumDuration(0)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+
+        handle = shared_executor().submit(export_task, papers, path, fmt, rows, priority=PRIORITY_LOW)
+        handle.progress.connect(lambda done, _: dialog.setValue(done))
+
+        def on_finished(count):
+            dialog.close()
+            QMessageBox.information(self, "导出完成", f"已导出 {count} 条结果到：\n{path}")
+
+        def on_failed(error_msg):
+            dialog.close()
+            QMessageBox.critical(self, "错误", f"导出失败：{error_msg}")
+
+        handle.finished.connect(on_finished)
+        handle.failed.connect(on_failed)
+        dialog.canceled.connect(handle.cancel)
+        dialog.show()
+
+    def copy_selected_cells(self):
+        selection = self.selectionModel().selection()
+        if selection.isEmpty():
+            return
 
-        for selection in selected_ranges:
-            for row in range(selection.topRow(), selection.bottomRow() + 1):
+        model = self.model()
+        lines = []
+        for selection_range in selection:
+            for row in range(selection_range.top(), selection_range.bottom() + 1):
                 row_data = []
-                for col in range(selection.leftColumn(), selection.rightColumn() + 1):
-                    item = self.item(row, col)
-                    row_data.append(item.text() if item else "")
-                copied_text += "\t".join(row_data) + "\n"
+                for col in range(selection_range.left(), selection_range.right() + 1):
+                    text = model.index(row, col).data()
+                    row_data.append(text if text else "")
+                lines.append("\t".join(row_data))
 
         # 将复制内容放入剪贴板
-        QApplication.clipboard().setText(copied_text.strip())
+        QApplication.clipboard().setText("\n".join(lines).strip())
@@ -1,159 +1,190 @@
-from PyQt5.QtCore import QThread, pyqtSignal
+"""
+后台任务函数，统一交给 dblp_ui.task_executor 中的执行器运行。
 
-from dblp_searcher.dblp_api import search_author, search_venue, query_publications
+每个任务函数的第一个参数是执行器传入的 task：
+通过 task.cancel_token 把取消标记传到 HTTP 层，通过 task.emit_batch() 分批返回论文。
+
+网络与网页解析模块（requests、bs4、lxml）在任务函数内部导入，
+首次使用时才在后台线程中加载，不占用程序启动时间。
+查询函数通过 backend() 取得：设置了环境变量 DBLP_SERVER 时改为请求共享查询服务。
+"""
+import time
+
+from dblp_searcher import dblp_trace
 from dblp_searcher.dblp_json2dic import parse_authors, parse_venues, parse_publications
-from dblp_searcher.dblp_spider import crawl_dblp_profile, parse_dblp_entries, get_dblp_search_conference_links, \
-    get_journal_volumes
-
-
-class AuthorSearchWorker(QThread):
-    """异步执行作者搜索的工作线程"""
-    search_finished = pyqtSignal(list)  # 参数：作者列表（姓名/机构/DBLP链接）
-    search_failed = pyqtSignal(str)     # 参数：错误信息
-
-    def __init__(self, keyword):
-        super().__init__()
-        self.keyword = keyword
-
-    def run(self):
-        try:
-            author_json = search_author(self.keyword)  # 调用作者搜索接口
-            raw_authors = parse_authors(author_json)
-            self.search_finished.emit(raw_authors)
-        except Exception as e:
-            self.search_failed.emit(f"作者搜索失败：{str(e)}")
-
-class AuthorPaperWorker(QThread):
-    """异步执行作者论文获取的工作线程"""
-    papers_fetched = pyqtSignal(list)  # 参数：论文列表
-    fetch_failed = pyqtSignal(str)     # 参数：错误信息
-
-    def __init__(self, author_url):
-        super().__init__()
-        self.author_url = author_url
-
-    def run(self):
-        try:
-            raw_papers = crawl_dblp_profile(self.author_url)  # 爬取作者简介页
-            parsed_papers = parse_dblp_entries(raw_papers)  # 解析论文数据
-            self.papers_fetched.emit(parsed_papers)
-        except Exception as e:
-            self.fetch_failed.emit(f"论文获取失败：{str(e)}")
-
-class ConferenceSearchWorker(QThread):
-    """异步执行会议搜索的工作线程"""
-    search_finished = pyqtSignal(list)  # 参数：会议列表（名称/缩写/DBLP链接/届数）
-    search_failed = pyqtSignal(str)     # 参数：错误信息
-
-    def __init__(self, keyword):
-        super().__init__()
-        self.keyword = keyword
-
-    def run(self):
-        try:
-            conference_json = search_venue(self.keyword)  # 调用会议搜索接口
-            raw_conferences = parse_venues(conference_json)  # 解析会议数据
-            self.search_finished.emit(raw_conferences)
-        except Exception as e:
-            self.search_failed.emit(f"会议搜索失败：{str(e)}")
-
-class ConferenceVolumesSearchWorker(QThread):
-    """异步执行会议搜索的工作线程"""
-    search_finished = pyqtSignal(list)  # 参数：会议列表（名称/缩写/DBLP链接/届数）
-    search_failed = pyqtSignal(str)     # 参数：错误信息
-
-    def __init__(self, conference_url):
-        super().__init__()
-        self.conference_url = conference_url
-
-    def run(self):
-        try:
-            conferencesVolumes = get_dblp_search_conference_links(self.conference_url)  # 调用会议搜索接口
-            self.search_finished.emit(conferencesVolumes)
-        except Exception as e:
-            self.search_failed.emit(f"会议搜索失败：{str(e)}")
-
-class ConferencePaperWorker(QThread):
-    """异步执行会议论文获取的工作线程"""
-    papers_fetched = pyqtSignal(list)  # 参数：会议论文列表
-    fetch_failed = pyqtSignal(str)     # 参数：错误信息
-
-    def __init__(self, conference_url):
-        super().__init__()
-        self.conference_url = conference_url
-
-    def run(self):
-        try:
-            raw_papers = crawl_dblp_profile(self.conference_url)  # 爬取会议页
-            parsed_papers = parse_dblp_entries(raw_papers)  # 解析论文数据
-            self.papers_fetched.emit(parsed_papers)
-        except Exception as e:
-            self.fetch_failed.emit(f"论文获取失败：{str(e)}")
-
-class journalSearchWorker(QThread):
-    """异步执行期刊搜索的工作线程"""
-    search_finished = pyqtSignal(list)  # 参数：期刊列表（名称/缩写/DBLP链接/届数）
-    search_failed = pyqtSignal(str)  # 参数：错误信息
-
-    def __init__(self, keyword):
-        super().__init__()
-        self.keyword = keyword
-
-    def run(self):
-        try:
-            journal_json = search_venue(self.keyword)  # 调用期刊搜索接口
-            raw_journals = parse_venues(journal_json)  # 解析期刊数据
-            self.search_finished.emit(raw_journals)
-        except Exception as e:
-            self.search_failed.emit(f"期刊搜索失败：{str(e)}")
-
-class journalVolumesSearchWorker(QThread):
-    """异步执行期刊搜索的工作线程"""
-    search_finished = pyqtSignal(list)  # 参数：期刊列表（名称/缩写/DBLP链接/届数）
-    search_failed = pyqtSignal(str)  # 参数：错误信息
-
-    def __init__(self, journal_url):
-        super().__init__()
-        self.journal_url = journal_url
-
-    def run(self):
-        try:
-            journalsVolumes = get_journal_volumes(self.journal_url)  # 调用期刊搜索接口
-            self.search_finished.emit(journalsVolumes)
-        except Exception as e:
-            self.search_failed.emit(f"期刊搜索失败：{str(e)}")
-
-class journalPaperWorker(QThread):
-    """异步执行期刊论文获取的工作线程"""
-    papers_fetched = pyqtSignal(list)  # 参数：期刊论文列表
-    fetch_failed = pyqtSignal(str)  # 参数：错误信息
-
-    def __init__(self, journal_url):
-        super().__init__()
-        self.journal_url = journal_url
-
-    def run(self):
-        try:
-            raw_papers = crawl_dblp_profile(self.journal_url)  # 爬取期刊页
-            parsed_papers = parse_dblp_entries(raw_papers)  # 解析论文数据
-            self.papers_fetched.emit(parsed_papers)
-        except Exception as e:
-            self.fetch_failed.emit(f"论文获取失败：{str(e)}")
-
-class PaperSearchWorker(QThread):
-    """异步执行文献搜索的工作线程"""
-    search_finished = pyqtSignal(list)  # 参数：文献列表
-    search_failed = pyqtSignal(str)     # 参数：错误信息
-
-    def __init__(self, keyword, max_results):
-        super().__init__()
-        self.keyword = keyword
-        self.max_results = max_results
-
-    def run(self):
-        try:
-            raw_data = query_publications(self.keyword, self.max_results)
-            parsed_data = parse_publications(raw_data)
-            self.search_finished.emit(parsed_data)
-        except Exception as e:
-            self.search_failed.emit(f"搜索失败：{str(e)}")
+from dblp_searcher.dblp_fuzzy import get_title_index
+from dblp_searcher.dblp_remote import backend
+from dblp_searcher.dblp_snapshot import get_snapshot, search_enabled
+from dblp_searcher.dblp_suggest import get_suggestion_index
+
+SUGGEST_RESULTS = 10  # 输入提示的远程查询只取少量结果
+
+
+def author_search_task(task, keyword):
+    """作者搜索，返回作者列表（姓名/机构/DBLP链接）"""
+    author_json = backend("dblp_api").search_author(keyword, cancel_token=task.cancel_token)  # 调用作者搜索接口
+    with dblp_trace.span("parse.authors"):
+        authors = parse_authors(author_json)
+    get_suggestion_index("author").add(authors)  # 搜索结果同时用于输入提示
+    return authors
+
+
+def venue_search_task(task, keyword):
+    """期刊/会议搜索，返回出版源列表（名称/缩写/DBLP链接）"""
+    venue_json = backend("dblp_api").search_venue(keyword, cancel_token=task.cancel_token)  # 调用出版源搜索接口
+    with dblp_trace.span("parse.venues"):
+        venues = parse_venues(venue_json)
+    get_suggestion_index("venue").add(venues)  # 搜索结果同时用于输入提示
+    return venues
+
+
+def load_suggestions_task(task, kind):
+    """从磁盘缓存构建输入提示索引"""
+    index = get_suggestion_index(kind)
+    if not index.loaded:
+        index.load_from_cache()
+    return kind
+
+
+def suggest_task(task, kind, prefix):
+    """输入提示：少量结果的远程前缀查询，合并进本地索引后返回提示条目"""
+    api = backend("dblp_api")
+    index = get_suggestion_index(kind)
+    if not index.loaded:
+        index.load_from_cache()
+    if kind == "venue":
+        index.add(parse_venues(api.search_venue(prefix, SUGGEST_RESULTS, cancel_token=task.cancel_token)))
+    else:
+        index.add(parse_authors(api.search_author(prefix, SUGGEST_RESULTS, cancel_token=task.cancel_token)))
+    return index.suggest(prefix)
+
+
+def conference_volumes_task(task, conference_url):
+    """获取会议的各届链接，返回 [(名称, url)]"""
+    return backend("dblp_spider").get_dblp_search_conference_links(conference_url, cancel_token=task.cancel_token)
+
+
+def journal_volumes_task(task, journal_url):
+    """获取期刊的各卷链接，返回 [(卷号, url)]"""
+    return backend("dblp_spider").get_journal_volumes(journal_url, cancel_token=task.cancel_token)
+
+
+def profile_papers_task(task, url):
+    """爬取作者/期卷页面的论文，分批返回，最后返回完整列表"""
+    spider = backend("dblp_spider")
+    parsed_papers = []
+    for raw_papers in spider.iter_dblp_profile(url, cancel_token=task.cancel_token):  # 分批爬取
+        batch = spider.parse_dblp_entries(raw_papers)  # 解析论文数据
+        parsed_papers.extend(batch)
+        task.emit_batch(batch)
+    get_title_index().add(parsed_papers)  # 加载过的论文同时用于模糊查找标题
+    return parsed_papers
+
+
+def paper_search_task(task, keyword, max_results):
+    """
+    文献搜索，分页返回，最后返回完整列表。
+    开启了快照检索（dblp_snapshot.search_enabled()）且导出过本地快照时先查快照（离线，毫秒级），
+    快照中没有结果时再查询 dblp.org。
+    """
+    snapshot = get_snapshot() if search_enabled() else None
+    if snapshot is not None:
+        with dblp_trace.span("model.snapshot", papers=len(snapshot)) as span:
+            parsed_data = list(snapshot.search(keyword, max_results))
+            span.set(matches=len(parsed_data))
+        if parsed_data:
+            task.emit_batch(parsed_data)
+            get_title_index().add(parsed_data)
+            return parsed_data
+    parsed_data = []
+    for raw_data in backend("dblp_api").iter_publications(keyword, max_results, cancel_token=task.cancel_token):  # 分页查询
+        with dblp_trace.span("parse.publications"):
+            batch = parse_publications(raw_data)
+        parsed_data.extend(batch)
+        task.emit_batch(batch)
+    get_title_index().add(parsed_data)  # 加载过的论文同时用于模糊查找标题
+    return parsed_data
+
+
+def fuzzy_title_task(task, query):
+    """在本地已知的标题（磁盘缓存中的搜索结果、加载过的论文）中模糊查找，返回 [(论文, 编辑距离)]"""
+    index = get_title_index()
+    if not index.loaded:
+        index.load_from_cache()
+    with dblp_trace.span("model.fuzzy", titles=len(index)) as span:
+        matches = index.search(query)
+        span.set(matches=len(matches))
+    return matches
+
+
+def bibtex_task(task, dblp_url):
+    """获取BibTeX信息"""
+    return backend("dblp_spider").get_bibtex_from_url(dblp_url, cancel_token=task.cancel_token)
+
+
+def abstract_task(task, doi):
+    """获取论文摘要并翻译"""
+    abstract = backend("dblp_spider").get_abstract_by_doi(doi, cancel_token=task.cancel_token)
+    if abstract is not None:
+        abstract = backend("dblp_translate").baidu_translate(abstract, cancel_token=task.cancel_token)
+    return abstract
+
+
+def export_task(task, papers, path, fmt=None, rows=None):
+    """导出论文到文件，返回导出的条数"""
+    from dblp_searcher.dblp_export import export_papers
+    return export_papers(papers, path, fmt, rows, progress=task.report_progress, cancel_token=task.cancel_token)
+
+
+def duplicates_task(task, papers):
+    """查找论文中的重复版本（CoRR 预印本与正式版本等），返回 DuplicateGroups"""
+    from dblp_searcher.dblp_dedup import find_duplicates
+    with dblp_trace.span("model.duplicates", rows=len(papers)) as span:
+        groups = find_duplicates(papers, cancel_token=task.cancel_token)
+        span.set(groups=len(groups))
+    return groups
+
+
+def citations_task(task, dois):
+    """按 DOI 批量查询 Semantic Scholar 引用数，每批结果通过 emit_batch 返回，最后返回查询的 DOI 数"""
+    from dblp_searcher.dblp_citations import fetch_citations
+    count = 0
+    for result in fetch_citations(dois, cancel_token=task.cancel_token):
+        count += len(result)
+        task.emit_batch(result)
+    return count
+
+
+def venue_stats_task(task, venue_url, volume_urls=None, summary_interval=0.2):
+    """
+    期刊/会议的整体统计：先返回缓存中的统计；volume_urls 不为空时逐卷爬取尚未统计的卷，
+    每解析一批论文就累加，每完成一卷写一次缓存。最后返回统计结果。
+    summary() 要排序全部年份、遍历全部作者，所以不是每批都生成：距上次超过 summary_interval 秒
+    （界面的刷新间隔）才生成一次并通过 emit_batch 返回
+    """
+    from dblp_searcher.dblp_venue_stats import load_stats, save_stats
+    stats = load_stats(venue_url)
+    task.emit_batch(stats.summary())
+    emitted = time.monotonic()
+    pending = [url for url in volume_urls or () if url not in stats.volumes]
+    spider = backend("dblp_spider")
+    for done, url in enumerate(pending):
+        task.report_progress(done, len(pending))
+        with dblp_trace.span("model.venue_stats", volume=url):
+            # 一卷爬完才计入缓存，中途取消时这一卷已累加的部分随统计对象一起丢弃
+            for raw_papers in spider.iter_dblp_profile(url, cancel_token=task.cancel_token):
+                stats.add(spider.parse_dblp_entries(raw_papers))
+                if time.monotonic() - emitted >= summary_interval:
+                    task.emit_batch(stats.summary())
+                    emitted = time.monotonic()
+            stats.volumes.add(url)
+            save_stats(stats)
+    task.report_progress(len(pending), len(pending))
+    return stats.summary()
+
+
+def preload_modules_task(task):
+    """窗口显示后在后台预先导入网络与解析模块，首次搜索时无需再等待导入"""
+    import dblp_searcher.dblp_api  # noqa: F401
+    import dblp_searcher.dblp_spider  # noqa: F401
+    import dblp_searcher.dblp_translate  # noqa: F401
@@ -1,13 +1,16 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
-                             QPushButton, QTableWidgetItem, QLabel,
-                             QMessageBox, QListWidget, QSplitter)
+from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QLineEdit,
+                             QPushButton, QLabel,
+                             QMessageBox, QListWidget, QSplitter, QCheckBox)
 from PyQt5.QtCore import Qt
-from dblp_searcher.dblp_visualizer import generate_wordcloud
-from dblp_ui.base_tab import BaseTab, ImageLoaderWorker, BaseTableWidget
-from dblp_ui.base_workers import ConferencePaperWorker, ConferenceSearchWorker, ConferenceVolumesSearchWorker
+from dblp_ui.base_tab import BaseTab, BaseTableWidget
+from dblp_ui.venue_stats_panel import VenueStatsPanel
+from dblp_ui.base_workers import venue_search_task, conference_volumes_task, profile_papers_task
 
 
 class ConferenceTab(BaseTab):
+    SESSION_LISTS = ("conference_list", "volume_list")
+    SESSION_ATTRS = ("current_conference_url",)
+
     def __init__(self):
         super().__init__()
         self.current_conference_url = None  # 记录当前选中会议的DBLP链接
@@ -23,9 +26,13 @@ class ConferenceTab(BaseTab):
         self.keyword_input = QLineEdit()
         self.keyword_input.setPlaceholderText("输入会议关键词（如：SIGKDD）")
         self.search_btn = QPushButton("搜索会议")
+        self.live_search_check = QCheckBox("输入即搜")  # 输入停顿后自动搜索
+        search_layout.addWidget(self.back_btn)  # 结果集历史：后退/前进
+        search_layout.addWidget(self.forward_btn)
         search_layout.addWidget(QLabel("会议关键词："))
         search_layout.addWidget(self.keyword_input)
         search_layout.addWidget(self.search_btn)
+        search_layout.addWidget(self.live_search_check)
         
         # 会议列表展示（用于用户选择）
         self.conference_list = QListWidget()
@@ -39,16 +46,21 @@ class ConferenceTab(BaseTab):
         self.volume_list.setMaximumHeight(100)
 
         # 论文结果展示表格（列头适配会议场景）
-        self.paper_table = BaseTableWidget()
-        self.paper_table.setColumnCount(4)
-        self.paper_table.setHorizontalHeaderLabels([
-            "标题", "作者", "doi", "操作"
+        self.paper_table = BaseTableWidget([
+            ("标题", "title"), ("作者", "authors"), ("doi", "doi"), ("引用", "citations"), ("操作", None)
         ])
         self.paper_table.setColumnWidth(0, 800)
         self.paper_table.setColumnWidth(1, 100)
         self.paper_table.setColumnWidth(2, 100)
-        self.paper_table.setColumnWidth(3, 200)
+        self.paper_table.setColumnWidth(3, 60)
+        self.paper_table.setColumnWidth(4, 200)
         
+        # 已加载结果的过滤栏
+        self.filter_bar = self.paper_table.create_filter_bar()
+
+        # 会议整体统计（各年论文数/作者数、高产作者等）
+        self.stats_panel = VenueStatsPanel()
+
         # 统计信息展示区（示例：会议热度趋势图）
         self.stats_label = QLabel()
 
@@ -56,7 +68,9 @@ class ConferenceTab(BaseTab):
         splitter.addWidget(self.conference_list)  # 上部分为论文表格
         splitter.addWidget(self.volume_list)  # 上部分为论文表格
         splitter.addWidget(self.progress_bar)  # 上部分为论文表格
+        splitter.addWidget(self.filter_bar)  # 过滤栏
         splitter.addWidget(self.paper_table)  # 上部分为论文表格
+        splitter.addWidget(self.stats_panel)  # 整体统计
         splitter.addWidget(self.stats_label)  # 下部分为统计标签
         splitter.setChildrenCollapsible(False)  # 禁止折叠子部件
         
@@ -67,9 +81,15 @@ class ConferenceTab(BaseTab):
 
     def init_signals(self):
         """初始化信号连接"""
+        # 表格操作列的按钮点击
+        self.paper_table.bibtex_requested.connect(self.get_bibtex)
+        self.paper_table.abstract_requested.connect(self.get_abstract)
+        self.paper_table.papers_updated.connect(self.update_history_papers)  # 补充的引用数同步到历史
         self.search_btn.clicked.connect(self.start_conference_search)
         self.conference_list.itemClicked.connect(self.on_conference_selected)
         self.keyword_input.returnPressed.connect(self.start_conference_search)
+        # 输入提示（本地索引 + 防抖后的远程前缀查询）
+        self.init_suggestions("venue", self.start_conference_search)
         # 新增：期卷列表点击信号
         self.volume_list.itemClicked.connect(self.on_volume_selected)
 
@@ -80,13 +100,13 @@ class ConferenceTab(BaseTab):
             return
             
         self.progress_bar.show()
-        self.paper_table.setRowCount(0)  # 清空旧论文数据
+        self.paper_table.begin_loading()  # 清空旧数据，准备流式填充
         
-        # 启动论文获取线程（使用期卷URL）
-        self.paper_worker = ConferencePaperWorker(volume_url)
-        self.paper_worker.papers_fetched.connect(self.handle_paper_result)
-        self.paper_worker.fetch_failed.connect(self.handle_search_error)
-        self.paper_worker.start()
+        self.history_label = item.text()  # 结果返回后以此名称记入历史
+        # 在后台获取论文（使用期卷URL）
+        handle = self.run_task("papers", profile_papers_task, volume_url, error_msg="论文获取失败")
+        handle.batch_ready.connect(self.paper_table.append_papers)
+        handle.finished.connect(self.handle_paper_result)
 
     def start_conference_search(self):
         """启动会议搜索流程"""
@@ -97,19 +117,21 @@ class ConferenceTab(BaseTab):
             
         self.progress_bar.show()
         self.conference_list.clear()  # 清空旧会议列表
-        self.paper_table.setRowCount(0)  # 清空旧论文数据
+        self.cancel_task("volumes")  # 取消进行中的期卷获取
+        self.cancel_task("papers")  # 取消进行中的论文获取
+        self.stats_panel.reset()
+        self.paper_table.clear_papers()  # 清空旧论文数据
         
-        # 启动会议搜索线程
-        self.conference_worker = ConferenceSearchWorker(keyword)
-        self.conference_worker.search_finished.connect(self.handle_conference_result)
-        self.conference_worker.search_failed.connect(self.handle_search_error)
-        self.conference_worker.start()
+        # 在后台执行会议搜索
+        handle = self.run_task("venues", venue_search_task, keyword, error_msg="会议搜索失败")
+        handle.finished.connect(self.handle_conference_result)
 
     def handle_conference_result(self, conferences):
         """处理会议搜索结果（展示会议列表供选择）"""
         self.progress_bar.hide()
         if not conferences:
-            QMessageBox.information(self, "提示", "未找到相关会议")
+            if not self.live_search_check.isChecked():  # 输入即搜时不弹窗打断输入
+                QMessageBox.information(self, "提示", "未找到相关会议")
             return
         # 填充会议列表（显示：缩写 | 会议名称）
         for conference in conferences:
@@ -126,14 +148,14 @@ class ConferenceTab(BaseTab):
             
         self.progress_bar.show()
         self.volume_list.clear()  # 清空旧期卷列表
-        self.paper_table.setRowCount(0)  # 清空旧论文数据
+        self.cancel_task("papers")  # 取消进行中的论文获取
+        self.stats_panel.reset()
+        self.paper_table.clear_papers()  # 清空旧论文数据
         self.volume_list.hide()  # 搜索期间隐藏
         
-        # 启动期卷搜索线程
-        self.volume_worker = ConferenceVolumesSearchWorker(self.current_conference_url)
-        self.volume_worker.search_finished.connect(self.handle_volume_result)
-        self.volume_worker.search_failed.connect(self.handle_search_error)
-        self.volume_worker.start()
+        # 在后台获取期卷列表
+        handle = self.run_task("volumes", conference_volumes_task, self.current_conference_url, error_msg="会议搜索失败")
+        handle.finished.connect(self.handle_volume_result)
 
     def handle_volume_result(self, volumes):
         # 处理期卷搜索结果（展示期卷列表供选择）
@@ -150,47 +172,28 @@ class ConferenceTab(BaseTab):
             self.volume_list.addItem(volume_name)
             # 为列表项附加期卷DBLP链接（通过setData方法存储）
             self.volume_list.item(self.volume_list.count()-1).setData(1, volume_url)
+        self.update_venue_stats()
+
+    def update_venue_stats(self):
+        """整体统计面板切换到当前选中的出版源（先显示缓存的统计）"""
+        volume_urls = [self.volume_list.item(row).data(1) for row in range(self.volume_list.count())]
+        if self.current_conference_url and volume_urls:
+            self.stats_panel.set_venue(self.current_conference_url, volume_urls)
+        else:
+            self.stats_panel.reset()
+
+    def restore_session(self, state, papers):
+        super().restore_session(state, papers)
+        self.update_venue_stats()
 
     def handle_paper_result(self, papers):
         """处理论文获取结果（填充表格+生成词云）"""
         self.progress_bar.hide()
+        self.paper_table.finish_loading()  # 剩余行入表并恢复排序
         if not papers:
             QMessageBox.information(self, "提示", "该作者无论文记录")
             return
+        self.record_history(papers)  # 记入后退/前进历史
 
-        # 填充论文表格（与文献页签逻辑一致）
-        self.paper_table.setRowCount(len(papers))
-        for row, paper in enumerate(papers):
-            self.paper_table.setItem(row, 0, QTableWidgetItem(paper['title']))
-            self.paper_table.setItem(row, 1, QTableWidgetItem(", ".join(paper['authors'])))
-            self.paper_table.setItem(row, 2, QTableWidgetItem(paper['doi']))
-            # ... 其他字段填充
-
-
-            # 添加操作按钮（与文献页签逻辑一致）
-            op_layout = QHBoxLayout()
-            bib_btn = QPushButton("BibTeX")
-            bib_btn.setMinimumHeight(20)  # 设置最小高度
-            bib_btn.clicked.connect(lambda _, url=paper['url']: self.get_bibtex(url))
-            abstract_btn = QPushButton("摘要")
-            abstract_btn.setMinimumHeight(20)  # 设置最小高度
-            abstract_btn.clicked.connect(lambda _, doi=paper['doi']: self.get_abstract(doi))
-            op_layout.addWidget(bib_btn)
-            op_layout.addWidget(abstract_btn)
-
-            op_widget = QWidget()
-            op_widget.setLayout(op_layout)
-            self.paper_table.setCellWidget(row, 3, op_widget)
-
-        # 生成词云（基于论文标题）
-        titles = " ".join([p['title'] for p in papers])
-        wc_path = generate_wordcloud(titles)
-        # 启动后台线程加载图片
-        self.image_loader = ImageLoaderWorker(wc_path)
-        self.image_loader.image_loaded.connect(self.update_wordcloud_display)
-        self.image_loader.start()
-
-    def update_wordcloud_display(self, pixmap):
-        """响应后台线程的图片加载完成信号，更新词云显示"""
-        # 假设使用stats_label显示词云（根据实际UI布局调整）
-        self.stats_label.setPixmap(pixmap)  # 适配标签宽度
\ No newline at end of file
+        # 生成词云（基于论文标题，同一论文的预印本与正式版本只计一次）
+        self.show_wordcloud()
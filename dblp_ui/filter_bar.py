@@ -0,0 +1,123 @@
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLineEdit, QComboBox, QCheckBox, QLabel
+from PyQt5.QtCore import QTimer
+
+from dblp_searcher.dblp_index import OPEN_ACCESS_VALUES
+
+
+class PaperFilterBar(QWidget):
+    """论文表格上方的过滤栏：文本过滤 + 年份/发表源/类型分面 + 仅开放获取 + 合并重复版本"""
+
+    # 分面下拉框：(字段, “全部”选项文字)
+    FACETS = (("year", "全部年份"), ("venue", "全部发表源"), ("type", "全部类型"))
+    MAX_FACET_ITEMS = 300  # 下拉框中最多列出的取值数量
+
+    def __init__(self, table, parent=None):
+        super().__init__(parent)
+        self.table = table
+        self.proxy = table.filter_model
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.text_input = QLineEdit()
+        self.text_input.setPlaceholderText("在已加载结果中过滤（标题/作者/发表源）")
+        self.text_input.setClearButtonEnabled(True)
+        layout.addWidget(QLabel("过滤："))
+        layout.addWidget(self.text_input, 1)
+
+        self.facet_boxes = {}
+        for field, all_text in self.FACETS:
+            box = QComboBox()
+            box.setMinimumWidth(120)
+            box.addItem(all_text, None)
+            box.currentIndexChanged.connect(self.apply_filter)
+            layout.addWidget(box)
+            self.facet_boxes[field] = box
+
+        self.open_access_check = QCheckBox("仅开放获取")
+        self.open_access_check.toggled.connect(self.apply_filter)
+        layout.addWidget(self.open_access_check)
+
+        self.merge_duplicates_check = QCheckBox("合并重复版本")
+        self.merge_duplicates_check.setToolTip("同一论文的 CoRR 预印本与正式发表版本等只显示一条（优先正式版本）")
+        self.merge_duplicates_check.toggled.connect(self.set_merge_duplicates)
+        layout.addWidget(self.merge_duplicates_check)
+
+        self.count_label = QLabel()
+        layout.addWidget(self.count_label)
+
+        self.text_input.textChanged.connect(self.apply_filter)
+
+        # 流式加载时分面取值会频繁变化，合并后再刷新下拉框
+        self._facet_timer = QTimer(self)
+        self._facet_timer.setSingleShot(True)
+        self._facet_timer.setInterval(200)
+        self._facet_timer.timeout.connect(self.refresh_facets)
+        self.proxy.facets_changed.connect(self._facet_timer.start)
+        self.proxy.rowsInserted.connect(self.update_count)
+        self.proxy.modelReset.connect(self.update_count)
+        self.proxy.duplicates_changed.connect(self.update_count)
+        self.update_count()
+
+    def facet_filters(self):
+        """收集当前分面条件：字段 -> 允许的取值列表"""
+        facets = {}
+        for field, box in self.facet_boxes.items():
+            value = box.currentData()
+            if value is not None:
+                facets[field] = [value]
+        if self.open_access_check.isChecked():
+            facets["access"] = list(OPEN_ACCESS_VALUES)
+        return facets
+
+    def apply_filter(self):
+        self.proxy.set_filter(self.text_input.text(), self.facet_filters())
+        self.update_count()
+
+    def set_merge_duplicates(self, merge):
+        self.proxy.set_hide_duplicates(merge)
+        self.update_count()
+
+    def reset(self):
+        """清空所有过滤条件"""
+        for box in self.facet_boxes.values():
+            box.blockSignals(True)
+            box.setCurrentIndex(0)
+            box.blockSignals(False)
+        self.open_access_check.blockSignals(True)
+        self.open_access_check.setChecked(False)
+        self.open_access_check.blockSignals(False)
+        self.text_input.clear()
+        self.apply_filter()
+
+    def refresh_facets(self):
+        """按索引中的取值重新填充分面下拉框，保留当前选择"""
+        index = self.proxy.index_data
+        lost_selection = False
+        for field, box in self.facet_boxes.items():
+            current = box.currentData()
+            box.blockSignals(True)
+            while box.count() > 1:
+                box.removeItem(1)
+            for value, count in index.facet_values(field)[:self.MAX_FACET_ITEMS]:
+                box.addItem(f"{value or '未知'} ({count})", value)
+            if current is not None:
+                position = box.findData(current)
+                box.setCurrentIndex(position if position >= 0 else 0)
+                lost_selection = lost_selection or position < 0
+            box.blockSignals(False)
+        # 新数据中已没有原先选中的取值，按“全部”重新过滤
+        if lost_selection:
+            self.apply_filter()
+
+    def update_count(self, *args):
+        shown = self.proxy.rowCount()
+        total = self.proxy.source_row_count()
+        if self.proxy.is_filtered():
+            text = f"显示 {shown} / {total}"
+        else:
+            text = f"共 {total} 条"
+        duplicates = self.proxy.duplicates()
+        if duplicates:
+            text += f"（{duplicates.duplicate_count()} 条重复）"
+        self.count_label.setText(text)
@@ -0,0 +1,565 @@
+import time
+from itertools import compress
+from operator import itemgetter
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex, QRect, QEvent, \
+    QPersistentModelIndex, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionButton, QStyle, QApplication
+
+from dblp_searcher import dblp_trace
+from dblp_searcher.dblp_index import PublicationIndex, bits_to_flags, bits_to_rows, rows_to_bits, field_text
+from dblp_searcher.dblp_records import ENRICHED_FIELDS, LazyPaperList
+
+PAPER_ROLE = Qt.UserRole + 1  # 返回整条论文记录（dict）
+SORT_ROLE = Qt.UserRole + 2   # 返回排序用的键
+
+
+def paper_text(paper, field):
+    """把论文字段转换为表格中显示的文本"""
+    # 加载后才补充的字段（如 Semantic Scholar 引用数），补充前显示为空而不是 N/A
+    if field in ENRICHED_FIELDS and field not in paper:
+        return ""
+    return field_text(paper, field)
+
+
+def paper_sort_key(paper, field):
+    """排序键：纯数字（如年份）按数值排序，其余按小写文本排序"""
+    text = paper_text(paper, field)
+    if text.isdigit():
+        return (0, int(text), "")
+    if field in ENRICHED_FIELDS:
+        return (0, -1, "")  # 尚未补充或查不到的按比 0 还小处理，降序时排在最后
+    return (1, 0, text.lower())
+
+
+class PaperTableModel(QAbstractTableModel):
+    """论文列表的表格模型，只保存原始论文记录，不为每个单元格创建对象"""
+
+    def __init__(self, columns, parent=None):
+        """
+        参数：
+            columns: List[Tuple[表头, 论文字段]]，字段为 None 表示操作列
+        """
+        super().__init__(parent)
+        self._columns = list(columns)
+        self._papers = []
+
+    def set_papers(self, papers):
+        """整体替换论文数据（LazyPaperList 直接引用，论文在显示时才解码）"""
+        with dblp_trace.span("model.reset", rows=len(papers)):
+            self.beginResetModel()
+            self._papers = papers if isinstance(papers, LazyPaperList) else list(papers)
+            self.endResetModel()
+
+    def append_papers(self, papers):
+        """在末尾追加一批论文，只通知新增的行"""
+        if not papers:
+            return
+        if not isinstance(self._papers, list):
+            self._papers = list(self._papers)
+        first = len(self._papers)
+        with dblp_trace.span("model.append", rows=len(papers)):
+            self.beginInsertRows(QModelIndex(), first, first + len(papers) - 1)
+            self._papers.extend(papers)
+            self.endInsertRows()
+
+    def clear(self):
+        self.set_papers([])
+
+    def papers(self):
+        return self._papers
+
+    def paper(self, row):
+        return self._papers[row]
+
+    def refresh_field(self, field):
+        """论文 dict 中的 field 已在原处更新（如补充了引用数），通知视图重绘该列"""
+        for column, (_, name) in enumerate(self._columns):
+            if name == field and self._papers:
+                self.dataChanged.emit(self.index(0, column), self.index(len(self._papers) - 1, column))
+
+    def field(self, column):
+        return self._columns[column][1]
+
+    def action_column(self):
+        """返回操作列的下标，不存在时返回 -1"""
+        for column, (_, field) in enumerate(self._columns):
+            if field is None:
+                return column
+        return -1
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._papers)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        paper = self._papers[index.row()]
+        field = self._columns[index.column()][1]
+        if role == PAPER_ROLE:
+            return paper
+        if field is None:
+            return None
+        if role == Qt.DisplayRole:
+            return paper_text(paper, field)
+        if role == SORT_ROLE:
+            return paper_sort_key(paper, field)
+        if role == Qt.ToolTipRole and field == "citations" and paper.get("influential_citations") is not None:
+            return f"高影响引用：{paper['influential_citations']}（Semantic Scholar）"
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._columns[section][0]
+        return str(section + 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+
+class PaperFilterProxyModel(QAbstractProxyModel):
+    """
+    论文表格的过滤/排序代理模型。
+
+    过滤条件交给 PublicationIndex（倒排索引+位图）计算，代理只保存
+    “显示行 -> 源数据行”的映射，不会对每一行调用 filterAcceptsRow。
+    排序也在这里完成，源模型中的论文顺序保持不变，索引中的行号始终有效。
+    重复论文（dblp_dedup 在后台检测）默认以灰色标出，开启合并后只显示每组的主记录。
+    """
+    facets_changed = pyqtSignal()      # 可选的分面取值发生变化
+    duplicates_changed = pyqtSignal()  # 重复检测结果发生变化
+
+    DUPLICATE_COLOR = QColor(Qt.gray)
+
+    INDEX_BUDGET = 0.005   # 空闲时补建索引（之后预先计算单字符前缀），每次最多占用的时间（秒）
+    INDEX_BATCH = 20       # 补建时每批加入索引的行数，用完时间预算即停
+    INDEX_INTERVAL = 15    # 两次补建之间的间隔（毫秒），让出时间处理绘制和输入
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.index_data = PublicationIndex()
+        self._rows = []           # 显示行 -> 源数据行
+        self._source_pos = None   # 源数据行 -> 显示行（按需构建）
+        self._mask = None         # 当前过滤结果位图，None 表示不过滤
+        self._text = ""
+        self._facets = {}
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+        self._order_cache = None  # ((列, 顺序, 行数), 排序后的源数据行)
+        self._order_rank = None   # 源数据行 -> 在排序后顺序中的位置（补建索引时插入新匹配行用）
+        self._order_getter = None  # 按排序后的顺序取出每行标志的 itemgetter（过滤时用）
+        self._duplicates = None   # dblp_dedup.DuplicateGroups，后台检测完成后设置
+        self._duplicate_bits = 0  # 重复组中非主记录的源数据行（位图）
+        self._hide_duplicates = False
+
+        # 整体替换数据后不立即建立索引，空闲时分批补建；补建完成前过滤只作用于已建立索引的行，
+        # 之后每补建一批就把其中满足条件的行加入显示。索引建好后继续预先计算单字符前缀的位图，
+        # 输入过滤文字的第一个字符时不必临时合并大量词的行号
+        self._index_timer = QTimer(self)
+        self._index_timer.setInterval(self.INDEX_INTERVAL)
+        self._index_timer.timeout.connect(self._index_step)
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.modelReset.connect(self._on_source_reset)
+        model.rowsInserted.connect(self._on_source_rows_inserted)
+        model.dataChanged.connect(self._on_source_data_changed)
+        self._on_source_reset()
+
+    # ---- 过滤 ----
+
+    def set_filter(self, text="", facets=None):
+        """设置文本过滤与分面过滤条件（facets：字段 -> 允许的取值列表）"""
+        self._text = text
+        self._facets = {field: values for field, values in (facets or {}).items() if values}
+        self.beginResetModel()
+        self._mask = self._query()
+        self._rebuild_rows()
+        self.endResetModel()
+
+    def set_duplicates(self, groups):
+        """设置重复检测结果（groups.size 与当前行数不符时视为过期结果，忽略）"""
+        if groups is not None and groups.size != self.source_row_count():
+            return
+        self._duplicates = groups
+        self._duplicate_bits = rows_to_bits(groups.hidden_rows(), groups.size) if groups else 0
+        if self._hide_duplicates:
+            self.set_filter(self._text, self._facets)
+        elif self._rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._rows) - 1, self.columnCount() - 1),
+                                  [Qt.ForegroundRole, Qt.ToolTipRole])
+        self.duplicates_changed.emit()
+
+    def duplicates(self):
+        return self._duplicates
+
+    def set_hide_duplicates(self, hide):
+        """合并重复论文：只显示每组的主记录（优先正式发表的版本）"""
+        if hide != self._hide_duplicates:
+            self._hide_duplicates = hide
+            self.set_filter(self._text, self._facets)
+
+    def is_filtered(self):
+        return self._mask is not None
+
+    def source_row_count(self):
+        return self.sourceModel().rowCount()
+
+    def source_rows(self):
+        """按显示顺序返回源数据行号"""
+        return list(self._rows)
+
+    def _has_conditions(self):
+        """是否有需要索引的过滤条件（文本或分面）"""
+        return bool(self._text.strip() or self._facets)
+
+    def _query(self, start=0):
+        """
+        按当前条件计算匹配位图；没有条件时返回 None，也不需要索引。
+        文本和分面条件只在已建立索引的行中计算，尚未建立索引的行暂不显示；start 大于 0 时只计算此后的行。
+        """
+        mask = None
+        if self._has_conditions():
+            mask = self.index_data.query(self._text, self._facets, start)
+        if self._hide_duplicates and self._duplicate_bits:
+            if mask is None:
+                mask = (1 << self.source_row_count()) - (1 << start)
+            mask &= ~self._duplicate_bits
+        return mask
+
+    def ensure_index(self):
+        """把尚未建立索引的源数据行全部加入索引（同步完成，过滤中的新匹配行随即显示）"""
+        papers = self.sourceModel().papers()
+        start = len(self.index_data)
+        if start < len(papers):
+            self.index_data.add(papers[start:])
+            self._show_new_matches(start)
+            self.facets_changed.emit()  # 空闲补建的定时器继续运行，预先计算前缀
+
+    def _index_step(self):
+        """
+        空闲时补建一段索引，连同显示新匹配的行最多占用约 INDEX_BUDGET 秒；
+        索引建好后改为预先计算单字符前缀，全部算完时停止
+        """
+        papers = self.sourceModel().papers()
+        end = len(self.index_data)
+        deadline = time.perf_counter() + self.INDEX_BUDGET
+        if end < len(papers):
+            while end < len(papers) and time.perf_counter() < deadline:
+                start, end = end, min(end + self.INDEX_BATCH, len(papers))
+                self.index_data.add(papers[start:end])
+                self._show_new_matches(start)
+            if end < len(papers):
+                return
+            self.facets_changed.emit()
+        elif self.index_data.warm_prefixes(deadline):
+            self._index_timer.stop()
+
+    def _show_new_matches(self, first):
+        """索引新加入了 first 之后的行：过滤中时把其中满足条件的行按当前排序插入显示"""
+        if self._mask is None or not self._has_conditions():
+            return
+        new_bits = self._query(first)
+        if not new_bits:
+            return
+        self._mask |= new_bits
+        new_rows = bits_to_rows(new_bits, first)
+        if self._sort_column < 0:
+            positions = [len(self._rows)] * len(new_rows)  # 新行的行号都大于已显示的行
+        else:
+            rank = self._sorted_rank()
+            new_rows.sort(key=rank.__getitem__)
+            positions = [self._rank_position(rank, rank[row]) for row in new_rows]
+        # positions 是插入前的显示位置（非降序），位置相同的新行作为一段插入
+        inserted = i = 0
+        while i < len(new_rows):
+            j = i + 1
+            while j < len(new_rows) and positions[j] == positions[i]:
+                j += 1
+            at = positions[i] + inserted
+            self.beginInsertRows(QModelIndex(), at, at + j - i - 1)
+            self._rows[at:at] = new_rows[i:j]
+            self._source_pos = None
+            self.endInsertRows()
+            inserted += j - i
+            i = j
+
+    def _rank_position(self, rank, value):
+        """显示行（按排序顺序）中第一个排序位置不小于 value 的位置"""
+        low, high = 0, len(self._rows)
+        while low < high:
+            middle = (low + high) // 2
+            if rank[self._rows[middle]] < value:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _rebuild_rows(self):
+        count = self.sourceModel().rowCount()
+        if self._sort_column >= 0:
+            order = self._sorted_order()
+        else:
+            order = None
+
+        if self._mask is None:
+            self._rows = list(order) if order is not None else list(range(count))
+        elif order is None:
+            self._rows = bits_to_rows(self._mask)
+        else:
+            # 沿用缓存的排序结果，按排序后的顺序取出每行的匹配标志再挑出匹配的行（都在 C 代码中完成）
+            accepted = bits_to_flags(self._mask, count)
+            self._rows = list(compress(order, self._sorted_flags(accepted)))
+        self._source_pos = None
+
+    def _sorted_order(self):
+        """当前排序列下的源数据行顺序；数据不变时复用，过滤时不必重新排序"""
+        model = self.sourceModel()
+        papers = model.papers()
+        key = (self._sort_column, self._sort_order, len(papers))
+        if self._order_cache is not None and self._order_cache[0] == key:
+            return self._order_cache[1]
+        field = model.field(self._sort_column)
+        order = sorted(range(len(papers)), key=lambda row: paper_sort_key(papers[row], field))
+        if self._sort_order == Qt.DescendingOrder:
+            order.reverse()
+        self._order_cache = (key, order)
+        self._order_rank = None
+        self._order_getter = None
+        return order
+
+    def _sorted_flags(self, flags):
+        """把每个源数据行一个字节的标志按当前排序顺序重排"""
+        order = self._sorted_order()
+        if len(order) < 2:
+            return [flags[row] for row in order]
+        if self._order_getter is None:
+            self._order_getter = itemgetter(*order)
+        return self._order_getter(flags)
+
+    def _sorted_rank(self):
+        """源数据行在当前排序顺序中的位置"""
+        order = self._sorted_order()
+        if self._order_rank is None:
+            rank = [0] * len(order)
+            for position, row in enumerate(order):
+                rank[row] = position
+            self._order_rank = rank
+        return self._order_rank
+
+    # ---- 源模型变化 ----
+
+    def _on_source_reset(self):
+        self.beginResetModel()
+        self._order_cache = None
+        self.index_data.clear()
+        self._index_timer.stop()
+        had_duplicates = self._duplicates is not None
+        self._duplicates = None
+        self._duplicate_bits = 0
+        self._mask = self._query()
+        self._rebuild_rows()
+        self.endResetModel()
+        if len(self.index_data) < self.sourceModel().rowCount():
+            self._index_timer.start()
+        else:
+            self.facets_changed.emit()
+        if had_duplicates:
+            self.duplicates_changed.emit()
+
+    def _on_source_rows_inserted(self, parent, first, last):
+        """源模型追加行：更新索引，新行中满足条件的追加到末尾（排序推迟到加载结束）"""
+        if len(self.index_data) == first:
+            self.index_data.add(self.sourceModel().papers()[first:last + 1])
+        if self._mask is None:
+            new_rows = list(range(first, last + 1))
+        else:
+            new_bits = self._query(first)
+            self._mask |= new_bits
+            new_rows = bits_to_rows(new_bits, first)
+        if new_rows:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(new_rows) - 1)
+            self._rows.extend(new_rows)
+            self._source_pos = None
+            self.endInsertRows()
+        self.facets_changed.emit()
+        self._index_timer.start()  # 新加入的行使前缀缓存失效，空闲时重新计算
+
+    def _on_source_data_changed(self, top_left, bottom_right, roles=()):
+        """论文字段在原处更新：按该列排序时重新排序，否则只重绘这几列"""
+        self._order_cache = None
+        if top_left.column() <= self._sort_column <= bottom_right.column():
+            self.sort(self._sort_column, self._sort_order)
+        elif self._rows:
+            self.dataChanged.emit(self.index(0, top_left.column()),
+                                  self.index(len(self._rows) - 1, bottom_right.column()), roles)
+
+    # ---- 排序 ----
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        model = self.sourceModel()
+        if model is None or column < 0 or column >= model.columnCount() or model.field(column) is None:
+            return
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_sources = [(self._rows[index.row()], index.column()) for index in old_indexes]
+
+        self._sort_column = column
+        self._sort_order = order
+        with dblp_trace.span("model.sort", rows=len(self._rows), column=model.field(column)):
+            self._rebuild_rows()
+
+        new_indexes = []
+        for source_row, column_ in old_sources:
+            row = self._proxy_row(source_row)
+            new_indexes.append(self.index(row, column_) if row >= 0 else QModelIndex())
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    # ---- QAbstractProxyModel 接口 ----
+
+    def _proxy_row(self, source_row):
+        if self._source_pos is None:
+            positions = [-1] * self.sourceModel().rowCount()
+            for row, source in enumerate(self._rows):
+                positions[source] = row
+            self._source_pos = positions
+        if 0 <= source_row < len(self._source_pos):
+            return self._source_pos[source_row]
+        return -1
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or proxy_index.row() >= len(self._rows):
+            return QModelIndex()
+        return self.sourceModel().index(self._rows[proxy_index.row()], proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = self._proxy_row(source_index.row())
+        return self.index(row, source_index.column()) if row >= 0 else QModelIndex()
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or row >= len(self._rows) or column < 0 \
+                or column >= self.columnCount():
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        model = self.sourceModel()
+        return 0 if parent.isValid() or model is None else model.columnCount()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        model = self.sourceModel()
+        row = self._rows[index.row()]
+        if self._duplicates is not None and role in (Qt.ForegroundRole, Qt.ToolTipRole):
+            info = self._duplicates.info(row)
+            if info is not None:
+                return self._duplicate_data(row, info, role)
+        return model.data(model.index(row, index.column()), role)
+
+    def _duplicate_data(self, row, info, role):
+        primary, size = info
+        if role == Qt.ForegroundRole:
+            return self.DUPLICATE_COLOR if primary != row else None
+        if primary == row:
+            return f"另有 {size - 1} 个重复版本（如 CoRR 预印本），合并重复版本时只保留此条"
+        paper = self.sourceModel().paper(primary)
+        return f"重复版本：与 {paper.get('venue', 'N/A')} {paper.get('year', '')} 的同名论文为同一篇"
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            return self.sourceModel().headerData(section, orientation, role)
+        if role == Qt.DisplayRole:
+            return str(section + 1)
+        return None
+
+    def flags(self, index):
+        return self.sourceModel().flags(self.mapToSource(index))
+
+
+class PaperActionDelegate(QStyledItemDelegate):
+    """在操作列中绘制 BibTeX/摘要 按钮并处理点击，不创建真实的按钮控件"""
+    bibtex_clicked = pyqtSignal(str)    # 参数：论文DBLP链接
+    abstract_clicked = pyqtSignal(str)  # 参数：论文DOI
+
+    BUTTONS = ("BibTeX", "摘要")
+    MARGIN = 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pressed = None  # (持久索引, 按钮下标)
+
+    def button_rects(self, rect):
+        """把单元格平均分为两个按钮区域"""
+        inner = rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        width = (inner.width() - self.MARGIN) // len(self.BUTTONS)
+        return [QRect(inner.left() + i * (width + self.MARGIN), inner.top(), width, inner.height())
+                for i in range(len(self.BUTTONS))]
+
+    def paint(self, painter, option, index):
+        style = option.widget.style() if option.widget else QApplication.style()
+        for i, rect in enumerate(self.button_rects(option.rect)):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = self.BUTTONS[i]
+            button.state = QStyle.State_Enabled
+            if self._pressed and self._pressed[0] == index and self._pressed[1] == i:
+                button.state |= QStyle.State_Sunken
+            else:
+                button.state |= QStyle.State_Raised
+            style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease,
+                                QEvent.MouseButtonDblClick):
+            return False
+        if event.button() != Qt.LeftButton:
+            return False
+
+        hit = None
+        for i, rect in enumerate(self.button_rects(option.rect)):
+            if rect.contains(event.pos()):
+                hit = i
+                break
+
+        if event.type() in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick):
+            self._pressed = (QPersistentModelIndex(index), hit) if hit is not None else None
+            self._repaint(option)
+            return hit is not None
+
+        # 鼠标释放：按下与释放落在同一按钮上才算一次点击
+        pressed, self._pressed = self._pressed, None
+        self._repaint(option)
+        if pressed is None or hit is None or pressed[0] != index or pressed[1] != hit:
+            return False
+        paper = index.data(PAPER_ROLE)
+        if paper is None:
+            return False
+        if hit == 0:
+            self.bibtex_clicked.emit(paper.get("url", "N/A"))
+        else:
+            self.abstract_clicked.emit(paper.get("doi", "N/A"))
+        return True
+
+    def _repaint(self, option):
+        view = option.widget
+        if view is not None and hasattr(view, "viewport"):
+            view.viewport().update(option.rect)
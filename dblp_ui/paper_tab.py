@@ -1,10 +1,10 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
-                             QSpinBox, QPushButton, QTableWidgetItem,
+from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QLineEdit,
+                             QSpinBox, QPushButton,
                              QLabel, QMessageBox, QSplitter)
 from PyQt5.QtCore import Qt
-from dblp_searcher.dblp_visualizer import generate_wordcloud
-from dblp_ui.base_tab import BaseTab, ImageLoaderWorker, BaseTableWidget
-from dblp_ui.base_workers import PaperSearchWorker
+from dblp_ui.base_tab import BaseTab, BaseTableWidget
+from dblp_ui.base_workers import paper_search_task, fuzzy_title_task
+from dblp_searcher.dblp_fuzzy import normalize_title, MIN_QUERY_LENGTH
 
 
 class PaperTab(BaseTab):
@@ -25,6 +25,8 @@ class PaperTab(BaseTab):
         self.result_count.setRange(1, 100)
         self.result_count.setValue(20)
         self.search_btn = QPushButton("开始搜索")
+        search_layout.addWidget(self.back_btn)  # 结果集历史：后退/前进
+        search_layout.addWidget(self.forward_btn)
         search_layout.addWidget(QLabel("关键词："))
         search_layout.addWidget(self.keyword_input)
         search_layout.addWidget(QLabel("最大结果数："))
@@ -33,25 +35,29 @@ class PaperTab(BaseTab):
 
         
         # 结果展示表格
-        self.paper_table = BaseTableWidget()
-        self.paper_table.resizeColumnsToContents()
-        self.paper_table.setColumnCount(6)
-        self.paper_table.setHorizontalHeaderLabels([
-            "标题", "作者", "发表源", "年份", "DOI", "操作"
+        self.paper_table = BaseTableWidget([
+            ("标题", "title"), ("作者", "authors"), ("发表源", "venue"),
+            ("年份", "year"), ("DOI", "doi"), ("引用", "citations"), ("操作", None)
         ])
+        self.paper_table.resizeColumnsToContents()
 
         self.paper_table.setColumnWidth(0, 800)
         self.paper_table.setColumnWidth(1, 100)
         self.paper_table.setColumnWidth(2, 100)
         self.paper_table.setColumnWidth(3, 50)
         self.paper_table.setColumnWidth(4, 100)
-        self.paper_table.setColumnWidth(5, 200)
+        self.paper_table.setColumnWidth(5, 60)
+        self.paper_table.setColumnWidth(6, 200)
+
+        # 已加载结果的过滤栏
+        self.filter_bar = self.paper_table.create_filter_bar()
 
         # 词云展示区
         self.stats_label = QLabel()
 
         splitter = QSplitter(Qt.Vertical)
         splitter.addWidget(self.progress_bar)  # 下部分为统计标签
+        splitter.addWidget(self.filter_bar)  # 过滤栏
         splitter.addWidget(self.paper_table)  # 上部分为论文表格
         splitter.addWidget(self.stats_label)  # 下部分为统计标签
         splitter.setChildrenCollapsible(False)  # 禁止折叠子部件
@@ -63,9 +69,22 @@ class PaperTab(BaseTab):
 
     def init_signals(self):
         """初始化信号连接"""
+        # 表格操作列的按钮点击
+        self.paper_table.bibtex_requested.connect(self.get_bibtex)
+        self.paper_table.abstract_requested.connect(self.get_abstract)
+        self.paper_table.papers_updated.connect(self.update_history_papers)  # 补充的引用数同步到历史
         self.keyword_input.returnPressed.connect(self.start_search)
         self.search_btn.clicked.connect(self.start_search)
 
+    def session_state(self):
+        state = super().session_state()
+        state["result_count"] = self.result_count.value()
+        return state
+
+    def restore_session(self, state, papers):
+        self.result_count.setValue(state.get("result_count", self.result_count.value()))
+        super().restore_session(state, papers)
+
     def start_search(self):
         """启动搜索流程"""
         keyword = self.keyword_input.text().strip()
@@ -74,56 +93,42 @@ class PaperTab(BaseTab):
             return
             
         self.progress_bar.show()
-        self.paper_table.setRowCount(0)  # 清空旧数据
+        self.paper_table.begin_loading()  # 清空旧数据，准备流式填充
         
-        # 启动异步搜索线程
-        self.worker = PaperSearchWorker(keyword, self.result_count.value())
-        self.worker.search_finished.connect(self.handle_search_result)
-        self.worker.search_failed.connect(self.handle_search_error)
-        self.worker.start()
+        self.history_label = keyword  # 结果返回后以此名称记入历史
+        # 在后台执行文献搜索（新搜索会取消旧搜索）
+        handle = self.run_task("papers", paper_search_task, keyword, self.result_count.value())
+        handle.batch_ready.connect(self.paper_table.append_papers)
+        handle.finished.connect(self.handle_search_result)
 
     def handle_search_result(self, papers):
         """处理搜索结果"""
         self.progress_bar.hide()
+        self.paper_table.finish_loading()  # 剩余行入表并恢复排序
         if not papers:
-            QMessageBox.information(self, "提示", "未找到相关文献")
+            keyword = self.history_label
+            if len(normalize_title(keyword)) >= MIN_QUERY_LENGTH:
+                # 可能是记错或有错字的标题：在本地已知的标题中模糊查找
+                self.progress_bar.show()
+                handle = self.run_task("papers", fuzzy_title_task, keyword, error_msg="本地模糊查找失败")
+                handle.finished.connect(lambda matches: self.handle_fuzzy_result(keyword, matches))
+            else:
+                QMessageBox.information(self, "提示", "未找到相关文献")
             return
+        self.record_history(papers)  # 记入后退/前进历史
 
-        # 填充表格数据
-        self.paper_table.setRowCount(len(papers))
-        for row, paper in enumerate(papers):
-            self.paper_table.setItem(row, 0, QTableWidgetItem(paper['title']))
-            self.paper_table.setItem(row, 1, QTableWidgetItem(", ".join(paper['authors'])))
-            self.paper_table.setItem(row, 2, QTableWidgetItem(paper['venue']))
-            self.paper_table.setItem(row, 3, QTableWidgetItem(str(paper['year'])))
-            self.paper_table.setItem(row, 4, QTableWidgetItem(paper['doi']))
-            # ... 其他字段填充
-            
-            # 添加操作按钮
-            op_layout = QHBoxLayout()
-            bib_btn = QPushButton("BibTeX")
-            bib_btn.setMinimumHeight(20)  # 设置最小高度
-            bib_btn.clicked.connect(lambda _, url=paper['url']: self.get_bibtex(url))
-            abstract_btn = QPushButton("摘要")
-            abstract_btn.setMinimumHeight(20)  # 设置最小高度
-            abstract_btn.clicked.connect(lambda _, doi=paper['doi']: self.get_abstract(doi))
-            op_layout.addWidget(bib_btn)
-            op_layout.addWidget(abstract_btn)
-            
-            # 创建容器Widget并设置布局
-            op_widget = QWidget()
-            op_widget.setLayout(op_layout)
-            self.paper_table.setCellWidget(row, 5, op_widget)
-
-        # 生成词云（基于论文标题）
-        titles = " ".join([p['title'] for p in papers])
-        wc_path = generate_wordcloud(titles)
-        # 启动后台线程加载图片
-        self.image_loader = ImageLoaderWorker(wc_path)
-        self.image_loader.image_loaded.connect(self.update_wordcloud_display)
-        self.image_loader.start()
-
-    def update_wordcloud_display(self, pixmap):
-        """响应后台线程的图片加载完成信号，更新词云显示"""
-        # 假设使用stats_label显示词云（根据实际UI布局调整）
-        self.stats_label.setPixmap(pixmap)  # 适配标签宽度
\ No newline at end of file
+        # 生成词云（基于论文标题，同一论文的预印本与正式版本只计一次）
+        self.show_wordcloud()
+
+    def handle_fuzzy_result(self, keyword, matches):
+        """显示模糊查找的结果（按编辑距离排序）"""
+        self.progress_bar.hide()
+        if not matches:
+            QMessageBox.information(self, "提示", "未找到相关文献")
+            return
+        papers = [paper for paper, _ in matches]
+        self.paper_table.set_papers(papers)
+        self.history_label = f"{keyword}（模糊匹配）"
+        self.record_history(papers)
+        self.stats_label.setText(f"DBLP 未找到相关文献，以下是本地已知标题中最接近的 {len(papers)} 篇"
+                                 f"（最少 {matches[0][1]} 处差异）")
@@ -0,0 +1,125 @@
+from PyQt5.QtCore import QTimer, Qt, pyqtSignal
+from PyQt5.QtWidgets import QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QCheckBox, QPushButton, QLabel, \
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QSplitter
+
+from dblp_searcher import dblp_trace
+
+STAGE_NAMES = {"net": "网络", "decode": "解码", "parse": "解析", "model": "表格", "render": "渲染"}
+STATUS_NAMES = {"finished": "完成", "failed": "失败", "cancelled": "取消"}
+
+
+def operation_text(operation):
+    """操作的一行摘要，例如：paper_search 1234 ms（网络 800 · 解析 200 · 表格 50）"""
+    name = operation["name"].replace("_task", "")
+    stages = " · ".join(f"{STAGE_NAMES[stage]} {operation['stages'][stage]:.0f}"
+                        for stage in dblp_trace.STAGES if stage in operation["stages"])
+    return f"{name} {operation['ms']:.0f} ms" + (f"（{stages}）" if stages else "")
+
+
+class PerformancePanel(QDockWidget):
+    """
+    性能面板：最近各次操作按阶段的耗时，以及各计时项的 p50/p95。
+    记录开启时每秒刷新一次；面板隐藏时只更新状态栏摘要（last_operation 信号）。
+    """
+    last_operation = pyqtSignal(str)  # 参数：最近一次操作的摘要
+
+    REFRESH_INTERVAL = 1000  # 毫秒
+    OPERATION_ROWS = 20
+
+    def __init__(self, parent=None):
+        super().__init__("性能", parent)
+        self.setObjectName("performance_panel")
+        self._last_entry = None
+
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        controls = QHBoxLayout()
+        self.enable_check = QCheckBox("记录各阶段耗时")
+        self.enable_check.setChecked(dblp_trace.enabled())
+        self.enable_check.toggled.connect(self.set_tracing)
+        self.clear_btn = QPushButton("清空")
+        self.clear_btn.clicked.connect(self.clear)
+        self.count_label = QLabel()
+        controls.addWidget(self.enable_check)
+        controls.addWidget(self.clear_btn)
+        controls.addStretch(1)
+        controls.addWidget(self.count_label)
+
+        stage_headers = [STAGE_NAMES[stage] for stage in dblp_trace.STAGES]
+        self.operation_table = self._create_table(["操作", "总耗时(ms)"] + stage_headers + ["状态"])
+        self.stats_table = self._create_table(["计时项", "次数", "p50(ms)", "p95(ms)", "合计(ms)"])
+
+        splitter = QSplitter(Qt.Vertical)
+        splitter.addWidget(self.operation_table)
+        splitter.addWidget(self.stats_table)
+        layout.addLayout(controls)
+        layout.addWidget(splitter, 1)
+        self.setWidget(widget)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.REFRESH_INTERVAL)
+        self.timer.timeout.connect(self.refresh)
+        if dblp_trace.enabled():
+            self.timer.start()
+
+    @staticmethod
+    def _create_table(headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.verticalHeader().hide()
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+    def set_tracing(self, enabled):
+        if enabled:
+            dblp_trace.enable()
+            self.timer.start()
+        else:
+            dblp_trace.disable()
+            self.timer.stop()
+        self.refresh()
+
+    def clear(self):
+        dblp_trace.clear()
+        self._last_entry = None
+        self.refresh(force=True)
+
+    def showEvent(self, event):
+        self.refresh(force=True)
+        super().showEvent(event)
+
+    def refresh(self, force=False):
+        entries = dblp_trace.spans()
+        last = entries[-1] if entries else None
+        if last is self._last_entry and not force:
+            return  # 没有新记录
+        self._last_entry = last
+
+        operations = dblp_trace.operations(entries, self.OPERATION_ROWS)
+        if operations:
+            self.last_operation.emit(f"上次操作：{operation_text(operations[0])}")
+        if not self.isVisible():
+            return
+
+        self.count_label.setText(f"{len(entries)} 条记录")
+        self._fill(self.operation_table, [
+            [operation["name"].replace("_task", ""), f"{operation['ms']:.1f}"]
+            + [f"{operation['stages'][stage]:.1f}" if stage in operation["stages"] else ""
+               for stage in dblp_trace.STAGES]
+            + [STATUS_NAMES.get(operation["status"], operation["status"] or "")]
+            for operation in operations])
+        self._fill(self.stats_table, [
+            [name, str(stats["count"]), f"{stats['p50_ms']:.1f}", f"{stats['p95_ms']:.1f}", f"{stats['total_ms']:.0f}"]
+            for name, stats in dblp_trace.summary(entries).items()])
+
+    @staticmethod
+    def _fill(table, rows):
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                table.setItem(row, column, item)
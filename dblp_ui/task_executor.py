@@ -0,0 +1,229 @@
+import itertools
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QCoreApplication, pyqtSignal
+
+from dblp_searcher import dblp_profiler, dblp_trace
+from dblp_searcher.dblp_http import CancelToken, TaskCancelled
+
+# 任务优先级：数值越大越先执行
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 5
+PRIORITY_HIGH = 10
+
+
+class _TaskSignals(QObject):
+    """线程池任务的内部信号（在后台线程发出，排队到界面线程处理）"""
+    batch_ready = pyqtSignal(int, object)  # 参数：任务ID，一批中间结果
+    progress = pyqtSignal(int, int, int)   # 参数：任务ID，已完成数量，总数量
+    finished = pyqtSignal(int, object)     # 参数：任务ID，任务结果
+    failed = pyqtSignal(int, str)          # 参数：任务ID，错误信息
+    cancelled = pyqtSignal(int)            # 参数：任务ID
+
+
+class Task(QRunnable):
+    """
+    线程池中运行的任务，会作为第一个参数传给任务函数：
+    任务函数通过 task.cancel_token 支持取消，通过 task.emit_batch() 分批返回结果，
+    通过 task.report_progress() 汇报进度。
+    """
+
+    def __init__(self, task_id, fn, args, kwargs, token, signals, operation=None):
+        super().__init__()
+        self.task_id = task_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.cancel_token = token
+        self.signals = signals
+        self.operation = operation  # dblp_trace 的操作，任务中记录的耗时都归到这次操作下
+        self.started = False  # 开始运行后由线程池负责删除，不能再对其调用 tryTake
+
+    def emit_batch(self, batch):
+        """返回一批中间结果（任务已取消时抛出 TaskCancelled）"""
+        self.cancel_token.raise_if_cancelled()
+        self.signals.batch_ready.emit(self.task_id, batch)
+
+    def report_progress(self, done, total):
+        """汇报进度（已完成数量，总数量）"""
+        self.signals.progress.emit(self.task_id, done, total)
+
+    def run(self):
+        self.started = True
+        # 无论成功、失败或取消都要发出信号，执行器据此释放任务
+        try:
+            self.cancel_token.raise_if_cancelled()
+            with dblp_trace.bind(self.operation), dblp_profiler.profiled(getattr(self.fn, "__name__", "task")):
+                result = self.fn(self, *self.args, **self.kwargs)
+        except TaskCancelled:
+            self.signals.cancelled.emit(self.task_id)
+            return
+        except Exception as e:
+            self.signals.failed.emit(self.task_id, str(e))
+            return
+        self.signals.finished.emit(self.task_id, result)
+
+
+class TaskHandle(QObject):
+    """提交任务后返回的句柄，用于接收结果和取消任务"""
+    batch_ready = pyqtSignal(object)  # 参数：一批中间结果
+    progress = pyqtSignal(int, int)   # 参数：已完成数量，总数量
+    finished = pyqtSignal(object)     # 参数：任务结果
+    failed = pyqtSignal(str)          # 参数：错误信息
+
+    def __init__(self, executor, task_id, token, channel=None, generation=0, operation=None):
+        super().__init__(executor)
+        self.executor = executor
+        self.task_id = task_id
+        self.token = token
+        self.channel = channel
+        self.generation = generation
+        self.operation = operation
+
+    @property
+    def cancelled(self):
+        return self.token.cancelled
+
+    def cancel(self):
+        self.executor.cancel(self.task_id)
+
+
+class TaskExecutor(QObject):
+    """
+    基于 QThreadPool 的通用任务执行器：
+    - 限制并发线程数，按优先级排队
+    - 每个任务有唯一ID，可单独取消（取消标记会传到 HTTP 层）
+    - 同一通道（channel）内只保留最新一代任务，旧任务被取消，迟到的结果被丢弃
+    - 启用 dblp_trace 时每个任务是一次操作：后台运行和界面线程处理其信号时都绑定该操作，
+      结束时记录从提交到结果处理完毕的总耗时
+    """
+
+    def __init__(self, max_threads=4, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._ids = itertools.count(1)
+        self._tasks = {}        # 任务ID -> (任务, 句柄)
+        self._generations = {}  # 通道 -> 当前代数
+
+        self._signals = _TaskSignals()
+        self._signals.batch_ready.connect(self._on_batch_ready)
+        self._signals.progress.connect(self._on_progress)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._signals.cancelled.connect(self._on_cancelled)
+
+    def submit(self, fn, *args, channel=None, priority=PRIORITY_NORMAL, **kwargs):
+        """
+        提交任务，返回 TaskHandle。
+
+        参数：
+            fn: 任务函数，调用方式为 fn(task, *args, **kwargs)
+            channel: 可选，通道标识；提交新任务会取消同一通道中的旧任务
+            priority: 线程池排队优先级
+        """
+        generation = 0
+        if channel is not None:
+            self.cancel_channel(channel)
+            generation = self._generations.get(channel, 0) + 1
+            self._generations[channel] = generation
+
+        task_id = next(self._ids)
+        token = CancelToken()
+        operation = dblp_trace.new_operation(getattr(fn, "__name__", "task"))
+        task = Task(task_id, fn, args, kwargs, token, self._signals, operation)
+        handle = TaskHandle(self, task_id, token, channel, generation, operation)
+        self._tasks[task_id] = (task, handle)
+        self._pool.start(task, priority)
+        return handle
+
+    def cancel(self, task_id):
+        """取消任务：尚未开始的直接移出队列，正在运行的在下次检查取消标记时退出"""
+        entry = self._tasks.get(task_id)
+        if entry is None:
+            return
+        task, handle = entry
+        handle.token.cancel()
+        if not task.started and self._pool.tryTake(task):
+            self._on_cancelled(task_id)
+
+    def cancel_channel(self, channel):
+        """取消通道中的所有任务"""
+        for task_id, (_, handle) in list(self._tasks.items()):
+            if handle.channel == channel:
+                self.cancel(task_id)
+
+    def cancel_all(self):
+        for task_id in list(self._tasks):
+            self.cancel(task_id)
+
+    def shutdown(self, timeout=3000):
+        """程序退出前取消所有任务，并等待正在运行的任务结束（最多 timeout 毫秒）"""
+        self.cancel_all()
+        self._pool.waitForDone(timeout)
+
+    def _is_current(self, handle):
+        """任务未取消，且是所在通道的最新一代"""
+        if handle.cancelled:
+            return False
+        if handle.channel is None:
+            return True
+        return self._generations.get(handle.channel) == handle.generation
+
+    def _on_batch_ready(self, task_id, batch):
+        entry = self._tasks.get(task_id)
+        if entry is not None and self._is_current(entry[1]):
+            with dblp_trace.bind(entry[1].operation):
+                entry[1].batch_ready.emit(batch)
+
+    def _on_progress(self, task_id, done, total):
+        entry = self._tasks.get(task_id)
+        if entry is not None and self._is_current(entry[1]):
+            entry[1].progress.emit(done, total)
+
+    def _on_finished(self, task_id, result):
+        handle = self._release(task_id)
+        if handle is None:
+            return
+        current = self._is_current(handle)
+        if current:
+            with dblp_trace.bind(handle.operation):
+                handle.finished.emit(result)
+        dblp_trace.finish_operation(handle.operation, "finished" if current else "cancelled")
+
+    def _on_failed(self, task_id, error_msg):
+        handle = self._release(task_id)
+        if handle is None:
+            return
+        current = self._is_current(handle)
+        if current:
+            with dblp_trace.bind(handle.operation):
+                handle.failed.emit(error_msg)
+        dblp_trace.finish_operation(handle.operation, "failed" if current else "cancelled")
+
+    def _on_cancelled(self, task_id):
+        handle = self._release(task_id)
+        if handle is not None:
+            dblp_trace.finish_operation(handle.operation, "cancelled")
+
+    def _release(self, task_id):
+        entry = self._tasks.pop(task_id, None)
+        if entry is None:
+            return None
+        handle = entry[1]
+        handle.deleteLater()
+        return handle
+
+
+_shared_executor = None
+
+
+def shared_executor():
+    """返回全局共享的任务执行器"""
+    global _shared_executor
+    if _shared_executor is None:
+        _shared_executor = TaskExecutor()
+        app = QCoreApplication.instance()
+        if app is not None:
+            # 退出时后台线程可能仍在运行，先等它们结束，避免向已销毁的对象发信号
+            app.aboutToQuit.connect(_shared_executor.shutdown)
+    return _shared_executor
@@ -0,0 +1,161 @@
+from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QProgressBar, \
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QSplitter
+
+from dblp_ui.base_workers import venue_stats_task
+from dblp_ui.task_executor import shared_executor, PRIORITY_LOW
+
+
+class VenueStatsPanel(QWidget):
+    """
+    期刊/会议的整体统计面板：每年论文数与作者数、篇均作者数、开放获取比例、高产作者。
+    选中期刊/会议后立即显示缓存中的统计；“统计全部卷”逐卷爬取尚未统计的卷，边解析边刷新。
+    """
+
+    REFRESH_INTERVAL = 200  # 统计频繁更新时合并刷新（毫秒）；后台任务也按这个间隔生成统计结果
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.venue_url = None
+        self.volume_urls = []
+        self._summary = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        controls = QHBoxLayout()
+        self.summary_label = QLabel("选择期刊/会议后显示整体统计")
+        self.load_btn = QPushButton("统计全部卷")
+        self.load_btn.setEnabled(False)
+        self.load_btn.clicked.connect(self.load_all)
+        self.cancel_btn = QPushButton("停止")
+        self.cancel_btn.hide()
+        self.cancel_btn.clicked.connect(self.cancel)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFixedHeight(20)
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.hide()
+        controls.addWidget(self.summary_label, 1)
+        controls.addWidget(self.progress_bar)
+        controls.addWidget(self.load_btn)
+        controls.addWidget(self.cancel_btn)
+
+        self.year_table = self._create_table(["年份", "论文数", "作者数"])
+        self.author_table = self._create_table(["作者", "论文数"])
+        splitter = QSplitter(Qt.Horizontal)
+        splitter.addWidget(self.year_table)
+        splitter.addWidget(self.author_table)
+        layout.addLayout(controls)
+        layout.addWidget(splitter, 1)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(self.REFRESH_INTERVAL)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self.hide()
+
+    @staticmethod
+    def _create_table(headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.verticalHeader().hide()
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+    def _run(self, volume_urls):
+        handle = shared_executor().submit(venue_stats_task, self.venue_url, volume_urls,
+                                          summary_interval=self.REFRESH_INTERVAL / 1000,
+                                          channel=(id(self), "stats"), priority=PRIORITY_LOW)
+        handle.batch_ready.connect(self.on_summary)
+        handle.finished.connect(self.on_finished)
+        handle.failed.connect(self.on_failed)
+        return handle
+
+    def set_venue(self, venue_url, volume_urls):
+        """切换到新的期刊/会议：读取缓存中的统计（不访问网络）"""
+        self.cancel()
+        self.venue_url = venue_url
+        self.volume_urls = list(volume_urls)
+        self._show(None)
+        self.load_btn.setText(f"统计全部 {len(self.volume_urls)} 卷")
+        self.load_btn.setEnabled(bool(self.volume_urls))
+        self.show()
+        self._run(None)
+
+    def reset(self):
+        self.cancel()
+        self.venue_url = None
+        self.volume_urls = []
+        self._show(None)
+        self.load_btn.setText("统计全部卷")
+        self.load_btn.setEnabled(False)
+        self.hide()  # 选中期刊/会议后再显示
+
+    def load_all(self):
+        """逐卷统计尚未统计的卷（已缓存的卷跳过）"""
+        if not self.venue_url:
+            return
+        self.load_btn.hide()
+        self.cancel_btn.show()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.show()
+        handle = self._run(self.volume_urls)
+        handle.progress.connect(self.on_progress)
+
+    def cancel(self):
+        shared_executor().cancel_channel((id(self), "stats"))
+        self._finish_loading()
+
+    def _finish_loading(self):
+        self.progress_bar.hide()
+        self.cancel_btn.hide()
+        self.load_btn.show()
+
+    def on_progress(self, done, total):
+        self.progress_bar.setRange(0, max(total, 1))
+        self.progress_bar.setValue(done)
+        self.progress_bar.setFormat(f"{done}/{total} 卷")
+
+    def on_summary(self, summary):
+        self._summary = summary
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    def on_finished(self, summary):
+        if summary is not None:
+            self._show(summary)
+        self._finish_loading()
+
+    def on_failed(self, error_msg):
+        self._finish_loading()
+        self.summary_label.setText(f"统计失败：{error_msg}")
+
+    def refresh(self):
+        self._show(self._summary)
+
+    def _show(self, summary):
+        self._summary = summary
+        self._refresh_timer.stop()
+        if summary is None or not summary["papers"]:
+            self.summary_label.setText("暂无统计，点击右侧按钮统计全部卷" if self.venue_url
+                                       else "选择期刊/会议后显示整体统计")
+            self.year_table.setRowCount(0)
+            self.author_table.setRowCount(0)
+            return
+        self.summary_label.setText(
+            f"已统计 {summary['volumes']}/{len(self.volume_urls)} 卷 · {summary['papers']} 篇论文 · "
+            f"{summary['authors']} 位作者 · 篇均 {summary['avg_authors']:.2f} 位作者 · "
+            f"开放获取 {summary['open_access']:.1%}")
+        self._fill(self.year_table, [[year, str(papers), str(authors)] for year, papers, authors in summary["years"]])
+        self._fill(self.author_table, [[author, str(count)] for author, count in summary["top_authors"]])
+
+    @staticmethod
+    def _fill(table, rows):
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                table.setItem(row, column, item)
@@ -1,28 +1,177 @@
+import os
 import sys
-from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget
+import importlib
+from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout
+from PyQt5.QtCore import QTimer, Qt, QUrl
+from PyQt5.QtGui import QDesktopServices
 from dblp_ui.paper_tab import PaperTab
-from dblp_ui.author_tab import AuthorTab  # 新增导入作者页签
-from dblp_ui.journal_tab import JournalTab
-from dblp_ui.conference_tab import ConferenceTab
+from dblp_ui.perf_panel import PerformancePanel
+from dblp_searcher.dblp_session import SessionStore
+from dblp_searcher import dblp_profiler, dblp_snapshot
+
+
+class LazyTab(QWidget):
+    """占位页签：第一次切换到该页签时才导入模块并构建真正的页签"""
+
+    def __init__(self, module_name, class_name, parent=None):
+        super().__init__(parent)
+        self.module_name = module_name
+        self.class_name = class_name
+        self.tab = None
+        self.pending_session = None  # 构建前收到的会话快照：(状态, 论文)
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+
+    def build(self):
+        """构建真正的页签（已构建时直接返回）"""
+        if self.tab is None:
+            module = importlib.import_module(self.module_name)
+            self.tab = getattr(module, self.class_name)()
+            self.layout.addWidget(self.tab)
+            if self.pending_session is not None:
+                self.tab.restore_session(*self.pending_session)
+                self.pending_session = None
+        return self.tab
+
+    def showEvent(self, event):
+        self.build()
+        super().showEvent(event)
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("DBLP学术检索系统")
         self.setGeometry(100, 100, 1400, 900)  # 初始窗口大小
-        
+
         # 创建页签容器
         self.tab_widget = QTabWidget()
         self.setCentralWidget(self.tab_widget)
-        
-        # 添加各功能页签
+
+        # 添加各功能页签：默认页签立即构建，其余页签首次显示时再构建
         self.tab_widget.addTab(PaperTab(), "文献检索")
-        self.tab_widget.addTab(AuthorTab(), "作者检索")  # 取消注释启用作者页签
-        self.tab_widget.addTab(JournalTab(), "期刊检索")
-        self.tab_widget.addTab(ConferenceTab(), "会议检索")
+        self.tab_widget.addTab(LazyTab("dblp_ui.author_tab", "AuthorTab"), "作者检索")
+        self.tab_widget.addTab(LazyTab("dblp_ui.journal_tab", "JournalTab"), "期刊检索")
+        self.tab_widget.addTab(LazyTab("dblp_ui.conference_tab", "ConferenceTab"), "会议检索")
+
+        # 性能面板（视图菜单中打开），最近一次操作的耗时摘要显示在状态栏
+        self.perf_panel = PerformancePanel(self)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.perf_panel)
+        self.perf_panel.hide()
+        self.perf_panel.last_operation.connect(self.statusBar().showMessage)
+        perf_action = self.perf_panel.toggleViewAction()
+        perf_action.setShortcut("Ctrl+Shift+P")
+        self.menuBar().addMenu("视图").addAction(perf_action)
+        self.init_data_menu()
+        self.init_debug_menu()
+
+        # 恢复上次的会话（论文按需从快照解码）
+        self.session = SessionStore()
+        self.restore_session()
+
+        # 窗口显示后再在后台导入网络与解析模块
+        QTimer.singleShot(0, self.preload_modules)
+
+    def init_data_menu(self):
+        """数据菜单：文献搜索是否先查本地快照（与环境变量 DBLP_SNAPSHOT_SEARCH 相同）"""
+        action = self.menuBar().addMenu("数据").addAction("文献搜索先查本地快照")
+        action.setCheckable(True)
+        action.setChecked(dblp_snapshot.search_enabled())
+        action.toggled.connect(self.set_snapshot_search)
+
+    def set_snapshot_search(self, enabled):
+        dblp_snapshot.set_search_enabled(enabled)
+        if not enabled:
+            self.statusBar().showMessage("文献搜索查询 dblp.org")
+        elif os.path.exists(dblp_snapshot.SNAPSHOT_PATH):
+            self.statusBar().showMessage(f"文献搜索先查本地快照：{dblp_snapshot.SNAPSHOT_PATH}，没有结果时查询 dblp.org")
+        else:
+            self.statusBar().showMessage(f"没有本地快照（{dblp_snapshot.SNAPSHOT_PATH}），文献搜索仍查询 dblp.org")
+
+    def init_debug_menu(self):
+        """调试菜单：对之后的每个后台任务和词云生成做 CPU / 内存分析（与环境变量 DBLP_PROFILE 相同）"""
+        menu = self.menuBar().addMenu("调试")
+        for mode, text in (("cpu", "CPU 分析（cProfile）"), ("memory", "内存分析（tracemalloc）")):
+            action = menu.addAction(text)
+            action.setCheckable(True)
+            action.setChecked(mode in dblp_profiler.modes())
+            action.toggled.connect(lambda checked, m=mode: self.set_profile_mode(m, checked))
+        menu.addSeparator()
+        menu.addAction("打开分析结果目录", self.open_profile_dir)
+
+    def set_profile_mode(self, mode, enabled):
+        modes = set(dblp_profiler.modes())
+        if enabled:
+            modes.add(mode)
+        else:
+            modes.discard(mode)
+        dblp_profiler.set_modes(modes)
+        self.statusBar().showMessage(f"性能分析结果保存在：{dblp_profiler.PROFILE_DIR}" if modes else "性能分析已关闭")
+
+    def open_profile_dir(self):
+        os.makedirs(dblp_profiler.PROFILE_DIR, exist_ok=True)
+        QDesktopServices.openUrl(QUrl.fromLocalFile(dblp_profiler.PROFILE_DIR))
+
+    def preload_modules(self):
+        from dblp_ui.task_executor import shared_executor, PRIORITY_LOW
+        from dblp_ui.base_workers import preload_modules_task
+        shared_executor().submit(preload_modules_task, priority=PRIORITY_LOW)
+
+    def tab_name(self, index):
+        widget = self.tab_widget.widget(index)
+        return widget.class_name if isinstance(widget, LazyTab) else type(widget).__name__
+
+    def restore_session(self):
+        """从快照恢复各页签；尚未构建的页签等到第一次显示时再恢复"""
+        loaded = self.session.load()
+        if loaded is None:
+            return
+        meta, papers = loaded
+        states = meta.get("tabs", {})
+        for index in range(self.tab_widget.count()):
+            name = self.tab_name(index)
+            if name not in states:
+                continue
+            session = (states[name], papers.get(name, []))
+            widget = self.tab_widget.widget(index)
+            if isinstance(widget, LazyTab) and widget.tab is None:
+                widget.pending_session = session
+            else:
+                self.tab(index).restore_session(*session)
+        self.tab_widget.setCurrentIndex(meta.get("current_tab", 0))
+
+    def save_session(self):
+        """保存各页签的状态与已加载的论文；从未打开的页签沿用上次快照中的内容"""
+        meta = {"current_tab": self.tab_widget.currentIndex(), "tabs": {}}
+        papers = {}
+        for index in range(self.tab_widget.count()):
+            name = self.tab_name(index)
+            widget = self.tab_widget.widget(index)
+            if isinstance(widget, LazyTab) and widget.tab is None:
+                if widget.pending_session is None:
+                    continue
+                meta["tabs"][name], papers[name] = widget.pending_session
+            else:
+                tab = self.tab(index)
+                meta["tabs"][name] = tab.session_state()
+                papers[name] = tab.paper_table.papers()
+        try:
+            self.session.save(meta, papers)
+        except OSError as e:
+            print(f"保存会话失败：{e}")
+
+    def closeEvent(self, event):
+        self.save_session()
+        super().closeEvent(event)
+
+    def tab(self, index):
+        """返回第 index 个页签（延迟页签会被立即构建）"""
+        widget = self.tab_widget.widget(index)
+        return widget.build() if isinstance(widget, LazyTab) else widget
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(app.exec_())